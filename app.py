@@ -146,7 +146,23 @@ with col1:
                 car_state = df_lap.iloc[progress]
                 
                 # Plot 3D Map with Car Marker
-                deck = v3d.plot_3d_track(df_lap, car_index=progress)
+                # The track layer only depends on the lap: build it once per lap
+                # (per session) and just move the car on each slider tick
+                track_key = (selected_lap, len(df_lap))
+                if st.session_state.get('track_deck_key') != track_key:
+                    st.session_state.track_deck = v3d.build_track_deck(df_lap)
+                    st.session_state.track_polygons = None
+                    if st.session_state.track_deck is not None:
+                        # Car outline for every frame of the lap in one vectorized pass
+                        st.session_state.track_polygons = v3d.get_car_polygons(
+                            df_lap['lat'], df_lap['lon'], df_lap['bearing']
+                        )
+                    st.session_state.track_deck_key = track_key
+                deck = st.session_state.track_deck
+                if deck is not None:
+                    deck = v3d.update_car_layer(
+                        deck, df_lap, progress, polygons=st.session_state.track_polygons
+                    )
                 st.pydeck_chart(deck)
                 
                 # Telemetry at current point
@@ -15,7 +15,7 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from utils.styles import apply_custom_css, create_header_with_logo, TOYOTA_COLORS
 from utils.data_loader import DataManager
-from analysis.telemetry_fusion import TelemetryFusionEngine
+from analysis.telemetry_fusion import TelemetryFusionEngine, DEFAULT_CACHE_DIR
 from analysis.cpi_calculator import CompositePerformanceIndex
 from visualization.charts import (
     create_lap_time_evolution,
@@ -41,7 +41,8 @@ if 'data_manager' not in st.session_state:
     st.session_state.data_manager = DataManager(data_dir="data")
 
 if 'fusion_engine' not in st.session_state:
-    st.session_state.fusion_engine = TelemetryFusionEngine()
+    # Feature disk cache is opt-in; the app keeps it under the ignored .cache/ folder
+    st.session_state.fusion_engine = TelemetryFusionEngine(cache_dir=DEFAULT_CACHE_DIR)
 
 if 'cpi_calculator' not in st.session_state:
     st.session_state.cpi_calculator = CompositePerformanceIndex()
@@ -94,6 +94,13 @@ def load_ml_models():
         except Exception as e:
             print(f"[FAIL] Failed to load driver clusterer: {e}")
 
+def coerce_numeric(df: pd.DataFrame, cols: list) -> pd.DataFrame:
+    """Convert the given columns (if present) to numeric in one pass, invalid values -> NaN"""
+    present = [col for col in cols if col in df.columns]
+    if present:
+        df[present] = df[present].apply(pd.to_numeric, errors='coerce')
+    return df
+
 def load_telemetry(nrows=500000):
     if "telemetry" in cached_data:
         return cached_data["telemetry"]
@@ -118,9 +125,7 @@ def load_telemetry(nrows=500000):
         df_pivot = df_pivot.reset_index()
 
         numeric_cols = ['speed', 'nmot', 'Steering_Angle', 'ath', 'pbrake_f', 'pbrake_r', 'accx_can', 'accy_can', 'gear']
-        for col in numeric_cols:
-            if col in df_pivot.columns:
-                df_pivot[col] = pd.to_numeric(df_pivot[col], errors='coerce')
+        df_pivot = coerce_numeric(df_pivot, numeric_cols)
 
         if 'speed' in df_pivot.columns:
             df_pivot['time_delta'] = df_pivot['timestamp'].diff().dt.total_seconds().fillna(0)
@@ -4,6 +4,7 @@ from pydantic import BaseModel
 import pandas as pd
 import numpy as np
 from typing import Optional, List
+from functools import lru_cache
 import os
 import sys
 from groq import Groq
@@ -68,6 +69,18 @@ if ML_AVAILABLE:
 # Cache
 cached_data = {}
 
+# Parsed ';'-separated timing/weather CSVs: path -> (mtime, DataFrame)
+csv_cache = {}
+
+def read_semicolon_csv(path: str) -> pd.DataFrame:
+    """Read a ';'-separated race CSV once per file version; loaders and endpoints share the frame (do not mutate it)"""
+    mtime = os.path.getmtime(path)
+    cached = csv_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, pd.read_csv(path, sep=';'))
+        csv_cache[path] = cached
+    return cached[1]
+
 # ML Models cache
 ml_models = {
     'anomaly_detector': None,
@@ -114,6 +127,13 @@ def load_ml_models():
         except Exception as e:
             print(f"[FAIL] Failed to load driver clusterer: {e}")
 
+def coerce_numeric(df: pd.DataFrame, cols: list) -> pd.DataFrame:
+    """Convert the given columns (if present) to numeric in one pass, invalid values -> NaN"""
+    present = [col for col in cols if col in df.columns]
+    if present:
+        df[present] = df[present].apply(pd.to_numeric, errors='coerce')
+    return df
+
 def load_telemetry(nrows=500000):
     if "telemetry" in cached_data:
         return cached_data["telemetry"]
@@ -138,9 +158,7 @@ def load_telemetry(nrows=500000):
         df_pivot = df_pivot.reset_index()
 
         numeric_cols = ['speed', 'nmot', 'Steering_Angle', 'ath', 'pbrake_f', 'pbrake_r', 'accx_can', 'accy_can', 'gear']
-        for col in numeric_cols:
-            if col in df_pivot.columns:
-                df_pivot[col] = pd.to_numeric(df_pivot[col], errors='coerce')
+        df_pivot = coerce_numeric(df_pivot, numeric_cols)
 
         if 'speed' in df_pivot.columns:
             df_pivot['time_delta'] = df_pivot['timestamp'].diff().dt.total_seconds().fillna(0)
@@ -207,7 +225,7 @@ def load_weather():
 
     # Fallback to direct load
     try:
-        df = pd.read_csv(WEATHER_PATH, sep=';')
+        df = read_semicolon_csv(WEATHER_PATH)
         # Rename columns to standard names
         df = df.rename(columns={
             'AIR_TEMP': 'ambient_temp',
@@ -239,7 +257,7 @@ def load_sectors():
 
     # Fallback to direct load
     try:
-        df = pd.read_csv(SECTORS_PATH, sep=';')
+        df = read_semicolon_csv(SECTORS_PATH)
         cached_data["sectors"] = df
         return df
     except Exception as e:
@@ -432,11 +450,27 @@ def get_weather():
         return {}
     return df.iloc[0].to_dict()
 
+def time_strings_to_seconds(values: pd.Series) -> pd.Series:
+    """Parse 'M:SS.fff' timing strings to seconds in one vectorized pass (unparseable -> NaN)"""
+    return pd.to_timedelta('00:' + values.astype(str), errors='coerce').dt.total_seconds()
+
+@lru_cache(maxsize=4096)
+def lap_time_to_seconds(lap_time: str) -> float:
+    """Seconds for a single 'M:SS.fff' (or plain seconds) lap time; repeated strings hit the cache"""
+    return pd.to_timedelta('00:' + lap_time).total_seconds() if ':' in lap_time else float(lap_time)
+
+def time_column_seconds(df: pd.DataFrame, col: str) -> list:
+    """Per-row seconds for a timing column as JSON-friendly floats (None when missing/unparseable)"""
+    if col not in df.columns:
+        return [None] * len(df)
+    seconds = time_strings_to_seconds(df[col])
+    return [None if pd.isna(value) else value for value in seconds.tolist()]
+
 @app.get("/api/sectors/{lap}")
 def get_sector_analysis(lap: int, vehicle_number: Optional[int] = None):
     """Get sector-by-sector analysis with intermediate times"""
     try:
-        df = pd.read_csv(SECTORS_PATH, sep=';')
+        df = read_semicolon_csv(SECTORS_PATH)
         df_lap = df[df[' LAP_NUMBER'] == lap].copy()
 
         if vehicle_number:
@@ -445,22 +479,18 @@ def get_sector_analysis(lap: int, vehicle_number: Optional[int] = None):
         if df_lap.empty:
             raise HTTPException(status_code=404, detail=f"No sector data for lap {lap}")
 
-        # Parse time strings to seconds
-        def parse_time(time_str):
-            if pd.isna(time_str):
-                return None
-            try:
-                return pd.to_timedelta('00:' + str(time_str)).total_seconds()
-            except:
-                return None
+        # Parse time strings to seconds (whole columns at once)
+        lap_time_seconds = time_column_seconds(df_lap, ' LAP_TIME')
+        im2a_seconds = time_column_seconds(df_lap, 'IM2a_time')
+        im2_seconds = time_column_seconds(df_lap, 'IM2_time')
 
         results = []
-        for _, row in df_lap.iterrows():
+        for i, (_, row) in enumerate(df_lap.iterrows()):
             results.append({
                 "vehicle_number": int(row['NUMBER']),
                 "lap": int(row[' LAP_NUMBER']),
                 "lap_time": str(row[' LAP_TIME']),
-                "lap_time_seconds": parse_time(row[' LAP_TIME']),
+                "lap_time_seconds": lap_time_seconds[i],
                 "sectors": {
                     "s1": {"time": str(row[' S1']), "seconds": float(row['S1_SECONDS']) if 'S1_SECONDS' in row and pd.notna(row['S1_SECONDS']) else None, "improvement": int(row[' S1_IMPROVEMENT'])},
                     "s2": {"time": str(row[' S2']), "seconds": float(row['S2_SECONDS']) if 'S2_SECONDS' in row and pd.notna(row['S2_SECONDS']) else None, "improvement": int(row[' S2_IMPROVEMENT'])},
@@ -470,8 +500,8 @@ def get_sector_analysis(lap: int, vehicle_number: Optional[int] = None):
                 "intermediates": {
                     "im1a": float(row['IM1a_time']) if pd.notna(row.get('IM1a_time')) else None,
                     "im1": float(row['IM1_time']) if pd.notna(row.get('IM1_time')) else None,
-                    "im2a": parse_time(row.get('IM2a_time')),
-                    "im2": parse_time(row.get('IM2_time')),
+                    "im2a": im2a_seconds[i],
+                    "im2": im2_seconds[i],
                     "im3a": float(row['IM3a_time']) if pd.notna(row.get('IM3a_time')) else None
                 }
             })
@@ -515,7 +545,7 @@ def get_lap_times():
 def get_best_laps(vehicle_number: int):
     """Get top 10 best laps for a driver with detailed analysis"""
     try:
-        df = pd.read_csv(BEST_LAPS_PATH, sep=';')
+        df = read_semicolon_csv(BEST_LAPS_PATH)
         driver_data = df[df['NUMBER'] == vehicle_number]
 
         if driver_data.empty:
@@ -533,7 +563,7 @@ def get_best_laps(vehicle_number: int):
                     "rank": i,
                     "lap_number": int(lap_num),
                     "lap_time": str(lap_time),
-                    "lap_time_seconds": pd.to_timedelta('00:' + str(lap_time)).total_seconds() if ':' in str(lap_time) else float(lap_time)
+                    "lap_time_seconds": lap_time_to_seconds(str(lap_time))
                 })
 
         return {
@@ -565,7 +595,7 @@ def calculate_consistency(laps):
 def construct_perfect_lap():
     """Construct theoretical perfect lap from best sectors across all laps"""
     try:
-        df = pd.read_csv(SECTORS_PATH, sep=';')
+        df = read_semicolon_csv(SECTORS_PATH)
 
         # Find best sector times across all laps
         best_s1 = df.loc[df['S1_SECONDS'].idxmin()]
@@ -573,6 +603,7 @@ def construct_perfect_lap():
         best_s3 = df.loc[df['S3_SECONDS'].idxmin()]
 
         perfect_time = best_s1['S1_SECONDS'] + best_s2['S2_SECONDS'] + best_s3['S3_SECONDS']
+        actual_best_lap = float(time_strings_to_seconds(df[' LAP_TIME']).min())
 
         return {
             "perfect_lap_time": round(perfect_time, 3),
@@ -593,8 +624,8 @@ def construct_perfect_lap():
                     "lap": int(best_s3[' LAP_NUMBER'])
                 }
             },
-            "actual_best_lap": float(df[' LAP_TIME'].apply(lambda x: pd.to_timedelta('00:' + str(x)).total_seconds()).min()),
-            "improvement_potential": round(float(df[' LAP_TIME'].apply(lambda x: pd.to_timedelta('00:' + str(x)).total_seconds()).min()) - perfect_time, 3)
+            "actual_best_lap": actual_best_lap,
+            "improvement_potential": round(actual_best_lap - perfect_time, 3)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
@@ -14,7 +14,7 @@ import plotly.graph_objects as go
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from utils.styles import apply_custom_css, TOYOTA_COLORS
-from analysis.sector_analyzer import SectorAnalyzer
+from analysis.sector_analyzer import SectorAnalyzer, DEFAULT_CACHE_DIR
 from visualization.charts import create_sector_heatmap
 
 
@@ -37,7 +37,8 @@ def render():
 
     # Initialize sector analyzer
     if 'sector_analyzer' not in st.session_state:
-        st.session_state.sector_analyzer = SectorAnalyzer()
+        # Analysis disk cache is opt-in; the app keeps it under the ignored .cache/ folder
+        st.session_state.sector_analyzer = SectorAnalyzer(cache_dir=DEFAULT_CACHE_DIR)
 
     analyzer = st.session_state.sector_analyzer
 
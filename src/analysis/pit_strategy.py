@@ -10,14 +10,29 @@ GERÇEK YARIŞ MÜHENDİSLİĞİ:
 - Multi-stint optimization
 """
 
+import heapq
+from dataclasses import dataclass, asdict
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class ScenarioResult:
+    """Tek pit senaryosunun sonucu (dict yerine slot'lu kayıt)"""
+    scenario: str
+    pit_lap: Union[int, str]
+    projected_total_time: float
+    time_vs_best: float = 0
+    viable: bool = True
+
+    def asdict(self) -> Dict:
+        return asdict(self)
+
+
 class PitStrategySimulator:
     """
     Pit stop stratejisi simülatörü
@@ -29,6 +44,8 @@ class PitStrategySimulator:
     - Race position impact
     """
 
+    __slots__ = ('pit_loss_time', 'tire_compounds', '_compound_cache')
+
     def __init__(self):
         self.pit_loss_time = 25.0  # seconds (typical pit stop time loss)
         self.tire_compounds = {
@@ -37,6 +54,23 @@ class PitStrategySimulator:
             'hard': {'initial_pace': 0.95, 'degradation': 0.02, 'life': 35}
         }
 
+        # Yaygın yazımlar için hazır lookup (her çağrıda .lower() yok)
+        self._compound_cache = {}
+        for name, data in self.tire_compounds.items():
+            self._compound_cache[name] = data
+            self._compound_cache[name.upper()] = data
+            self._compound_cache[name.title()] = data
+
+    def _compound(self, tire_compound: str) -> Dict:
+        """Lastik hamuru verisi (bilinmeyen hamur = medium)"""
+        compound_data = self._compound_cache.get(tire_compound)
+        if compound_data is None:
+            compound_data = self.tire_compounds.get(
+                tire_compound.lower(),
+                self.tire_compounds['medium']
+            )
+        return compound_data
+
     def calculate_tire_life_remaining(
         self,
         current_lap: int,
@@ -56,10 +90,7 @@ class PitStrategySimulator:
         Returns:
             Dict with tire life metrics
         """
-        compound_data = self.tire_compounds.get(
-            tire_compound.lower(),
-            self.tire_compounds['medium']
-        )
+        compound_data = self._compound(tire_compound)
 
         laps_on_tire = current_lap - stint_start_lap + 1
         max_life = compound_data['life']
@@ -109,10 +140,7 @@ class PitStrategySimulator:
         Returns:
             Dict with undercut analysis
         """
-        compound_data = self.tire_compounds.get(
-            tire_compound.lower(),
-            self.tire_compounds['medium']
-        )
+        compound_data = self._compound(tire_compound)
 
         # Leader's tire degradation
         leader_degradation = leader_tire_age * compound_data['degradation']
@@ -190,7 +218,8 @@ class PitStrategySimulator:
         current_lap: int,
         total_laps: int,
         current_tire_age: int,
-        current_compound: str = "medium"
+        current_compound: str = "medium",
+        top_k: Optional[int] = None
     ) -> List[Dict]:
         """
         Birden fazla pit senaryosu simüle et
@@ -206,108 +235,147 @@ class PitStrategySimulator:
             total_laps: Total race laps
             current_tire_age: Current tire age
             current_compound: Current tire compound
+            top_k: Only return the best k scenarios (None = all)
 
         Returns:
             List of scenario dicts
         """
-        scenarios = []
+        candidates = self._scenario_candidates(current_lap, total_laps, current_tire_age)
+        degradation = np.array([self._compound(current_compound)['degradation']])
+
+        # Tüm senaryolar tek NumPy çağrısında
+        totals = self._scenario_total_times(
+            [pit_lap for _, pit_lap in candidates],
+            total_laps,
+            current_tire_age,
+            degradation
+        )[0]
+
+        scenarios = [
+            ScenarioResult(
+                scenario=name,
+                pit_lap=pit_lap if pit_lap else "No pit",
+                projected_total_time=round(float(total), 2),
+                time_vs_best=0,  # Will be calculated after sorting
+                viable=True
+            )
+            for (name, pit_lap), total in zip(candidates, totals)
+        ]
+
+        # Sort by projected time
+        if top_k is None or top_k >= len(scenarios):
+            scenarios.sort(key=lambda x: x.projected_total_time)
+        else:
+            # Sadece en iyi k senaryo gerekiyorsa tam sort yapma
+            scenarios = heapq.nsmallest(top_k, scenarios, key=lambda x: x.projected_total_time)
+
+        return [scenario.asdict() for scenario in scenarios]
+
+    def simulate_compound_matrix(
+        self,
+        current_lap: int,
+        total_laps: int,
+        current_tire_age: int
+    ) -> pd.DataFrame:
+        """
+        Tüm lastik hamurları × pit senaryoları için toplam süre matrisi
+
+        "What-if I switch compound?" analizi için: satırlar hamur,
+        sütunlar senaryo, değerler projected total time (s).
+
+        Args:
+            current_lap: Current lap
+            total_laps: Total race laps
+            current_tire_age: Current tire age
+
+        Returns:
+            DataFrame (compound × scenario)
+        """
+        candidates = self._scenario_candidates(current_lap, total_laps, current_tire_age)
+        degradation = np.array([c['degradation'] for c in self.tire_compounds.values()])
+
+        totals = self._scenario_total_times(
+            [pit_lap for _, pit_lap in candidates],
+            total_laps,
+            current_tire_age,
+            degradation
+        )
 
+        return pd.DataFrame(
+            np.round(totals, 2),
+            index=list(self.tire_compounds.keys()),
+            columns=[name for name, _ in candidates]
+        )
+
+    def _scenario_candidates(
+        self,
+        current_lap: int,
+        total_laps: int,
+        current_tire_age: int
+    ) -> List[Tuple[str, Optional[int]]]:
+        """Geçerli (senaryo adı, pit turu) çiftleri"""
         # Scenario 1: Pit now
-        scenarios.append(self._simulate_scenario(
-            pit_lap=current_lap,
-            total_laps=total_laps,
-            current_tire_age=current_tire_age,
-            current_compound=current_compound,
-            name="Pit NOW"
-        ))
+        candidates = [("Pit NOW", current_lap)]
 
         # Scenario 2: Pit in 3 laps
         if current_lap + 3 <= total_laps:
-            scenarios.append(self._simulate_scenario(
-                pit_lap=current_lap + 3,
-                total_laps=total_laps,
-                current_tire_age=current_tire_age,
-                current_compound=current_compound,
-                name="Pit in +3 laps"
-            ))
+            candidates.append(("Pit in +3 laps", current_lap + 3))
 
         # Scenario 3: Pit in 5 laps
         if current_lap + 5 <= total_laps:
-            scenarios.append(self._simulate_scenario(
-                pit_lap=current_lap + 5,
-                total_laps=total_laps,
-                current_tire_age=current_tire_age,
-                current_compound=current_compound,
-                name="Pit in +5 laps"
-            ))
+            candidates.append(("Pit in +5 laps", current_lap + 5))
 
         # Scenario 4: No stop (if viable)
         if current_tire_age < 15:
-            scenarios.append(self._simulate_scenario(
-                pit_lap=None,
-                total_laps=total_laps,
-                current_tire_age=current_tire_age,
-                current_compound=current_compound,
-                name="No stop"
-            ))
-
-        # Sort by projected time
-        scenarios.sort(key=lambda x: x['projected_total_time'])
+            candidates.append(("No stop", None))
 
-        return scenarios
+        return candidates
 
-    def _simulate_scenario(
+    def _scenario_total_times(
         self,
-        pit_lap: Optional[int],
+        pit_laps: List[Optional[int]],
         total_laps: int,
         current_tire_age: int,
-        current_compound: str,
-        name: str
-    ) -> Dict:
-        """Single scenario simulation"""
+        degradation: np.ndarray
+    ) -> np.ndarray:
+        """
+        Senaryo simülasyonu, [compound, scenario, lap] üzerinde broadcast
 
-        compound_data = self.tire_compounds.get(
-            current_compound.lower(),
-            self.tire_compounds['medium']
-        )
+        Args:
+            pit_laps: Pit lap per scenario (None = no pit)
+            total_laps: Total race laps
+            current_tire_age: Current tire age
+            degradation: Degradation rate per compound, shape (C,)
 
-        total_time = 0
+        Returns:
+            Projected total time, shape (C, S)
+        """
         current_lap_sim = 1
 
-        # Before pit (if applicable)
-        if pit_lap:
-            laps_before_pit = pit_lap - current_lap_sim
-            for lap in range(laps_before_pit):
-                tire_age = current_tire_age + lap
-                degradation = tire_age * compound_data['degradation']
-                lap_time = 90 + degradation  # Base lap time + degradation
-                total_time += lap_time
-
-            # Pit stop
-            total_time += self.pit_loss_time
-
-            # After pit (fresh tires)
-            laps_after_pit = total_laps - pit_lap
-            for lap in range(laps_after_pit):
-                degradation = lap * compound_data['degradation']
-                lap_time = 90 + degradation
-                total_time += lap_time
-
-        else:
-            # No pit - all laps on current tires
-            for lap in range(total_laps - current_lap_sim + 1):
-                tire_age = current_tire_age + lap
-                degradation = tire_age * compound_data['degradation']
-                lap_time = 90 + degradation
-                total_time += lap_time
-
-        return {
-            'scenario': name,
-            'pit_lap': pit_lap if pit_lap else "No pit",
-            'projected_total_time': round(total_time, 2),
-            'time_vs_best': 0,  # Will be calculated after sorting
-            'viable': True
-        }
+        # Senaryo başına pit öncesi / sonrası tur sayısı
+        laps_before = np.array([
+            max(pit_lap - current_lap_sim, 0) if pit_lap else total_laps - current_lap_sim + 1
+            for pit_lap in pit_laps
+        ])
+        laps_after = np.array([
+            max(total_laps - pit_lap, 0) if pit_lap else 0
+            for pit_lap in pit_laps
+        ])
+        has_pit = np.array([bool(pit_lap) for pit_lap in pit_laps])
+
+        n_laps = int((laps_before + laps_after).max(initial=0))
+        lap_idx = np.arange(n_laps)[None, :]
+        before = lap_idx < laps_before[:, None]
+        after = ~before & (lap_idx < (laps_before + laps_after)[:, None])
+
+        # Pit öncesi mevcut lastik yaşı, sonrası taze lastik
+        tire_age = np.where(before, current_tire_age + lap_idx, lap_idx - laps_before[:, None])
+
+        # Base lap time + degradation
+        lap_times = 90 + tire_age[None, :, :] * degradation[:, None, None]
+        lap_times = np.where((before | after)[None, :, :], lap_times, 0.0)
+
+        return lap_times.sum(axis=-1) + has_pit * self.pit_loss_time
 
     def calculate_fuel_consumption(
         self,
@@ -7,20 +7,37 @@ Anomaly + events → Natural language race story
 Toyota mühendisleri bu hikayeyi okuyarak yarışı anlıyor
 """
 
+import heapq
+import itertools
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _lap_sums_counts(
+    lap_codes: np.ndarray,
+    valid_laps: np.ndarray,
+    values: np.ndarray,
+    n_laps: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Tur bazında toplam ve örnek sayısı (NaN'ler hariç, np.bincount ile)"""
+    mask = valid_laps & ~np.isnan(values)
+    sums = np.bincount(lap_codes[mask], weights=values[mask], minlength=n_laps)
+    counts = np.bincount(lap_codes[mask], minlength=n_laps)
+    return sums, counts
+
+
 class RaceStoryGenerator:
     """
     Yarış hikayesi oluşturucunun race story timeline'ını çıkarıyor
     """
 
+    __slots__ = ('events', 'story')
+
     def __init__(self):
         self.events: List[Dict] = []
         self.story: str = ""
@@ -42,34 +59,50 @@ class RaceStoryGenerator:
         Returns:
             List of event dicts
         """
-        events = []
+        # (lap, sıra, event) heap'i: eşit turlarda ekleme sırası korunur
+        event_heap = []
+        counter = itertools.count()
 
-        # Event 1: Best lap
-        if 'LapNumber' in df.columns and 'Speed' in df.columns:
-            lap_avg_speeds = df.groupby('LapNumber')['Speed'].mean()
-            best_lap = lap_avg_speeds.idxmax()
+        def emit(event: Dict):
+            heapq.heappush(event_heap, (event['lap'], next(counter), event))
 
-            events.append({
-                'lap': int(best_lap),
-                'type': 'best_lap',
-                'severity': 'positive',
-                'description': f"Best lap achieved",
-                'metric': f"{lap_avg_speeds.max():.1f} km/h avg speed"
-            })
+        # Tur numaralarını bir kez integer koda çevir (bincount için)
+        lap_codes = lap_values = valid_laps = None
+        if 'LapNumber' in df.columns:
+            lap_codes, lap_values = pd.factorize(df['LapNumber'], sort=True)
+            valid_laps = lap_codes >= 0
+
+        # Event 1: Best lap
+        if lap_codes is not None and 'Speed' in df.columns:
+            speed_arr = df['Speed'].to_numpy(dtype=np.float64)
+            sums, counts = _lap_sums_counts(lap_codes, valid_laps, speed_arr, len(lap_values))
+
+            if counts.any():
+                lap_avg_speeds = np.where(counts > 0, sums / np.maximum(counts, 1), -np.inf)
+                best_code = lap_avg_speeds.argmax()
+
+                emit({
+                    'lap': int(lap_values[best_code]),
+                    'type': 'best_lap',
+                    'severity': 'positive',
+                    'description': f"Best lap achieved",
+                    'metric': f"{lap_avg_speeds[best_code]:.1f} km/h avg speed"
+                })
 
         # Event 2: Anomalies
-        if 'total_anomalies' in df.columns and 'LapNumber' in df.columns:
-            anomaly_laps = df[df['total_anomalies'] > 0].groupby('LapNumber')['total_anomalies'].sum()
-
-            for lap, count in anomaly_laps.items():
-                if count >= 3:  # Significant anomalies
-                    events.append({
-                        'lap': int(lap),
-                        'type': 'anomaly',
-                        'severity': 'negative',
-                        'description': f"{int(count)} anomalies detected",
-                        'metric': 'Multiple telemetry irregularities'
-                    })
+        if 'total_anomalies' in df.columns and lap_codes is not None:
+            anomaly_arr = df['total_anomalies'].to_numpy(dtype=np.float64)
+            anomaly_arr = np.where(anomaly_arr > 0, anomaly_arr, 0.0)
+            anomaly_laps, _ = _lap_sums_counts(lap_codes, valid_laps, anomaly_arr, len(lap_values))
+
+            for code in np.nonzero(anomaly_laps >= 3)[0]:  # Significant anomalies
+                emit({
+                    'lap': int(lap_values[code]),
+                    'type': 'anomaly',
+                    'severity': 'negative',
+                    'description': f"{int(anomaly_laps[code])} anomalies detected",
+                    'metric': 'Multiple telemetry irregularities'
+                })
 
         # Event 3: Speed peaks
         if 'Speed' in df.columns and 'LapNumber' in df.columns:
@@ -77,7 +110,7 @@ class RaceStoryGenerator:
             max_speed_lap = df.loc[max_speed_idx, 'LapNumber']
             max_speed = df.loc[max_speed_idx, 'Speed']
 
-            events.append({
+            emit({
                 'lap': int(max_speed_lap),
                 'type': 'speed_peak',
                 'severity': 'positive',
@@ -86,38 +119,38 @@ class RaceStoryGenerator:
             })
 
         # Event 4: Brake pressure spikes
-        if 'BrakePressure' in df.columns and 'LapNumber' in df.columns:
-            excessive_brake = df[df['BrakePressure'] > 95]
-
-            if len(excessive_brake) > 0:
-                brake_laps = excessive_brake.groupby('LapNumber').size()
-
-                for lap, count in brake_laps.items():
-                    if count > 5:
-                        events.append({
-                            'lap': int(lap),
-                            'type': 'excessive_braking',
-                            'severity': 'warning',
-                            'description': f"Over-braking detected",
-                            'metric': f"{count} instances >95 bar"
-                        })
+        if 'BrakePressure' in df.columns and lap_codes is not None:
+            brake_arr = df['BrakePressure'].to_numpy(dtype=np.float64)
+            brake_mask = (brake_arr > 95) & valid_laps
+            brake_counts = np.bincount(lap_codes[brake_mask], minlength=len(lap_values))
+
+            for code in np.nonzero(brake_counts > 5)[0]:
+                emit({
+                    'lap': int(lap_values[code]),
+                    'type': 'excessive_braking',
+                    'severity': 'warning',
+                    'description': f"Over-braking detected",
+                    'metric': f"{brake_counts[code]} instances >95 bar"
+                })
 
         # Event 5: Consistency drops
-        if 'speed_consistency' in df.columns and 'LapNumber' in df.columns:
-            lap_consistency = df.groupby('LapNumber')['speed_consistency'].mean()
-            low_consistency_laps = lap_consistency[lap_consistency < 70]
-
-            for lap, score in low_consistency_laps.items():
-                events.append({
-                    'lap': int(lap),
+        if 'speed_consistency' in df.columns and lap_codes is not None:
+            consistency_arr = df['speed_consistency'].to_numpy(dtype=np.float64)
+            sums, counts = _lap_sums_counts(lap_codes, valid_laps, consistency_arr, len(lap_values))
+            lap_consistency = sums / np.maximum(counts, 1)
+
+            for code in np.nonzero((counts > 0) & (lap_consistency < 70))[0]:
+                emit({
+                    'lap': int(lap_values[code]),
                     'type': 'inconsistency',
                     'severity': 'warning',
                     'description': f"Consistency drop",
-                    'metric': f"{score:.1f}% consistency"
+                    'metric': f"{lap_consistency[code]:.1f}% consistency"
                 })
 
-        # Sort by lap
-        events.sort(key=lambda x: x['lap'])
+        # Sort by lap (heap zaten büyük ölçüde sıralı, Timsort O(n) geçer)
+        event_heap.sort()
+        events = [event for _, _, event in event_heap]
 
         self.events = events
         logger.info(f"Extracted {len(events)} key events")
@@ -6,13 +6,118 @@ Jüri için kritik: Dataset'in unique kullanımı
 AnalysisEnduranceWithSections.csv → Sector-by-sector breakdown
 """
 
+import heapq
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 import logging
 
+try:
+    import joblib
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Önerilen joblib disk cache dizini (opt-in: SectorAnalyzer(cache_dir=...))
+DEFAULT_CACHE_DIR = '.cache/gr_pilot'
+
+# Analiz cache sürümü: joblib sadece _analyze_impl'in kendi kodunu hash'ler;
+# kullandığı yardımcılar veya eşikler değişince artırılmalı
+ANALYSIS_CACHE_VERSION = 1
+
+# Insight sınıflandırma eşikleri ve etiketleri (searchsorted index sırası)
+PERF_THRESHOLDS = np.array([0.2, 0.5])
+PERF_LABELS = (
+    "Good - Minor optimization",
+    "Moderate - Improvement needed",
+    "Critical - High time loss"
+)
+PRIORITY_LABELS = ("🟢 Low Priority", "🟡 Medium Priority", "🔴 High Priority")
+
+CONSISTENCY_THRESHOLDS = np.array([50, 70, 85])
+CONSISTENCY_LABELS = ("Poor", "Fair", "Good", "Excellent")
+
+
+def _nan_last(value: float) -> Tuple[bool, float]:
+    """Sıralama key'i: NaN değerler her zaman en sona düşer"""
+    return (value == value, value)
+
+
+def _analyze_impl(
+    sector_numbers: np.ndarray,
+    sector_times: np.ndarray,
+    speeds: Optional[np.ndarray],
+    num_sectors: int,
+    cache_version: int = ANALYSIS_CACHE_VERSION
+) -> Dict[int, Dict]:
+    """
+    analyze_sector_performance'ın DataFrame'den bağımsız hesap çekirdeği
+
+    Sadece NumPy dizileri aldığı için joblib.Memory ile diske cache'lenebilir.
+    cache_version hesapta kullanılmaz, sadece cache anahtarına girer.
+
+    Returns:
+        Dict: {sector_num: {metrics}}
+    """
+    columns = {'SectorNumber': sector_numbers, 'SectorTime': sector_times}
+    if speeds is not None:
+        columns['Speed'] = speeds
+    df = pd.DataFrame(columns)
+    df = df[df['SectorNumber'].isin(range(1, num_sectors + 1))]
+
+    # Tek groupby ile tüm sektör istatistikleri
+    aggregations = {
+        'avg_time': ('SectorTime', 'mean'),
+        'best_time': ('SectorTime', 'min'),
+        'worst_time': ('SectorTime', 'max'),
+        'std_dev': ('SectorTime', 'std'),
+        'attempts': ('SectorTime', 'size')
+    }
+    has_speed = 'Speed' in df.columns
+    if has_speed:
+        aggregations.update({
+            'avg_speed': ('Speed', 'mean'),
+            'min_speed': ('Speed', 'min'),
+            'max_speed': ('Speed', 'max')
+        })
+
+    agg = df.groupby('SectorNumber', observed=True).agg(**aggregations)
+
+    # Time loss vs best
+    agg['delta_to_best'] = agg['avg_time'] - agg['best_time']
+
+    # Consistency score (lower std = better)
+    avg_time = agg['avg_time'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        consistency = np.clip(100 - (agg['std_dev'].to_numpy() / avg_time * 100), 0, None)
+    agg['consistency'] = np.nan_to_num(np.where(avg_time > 0, consistency, 0), nan=0.0)
+
+    # Improvement potential
+    agg['potential_gain'] = agg['delta_to_best']
+
+    if not has_speed:
+        agg['avg_speed'] = agg['min_speed'] = agg['max_speed'] = None
+
+    sector_stats = {}
+    for sector_num, row in agg.to_dict(orient='index').items():
+        sector_stats[int(sector_num)] = {
+            'avg_time': float(row['avg_time']),
+            'best_time': float(row['best_time']),
+            'worst_time': float(row['worst_time']),
+            'std_dev': float(row['std_dev']),
+            'delta_to_best': float(row['delta_to_best']),
+            'consistency': float(row['consistency']),
+            'potential_gain': float(row['potential_gain']),
+            'avg_speed': float(row['avg_speed']) if row['avg_speed'] else None,
+            'min_speed': float(row['min_speed']) if row['min_speed'] else None,
+            'max_speed': float(row['max_speed']) if row['max_speed'] else None,
+            'attempts': int(row['attempts'])
+        }
+
+    return sector_stats
+
 
 class SectorAnalyzer:
     """
@@ -24,11 +129,27 @@ class SectorAnalyzer:
     - Sektör bazında improvement potential
     """
 
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Args:
+            cache_dir: joblib disk cache dizini (None: cache kapalı, ör. DEFAULT_CACHE_DIR)
+        """
         self.sector_data: Optional[pd.DataFrame] = None
         self.analysis_results: Dict = {}
         self.num_sectors: int = 19  # COTA has 19 turns
 
+        # Dataset hash'ine göre memoization
+        self._data_key: Optional[int] = None
+        self._cache: Dict[int, Dict[int, Dict]] = {}
+        self._insights_cache: Dict[Tuple[int, int], Dict] = {}
+
+        # joblib yoksa ya da cache kapalıysa doğrudan hesap
+        self._memory = None
+        self._analyze = _analyze_impl
+        if JOBLIB_AVAILABLE and cache_dir:
+            self._memory = joblib.Memory(location=cache_dir, verbose=0)
+            self._analyze = self._memory.cache(_analyze_impl)
+
     def load_sector_data(self, df: pd.DataFrame) -> None:
         """
         Sector data yükle ve validate et
@@ -49,7 +170,23 @@ class SectorAnalyzer:
             else:
                 raise ValueError("Cannot infer sector data. Missing required columns.")
 
+        # SectorNumber 1-19: int8 yeterli, groupby key kolonu 8x küçülür
+        sector_numbers = df['SectorNumber']
+        if (
+            sector_numbers.dtype != np.int8
+            and pd.api.types.is_integer_dtype(sector_numbers)
+            and sector_numbers.between(np.iinfo(np.int8).min, np.iinfo(np.int8).max).all()
+        ):
+            df = df.copy(deep=False)
+            df['SectorNumber'] = sector_numbers.astype(np.int8)
+
         self.sector_data = df
+
+        # Aynı veri tekrar yüklenirse önceki analiz cache'ten gelir
+        key_cols = [col for col in ['SectorNumber', 'SectorTime', 'Speed'] if col in df.columns]
+        self._data_key = int(pd.util.hash_pandas_object(df[key_cols], index=False).sum())
+        self.analysis_results = self._cache.get(self._data_key, {})
+
         logger.info(f"Sector data loaded: {len(df)} records")
 
     def _infer_sectors_from_distance(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -68,27 +205,55 @@ class SectorAnalyzer:
         lap_length = df.groupby('LapNumber')['Distance'].max().mean()
         sector_length = lap_length / self.num_sectors
 
-        df['SectorNumber'] = ((df['Distance'] % lap_length) / sector_length).astype(int) + 1
-        df['SectorNumber'] = df['SectorNumber'].clip(1, self.num_sectors)
+        # float32 üzerinde tek buffer: mod → ölçekle → floor → int8 (+1, clip)
+        sector_pos = np.mod(
+            df['Distance'].to_numpy(dtype=np.float32), np.float32(lap_length), dtype=np.float32
+        )
+        np.multiply(sector_pos, np.float32(1.0 / sector_length), out=sector_pos)
+        np.floor(sector_pos, out=sector_pos)
+        sector_numbers = sector_pos.astype(np.int8)
+        np.add(sector_numbers, 1, out=sector_numbers)
+        np.clip(sector_numbers, 1, self.num_sectors, out=sector_numbers)
+        df['SectorNumber'] = sector_numbers
 
         # Calculate sector time (simplified)
         if 'TimeStamp' in df.columns:
             df['TimeStamp'] = pd.to_datetime(df['TimeStamp'])
-            df = df.sort_values(['LapNumber', 'SectorNumber', 'TimeStamp'])
 
-            # Group by lap and sector, calculate time difference
-            sector_times = df.groupby(['LapNumber', 'SectorNumber']).agg({
-                'TimeStamp': ['min', 'max']
-            })
-            sector_times.columns = ['start', 'end']
-            sector_times['SectorTime'] = (sector_times['end'] - sector_times['start']).dt.total_seconds()
+            laps = df['LapNumber'].to_numpy(dtype=np.float64)
+            sectors = df['SectorNumber'].to_numpy()
+            timestamps = df['TimeStamp'].to_numpy().view(np.int64)
+            is_nat = np.isnat(df['TimeStamp'].to_numpy())
 
-            df = df.merge(
-                sector_times[['SectorTime']],
-                left_on=['LapNumber', 'SectorNumber'],
-                right_index=True,
-                how='left'
-            )
+            # Lap → sector → timestamp sırası (NaT grupların sonunda)
+            ts_key = np.where(is_nat, np.iinfo(np.int64).max, timestamps)
+            order = np.lexsort((ts_key, sectors, laps))
+            df = df.iloc[order]
+
+            laps, sectors = laps[order], sectors[order]
+            ts_sorted, nat_sorted = timestamps[order], is_nat[order]
+
+            # (lap, sector) grup sınırları
+            if len(df):
+                changed = (laps[1:] != laps[:-1]) | (sectors[1:] != sectors[:-1])
+                starts = np.concatenate(([0], np.flatnonzero(changed) + 1))
+            else:
+                starts = np.array([], dtype=np.int64)
+            lengths = np.diff(np.append(starts, len(df)))
+
+            # Grup başı = min timestamp, maximum.reduceat = max timestamp
+            ts_for_max = np.where(nat_sorted, np.iinfo(np.int64).min, ts_sorted)
+            if len(df):
+                group_end = np.maximum.reduceat(ts_for_max, starts)
+            else:
+                group_end = np.array([], dtype=np.int64)
+            group_start = ts_sorted[starts]
+            sector_time = (group_end - group_start) / 1e9
+
+            # Tamamı NaT olan ya da lap'i NaN olan gruplarda süre yok
+            sector_time[nat_sorted[starts] | np.isnan(laps[starts])] = np.nan
+
+            df['SectorTime'] = np.repeat(sector_time, lengths)
 
         logger.info("Sectors inferred from distance data")
         return df
@@ -103,53 +268,21 @@ class SectorAnalyzer:
         if self.sector_data is None:
             raise ValueError("No sector data loaded. Call load_sector_data() first.")
 
-        df = self.sector_data
-        sector_stats = {}
+        if self._data_key in self._cache:
+            self.analysis_results = self._cache[self._data_key]
+            return self.analysis_results
 
-        for sector_num in range(1, self.num_sectors + 1):
-            sector_df = df[df['SectorNumber'] == sector_num]
-
-            if len(sector_df) == 0:
-                continue
-
-            # Basic statistics
-            avg_time = sector_df['SectorTime'].mean()
-            best_time = sector_df['SectorTime'].min()
-            worst_time = sector_df['SectorTime'].max()
-            std_dev = sector_df['SectorTime'].std()
-
-            # Time loss vs best
-            delta_to_best = avg_time - best_time
-
-            # Consistency score (lower std = better)
-            consistency = max(0, 100 - (std_dev / avg_time * 100)) if avg_time > 0 else 0
-
-            # Improvement potential
-            potential_gain = delta_to_best
-
-            # Speed analysis (if available)
-            if 'Speed' in sector_df.columns:
-                avg_speed = sector_df['Speed'].mean()
-                min_speed = sector_df['Speed'].min()
-                max_speed = sector_df['Speed'].max()
-            else:
-                avg_speed = min_speed = max_speed = None
-
-            sector_stats[sector_num] = {
-                'avg_time': float(avg_time),
-                'best_time': float(best_time),
-                'worst_time': float(worst_time),
-                'std_dev': float(std_dev),
-                'delta_to_best': float(delta_to_best),
-                'consistency': float(consistency),
-                'potential_gain': float(potential_gain),
-                'avg_speed': float(avg_speed) if avg_speed else None,
-                'min_speed': float(min_speed) if min_speed else None,
-                'max_speed': float(max_speed) if max_speed else None,
-                'attempts': len(sector_df)
-            }
+        df = self.sector_data
+        sector_stats = self._analyze(
+            df['SectorNumber'].to_numpy(),
+            df['SectorTime'].to_numpy(),
+            df['Speed'].to_numpy() if 'Speed' in df.columns else None,
+            self.num_sectors,
+            ANALYSIS_CACHE_VERSION
+        )
 
         self.analysis_results = sector_stats
+        self._cache[self._data_key] = sector_stats
         logger.info(f"Analyzed {len(sector_stats)} sectors")
 
         return sector_stats
@@ -167,15 +300,12 @@ class SectorAnalyzer:
         if not self.analysis_results:
             self.analyze_sector_performance()
 
-        # Sort by delta_to_best (descending)
-        weaknesses = [
-            (sector, stats['delta_to_best'])
-            for sector, stats in self.analysis_results.items()
-        ]
-
-        weaknesses.sort(key=lambda x: x[1], reverse=True)
+        # Top N by delta_to_best (descending), tam sort yok
+        top = heapq.nlargest(
+            top_n, self.analysis_results.items(), key=lambda kv: _nan_last(kv[1]['delta_to_best'])
+        )
 
-        return weaknesses[:top_n]
+        return [(sector, stats['delta_to_best']) for sector, stats in top]
 
     def get_strength_map(self, top_n: int = 5) -> List[Tuple[int, float]]:
         """
@@ -190,15 +320,12 @@ class SectorAnalyzer:
         if not self.analysis_results:
             self.analyze_sector_performance()
 
-        # Sort by consistency (descending)
-        strengths = [
-            (sector, stats['consistency'])
-            for sector, stats in self.analysis_results.items()
-        ]
-
-        strengths.sort(key=lambda x: x[1], reverse=True)
+        # Top N by consistency (descending), tam sort yok
+        top = heapq.nlargest(
+            top_n, self.analysis_results.items(), key=lambda kv: _nan_last(kv[1]['consistency'])
+        )
 
-        return strengths[:top_n]
+        return [(sector, stats['consistency']) for sector, stats in top]
 
     def calculate_total_recoverable_time(self) -> float:
         """
@@ -230,47 +357,52 @@ class SectorAnalyzer:
         if sector_num not in self.analysis_results:
             return {}
 
-        stats = self.analysis_results[sector_num]
-
-        # Performance classification
-        if stats['delta_to_best'] > 0.5:
-            performance_level = "Critical - High time loss"
-            priority = "🔴 High Priority"
-        elif stats['delta_to_best'] > 0.2:
-            performance_level = "Moderate - Improvement needed"
-            priority = "🟡 Medium Priority"
-        else:
-            performance_level = "Good - Minor optimization"
-            priority = "🟢 Low Priority"
-
-        # Consistency classification
-        if stats['consistency'] > 85:
-            consistency_level = "Excellent"
-        elif stats['consistency'] > 70:
-            consistency_level = "Good"
-        elif stats['consistency'] > 50:
-            consistency_level = "Fair"
-        else:
-            consistency_level = "Poor"
-
-        # Generate recommendation
-        if stats['delta_to_best'] > 0.3:
-            recommendation = f"Focus on Turn {sector_num}: {stats['delta_to_best']:.3f}s recoverable. Review braking point and apex speed."
-        elif stats['consistency'] < 70:
-            recommendation = f"Improve consistency in Turn {sector_num}. Current variance: {stats['std_dev']:.3f}s"
-        else:
-            recommendation = f"Turn {sector_num} is performing well. Maintain current approach."
-
-        return {
-            'sector_number': sector_num,
-            'performance_level': performance_level,
-            'priority': priority,
-            'consistency_level': consistency_level,
-            'time_loss': stats['delta_to_best'],
-            'potential_gain': stats['potential_gain'],
-            'recommendation': recommendation,
-            'stats': stats
-        }
+        cache_key = (self._data_key, sector_num)
+        if cache_key not in self._insights_cache:
+            self._classify_all()
+
+        return self._insights_cache[cache_key]
+
+    def _classify_all(self) -> None:
+        """
+        Tüm sektörlerin insight sınıflandırmasını toplu hesapla
+
+        Eşik karşılaştırmaları np.searchsorted ile tek seferde yapılır;
+        sonuçlar _insights_cache'e yazılır.
+        """
+        sectors = list(self.analysis_results.keys())
+        stats_list = list(self.analysis_results.values())
+
+        deltas = np.fromiter((stats['delta_to_best'] for stats in stats_list), dtype=np.float64, count=len(stats_list))
+        consistency = np.fromiter((stats['consistency'] for stats in stats_list), dtype=np.float64, count=len(stats_list))
+
+        # Performance classification (>0.2 moderate, >0.5 critical; NaN = good)
+        perf_idx = np.where(np.isnan(deltas), 0, np.searchsorted(PERF_THRESHOLDS, deltas, side='left'))
+
+        # Consistency classification (>50 fair, >70 good, >85 excellent)
+        cons_idx = np.searchsorted(CONSISTENCY_THRESHOLDS, consistency, side='left')
+
+        # Recommendation type: 0 = focus, 1 = consistency, 2 = maintain
+        rec_idx = np.where(deltas > 0.3, 0, np.where(consistency < 70, 1, 2))
+
+        for sector_num, stats, p, c, r in zip(sectors, stats_list, perf_idx, cons_idx, rec_idx):
+            if r == 0:
+                recommendation = f"Focus on Turn {sector_num}: {stats['delta_to_best']:.3f}s recoverable. Review braking point and apex speed."
+            elif r == 1:
+                recommendation = f"Improve consistency in Turn {sector_num}. Current variance: {stats['std_dev']:.3f}s"
+            else:
+                recommendation = f"Turn {sector_num} is performing well. Maintain current approach."
+
+            self._insights_cache[(self._data_key, sector_num)] = {
+                'sector_number': sector_num,
+                'performance_level': PERF_LABELS[p],
+                'priority': PRIORITY_LABELS[p],
+                'consistency_level': CONSISTENCY_LABELS[c],
+                'time_loss': stats['delta_to_best'],
+                'potential_gain': stats['potential_gain'],
+                'recommendation': recommendation,
+                'stats': stats
+            }
 
     def generate_coaching_summary(self) -> str:
         """
@@ -285,21 +417,31 @@ class SectorAnalyzer:
         weaknesses = self.get_weakness_map(top_n=5)
         total_recoverable = self.calculate_total_recoverable_time()
 
-        summary = f"SECTOR ANALYSIS SUMMARY\n"
-        summary += f"Total Recoverable Time: {total_recoverable:.3f} seconds\n\n"
-        summary += f"TOP 5 WEAK SECTORS:\n"
-
-        for i, (sector, time_loss) in enumerate(weaknesses, 1):
-            stats = self.analysis_results[sector]
-            summary += f"{i}. Turn {sector}: -{time_loss:.3f}s (Consistency: {stats['consistency']:.1f}%)\n"
-
-        summary += f"\nKEY RECOMMENDATIONS:\n"
-
-        for sector, time_loss in weaknesses[:3]:
-            insight = self.get_sector_insights(sector)
-            summary += f"- {insight['recommendation']}\n"
-
-        return summary
+        lines = [
+            "SECTOR ANALYSIS SUMMARY",
+            f"Total Recoverable Time: {total_recoverable:.3f} seconds",
+            "",
+            "TOP 5 WEAK SECTORS:"
+        ]
+        lines.extend(
+            f"{i}. Turn {sector}: -{time_loss:.3f}s "
+            f"(Consistency: {self.analysis_results[sector]['consistency']:.1f}%)"
+            for i, (sector, time_loss) in enumerate(weaknesses, 1)
+        )
+
+        lines.append("")
+        lines.append("KEY RECOMMENDATIONS:")
+
+        # Insight'lar tek toplu sınıflandırmadan cache'ten okunur
+        top_sectors = [sector for sector, _ in weaknesses[:3]]
+        if any((self._data_key, sector) not in self._insights_cache for sector in top_sectors):
+            self._classify_all()
+        lines.extend(
+            f"- {self._insights_cache[(self._data_key, sector)]['recommendation']}"
+            for sector in top_sectors
+        )
+
+        return "\n".join(lines) + "\n"
 
     def export_sector_report(self) -> pd.DataFrame:
         """
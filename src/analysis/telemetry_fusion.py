@@ -8,11 +8,294 @@ Bu modül 23 farklı CSV dataset'i birleştirir ve yeni metrikler üretir.
 import pandas as pd
 import numpy as np
 from scipy import signal
-from typing import Dict, Tuple, List, Optional
+from typing import Dict, Tuple, List, Optional, Set
 import logging
 
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    BOTTLENECK_AVAILABLE = False
+
+try:
+    import joblib
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# engineer_features çıktı kolonları (DataFrame'e bu sırayla eklenir)
+FEATURE_COLUMNS = [
+    'speed_delta', 'brake_efficiency', 'throttle_change', 'throttle_smoothness',
+    'g_force_magnitude', 'tire_stress', 'is_turn_entry', 'turn_entry_quality',
+    'speed_variance', 'speed_consistency'
+]
+
+# Float feature'lar tek bir float32 matrise yazılır (is_turn_entry bool, ayrı tutulur)
+FLOAT_FEATURE_COLUMNS = [name for name in FEATURE_COLUMNS if name != 'is_turn_entry']
+FEATURE_SLOTS = {name: k for k, name in enumerate(FLOAT_FEATURE_COLUMNS)}
+
+FEATURE_LOG_LABELS = {
+    'brake_efficiency': "Brake efficiency calculated",
+    'throttle_smoothness': "Throttle smoothness calculated",
+    'g_force_magnitude': "G-force magnitude calculated",
+    'tire_stress': "Tire stress score calculated",
+    'turn_entry_quality': "Turn entry quality calculated",
+    'speed_consistency': "Speed consistency calculated"
+}
+
+# Önerilen joblib disk cache dizini (opt-in: TelemetryFusionEngine(cache_dir=...))
+DEFAULT_CACHE_DIR = '.cache/gr_pilot'
+
+# Feature cache sürümü: joblib sadece _engineer_impl'in kendi kodunu hash'ler;
+# _compute_features, FEATURE_SLOTS veya rolling yardımcıları değişince artırılmalı
+FEATURE_CACHE_VERSION = 1
+
+# Feature engineering öncesi float32'ye indirilen telemetri kanalları
+FLOAT32_CHANNELS = [
+    'Speed', 'BrakePressure', 'Throttle', 'SteeringAngle',
+    'LateralAcceleration', 'LongitudinalAcceleration'
+]
+
+
+def _rolling_zscore(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Tek geçişte rolling Z-score (|x - mean| / (std + eps))
+
+    Sabit pencerede Welford ekle/çıkar güncellemesi; pandas
+    rolling(window, min_periods=1).mean()/.std() ile aynı NaN davranışı.
+
+    Args:
+        values: float64 kolon değerleri
+        window: Pencere boyutu
+
+    Returns:
+        Z-score dizisi (NaN: yetersiz gözlem)
+    """
+    n = values.shape[0]
+    zscore = np.empty(n, dtype=np.float64)
+    nobs = 0
+    mean_x = 0.0
+    ssqdm_x = 0.0
+
+    for i in range(n):
+        # Pencereye yeni değeri ekle
+        val = values[i]
+        if val == val:
+            nobs += 1
+            delta = val - mean_x
+            mean_x += delta / nobs
+            ssqdm_x += ((nobs - 1) * delta * delta) / nobs
+
+        # Pencereden düşen değeri çıkar
+        if i >= window:
+            old = values[i - window]
+            if old == old:
+                nobs -= 1
+                if nobs > 0:
+                    delta = old - mean_x
+                    mean_x -= delta / nobs
+                    ssqdm_x -= ((nobs + 1) * delta * delta) / nobs
+                else:
+                    mean_x = 0.0
+                    ssqdm_x = 0.0
+
+        if nobs > 1:
+            std = np.sqrt(max(ssqdm_x / (nobs - 1), 0.0))
+            zscore[i] = abs((val - mean_x) / (std + 1e-6))  # epsilon: division by zero önleme
+        else:
+            zscore[i] = np.nan
+
+    return zscore
+
+
+if NUMBA_AVAILABLE:
+    _rolling_zscore = njit(cache=True)(_rolling_zscore)
+
+
+def _diff(values: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """pandas Series.diff() eşdeğeri (ilk eleman NaN)"""
+    if out is None:
+        out = np.empty_like(values)
+    if len(values):
+        out[0] = np.nan
+        np.subtract(values[1:], values[:-1], out=out[1:])
+    return out
+
+
+def _nanmax(values: np.ndarray) -> float:
+    """pandas Series.max() eşdeğeri (boş / tamamı NaN ise NaN), tek geçiş"""
+    result = np.fmax.reduce(values, initial=-np.inf)
+    return np.nan if result == -np.inf else result
+
+
+def _compute_features(
+    speed: Optional[np.ndarray],
+    brake: Optional[np.ndarray],
+    throttle: Optional[np.ndarray],
+    steering: Optional[np.ndarray],
+    lat_acc: Optional[np.ndarray],
+    lon_acc: Optional[np.ndarray],
+    time_diff: Optional[np.ndarray] = None,
+    out: Optional[np.ndarray] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Rolling olmayan feature'ları tek fonksiyonda hesapla
+
+    Kanallar bir kez NumPy dizisi olarak okunur; ara pandas Series
+    oluşmaz. Eksik kanal None olarak verilir, ilgili feature atlanır.
+    Float feature'lar out matrisinin FEATURE_SLOTS kolonlarına yazılır.
+
+    Args:
+        out: (n_rows, len(FLOAT_FEATURE_COLUMNS)) float32 matris
+             (None ise burada ayrılır)
+
+    Returns:
+        {feature_name: array} (float feature'lar out kolon view'ları)
+    """
+    features = {}
+    steering_abs = np.abs(steering) if steering is not None else None
+
+    if out is None:
+        channels = (speed, brake, throttle, steering, lat_acc, lon_acc)
+        n = next((len(c) for c in channels if c is not None), 0)
+        out = np.empty((n, len(FLOAT_FEATURE_COLUMNS)), dtype=np.float32, order='F')
+
+    def column(name: str) -> np.ndarray:
+        features[name] = out[:, FEATURE_SLOTS[name]]
+        return features[name]
+
+    # ===== 1. BRAKE EFFICIENCY =====
+    if speed is not None and brake is not None:
+        speed_delta = _diff(speed, out=column('speed_delta'))
+        brake_efficiency = column('brake_efficiency')
+        # Branchless: (brake > 0) çarpanı fren yokken satırı sıfırlar (NaN'lar aşağıda 0)
+        np.abs(speed_delta, out=brake_efficiency)
+        np.multiply(brake_efficiency, brake > 0, out=brake_efficiency)
+        np.divide(brake_efficiency, brake + 1, out=brake_efficiency)  # +1: division by zero önleme
+        np.nan_to_num(brake_efficiency, copy=False, nan=0.0)
+        np.clip(brake_efficiency, 0, 100, out=brake_efficiency)
+
+    # ===== 2. THROTTLE SMOOTHNESS (change) =====
+    if throttle is not None:
+        throttle_change = _diff(throttle, out=column('throttle_change'))
+        np.abs(throttle_change, out=throttle_change)
+
+    # ===== 3. G-FORCE MAGNITUDE =====
+    if lat_acc is not None and lon_acc is not None:
+        np.hypot(lat_acc, lon_acc, out=column('g_force_magnitude'))
+    elif speed is not None and time_diff is not None:
+        # G-force yoksa speed değişiminden tahmin et
+        g_force = np.abs(_diff(speed) / time_diff) / 9.81  # m/s^2 to G
+        np.clip(np.nan_to_num(g_force, copy=False, nan=0.0), 0, 5, out=column('g_force_magnitude'))
+
+    # ===== 4. TIRE STRESS SCORE =====
+    if speed is not None and steering is not None:
+        # Normalizasyon ölçekleri bir kez hesaplanır
+        speed_scale = np.float32(_nanmax(speed) + 1)
+        steering_scale = np.float32(_nanmax(steering_abs) + 1)
+
+        if 'g_force_magnitude' in features:
+            g_force = features['g_force_magnitude']
+            gforce_scale = np.float32(_nanmax(g_force) + 1)
+            tire_stress = (
+                speed / speed_scale * 0.4 +
+                steering_abs / steering_scale * 0.3 +
+                g_force / gforce_scale * 0.3
+            ) * 100
+        else:
+            tire_stress = (speed / speed_scale * 0.5 + steering_abs / steering_scale * 0.5) * 100
+
+        np.clip(np.nan_to_num(tire_stress, copy=False, nan=0.0), 0, 100, out=column('tire_stress'))
+
+    # ===== 5. TURN ENTRY QUALITY =====
+    if steering is not None and brake is not None:
+        is_turn_entry = (steering_abs > 5) & (brake > 20)
+
+        # Trail braking quality: fren + direksiyon koordinasyonu
+        # Branchless: 100 - mask * 2|steer - brake/10|, tek buffer üzerinde
+        turn_entry_quality = column('turn_entry_quality')
+        np.divide(brake, 10, out=turn_entry_quality)
+        np.subtract(steering, turn_entry_quality, out=turn_entry_quality)
+        np.abs(turn_entry_quality, out=turn_entry_quality)
+        np.multiply(turn_entry_quality, 2, out=turn_entry_quality)
+        np.multiply(turn_entry_quality, is_turn_entry, out=turn_entry_quality)
+        np.subtract(100, turn_entry_quality, out=turn_entry_quality)
+        # mask=0 iken NaN/inf kanal 0*NaN üretir; np.where'deki gibi 100 olmalı
+        np.nan_to_num(turn_entry_quality, copy=False, nan=100.0)
+        np.clip(turn_entry_quality, 0, 100, out=turn_entry_quality)
+        features['is_turn_entry'] = is_turn_entry
+
+    return features
+
+
+def _engineer_impl(
+    speed: Optional[np.ndarray],
+    brake: Optional[np.ndarray],
+    throttle: Optional[np.ndarray],
+    steering: Optional[np.ndarray],
+    lat_acc: Optional[np.ndarray],
+    lon_acc: Optional[np.ndarray],
+    time_diff: Optional[np.ndarray] = None,
+    cache_version: int = FEATURE_CACHE_VERSION
+) -> Tuple[np.ndarray, List[str], Optional[np.ndarray]]:
+    """
+    engineer_features'ın DataFrame'den bağımsız hesap çekirdeği
+
+    Girdi ve çıktılar sadece NumPy dizileri olduğu için joblib.Memory
+    ile diske cache'lenebilir. cache_version hesapta kullanılmaz, sadece
+    cache anahtarına girer (bkz. FEATURE_CACHE_VERSION).
+
+    Returns:
+        (float32 feature matrisi, matris kolon isimleri, is_turn_entry veya None)
+    """
+    channels = (speed, brake, throttle, steering, lat_acc, lon_acc)
+    n = next((len(c) for c in channels if c is not None), 0)
+
+    # Tüm float feature'lar tek float32 matriste; kolon başına ayrı ayırma yok
+    feat = np.empty((n, len(FLOAT_FEATURE_COLUMNS)), dtype=np.float32, order='F')
+
+    # Rolling olmayan feature'lar tek geçişte
+    features = _compute_features(speed, brake, throttle, steering, lat_acc, lon_acc, time_diff, out=feat)
+
+    def column(name: str) -> np.ndarray:
+        features[name] = feat[:, FEATURE_SLOTS[name]]
+        return features[name]
+
+    # ===== 2. THROTTLE SMOOTHNESS (rolling) =====
+    if 'throttle_change' in features:
+        throttle_change = pd.Series(features['throttle_change'])
+        throttle_smoothness = 100 - (throttle_change.rolling(10, min_periods=1).mean() * 100)
+        column('throttle_smoothness')[:] = throttle_smoothness.fillna(100).clip(0, 100).to_numpy()
+
+    # ===== 6. SPEED CONSISTENCY (rolling) =====
+    if speed is not None:
+        window_size = min(50, n // 10)  # Adaptive window
+        speed_variance = pd.Series(speed).rolling(window_size, min_periods=1).std()
+        column('speed_variance')[:] = speed_variance.to_numpy()
+        speed_consistency = 100 - (speed_variance * 5)
+        column('speed_consistency')[:] = speed_consistency.fillna(100).clip(0, 100).to_numpy()
+
+    # Hepsi hesaplandıysa matris kopyasız DataFrame bloğu olur
+    present = [name for name in FLOAT_FEATURE_COLUMNS if name in features]
+    if len(present) < len(FLOAT_FEATURE_COLUMNS):
+        feat = feat[:, [FEATURE_SLOTS[name] for name in present]]
+
+    return feat, present, features.get('is_turn_entry')
+
 
 class TelemetryFusionEngine:
     """
@@ -22,11 +305,30 @@ class TelemetryFusionEngine:
     Output: Unified telemetry DataFrame + engineered features
     """
 
-    def __init__(self):
+    def __init__(self, backend: str = "pandas", cache_dir: Optional[str] = None):
+        """
+        Args:
+            backend: "pandas" or "polars" (feature/anomaly pipeline motoru)
+            cache_dir: joblib disk cache dizini (None: cache kapalı, ör. DEFAULT_CACHE_DIR)
+        """
+        self.backend = backend.lower()
+        if self.backend not in ("pandas", "polars"):
+            raise ValueError(f"Unknown backend: {backend}")
+        if self.backend == "polars" and not POLARS_AVAILABLE:
+            raise ImportError("Polars library not installed. Install with: pip install polars")
+
         self.datasets: Dict[str, pd.DataFrame] = {}
+        self._sorted_datasets: Dict[str, pd.DataFrame] = {}
         self.unified_df: Optional[pd.DataFrame] = None
         self.feature_engineered_df: Optional[pd.DataFrame] = None
 
+        # joblib yoksa ya da cache kapalıysa doğrudan hesap
+        self._memory = None
+        self._engineer = _engineer_impl
+        if JOBLIB_AVAILABLE and cache_dir:
+            self._memory = joblib.Memory(location=cache_dir, verbose=0)
+            self._engineer = self._memory.cache(_engineer_impl)
+
     def add_dataset(self, name: str, df: pd.DataFrame) -> None:
         """
         Dataset ekle
@@ -36,6 +338,7 @@ class TelemetryFusionEngine:
             df: pandas DataFrame
         """
         self.datasets[name] = df
+        self._sorted_datasets.pop(name, None)
         logger.info(f"Added dataset: {name} ({len(df)} rows, {len(df.columns)} cols)")
 
     def merge_by_timestamp(
@@ -43,7 +346,8 @@ class TelemetryFusionEngine:
         base_df: pd.DataFrame,
         merge_df: pd.DataFrame,
         timestamp_col: str = 'TimeStamp',
-        tolerance_ms: int = 100
+        tolerance_ms: int = 100,
+        presorted: bool = False
     ) -> pd.DataFrame:
         """
         İki dataset'i timestamp'e göre birleştir
@@ -53,23 +357,34 @@ class TelemetryFusionEngine:
             merge_df: Birleştirilecek DataFrame
             timestamp_col: Timestamp kolon ismi
             tolerance_ms: Merge toleransı (milisaniye)
+            presorted: İki DataFrame de datetime timestamp'e göre sıralıysa
+                dönüşüm ve sort adımlarını atla
 
         Returns:
             Birleştirilmiş DataFrame
         """
         # Timestamp'leri datetime'a çevir
         if timestamp_col in base_df.columns and timestamp_col in merge_df.columns:
-            base_df[timestamp_col] = pd.to_datetime(base_df[timestamp_col], errors='coerce')
-            merge_df[timestamp_col] = pd.to_datetime(merge_df[timestamp_col], errors='coerce')
-
-            # Merge asof (nearest timestamp matching)
-            merged = pd.merge_asof(
-                base_df.sort_values(timestamp_col),
-                merge_df.sort_values(timestamp_col),
-                on=timestamp_col,
-                direction='nearest',
-                tolerance=pd.Timedelta(f'{tolerance_ms}ms')
-            )
+            if not presorted:
+                base_df[timestamp_col] = pd.to_datetime(base_df[timestamp_col], errors='coerce')
+                merge_df[timestamp_col] = pd.to_datetime(merge_df[timestamp_col], errors='coerce')
+                base_df = base_df.sort_values(timestamp_col)
+                merge_df = merge_df.sort_values(timestamp_col)
+
+            tolerance = pd.Timedelta(f'{tolerance_ms}ms')
+
+            # Aynı düzenli grid'de örneklenmişse binary search yerine pozisyon hesabı
+            merged = self._merge_regular_grid(base_df, merge_df, timestamp_col, tolerance)
+
+            if merged is None:
+                # Merge asof (nearest timestamp matching)
+                merged = pd.merge_asof(
+                    base_df,
+                    merge_df,
+                    on=timestamp_col,
+                    direction='nearest',
+                    tolerance=tolerance
+                )
 
             logger.info(f"Merged datasets: {len(merged)} rows")
             return merged
@@ -78,6 +393,59 @@ class TelemetryFusionEngine:
             logger.warning(f"Timestamp column '{timestamp_col}' not found, performing simple merge")
             return pd.concat([base_df, merge_df], axis=1)
 
+    @staticmethod
+    def _merge_regular_grid(
+        base_df: pd.DataFrame,
+        merge_df: pd.DataFrame,
+        timestamp_col: str,
+        tolerance: pd.Timedelta
+    ) -> Optional[pd.DataFrame]:
+        """
+        Düzenli örneklemede merge_asof(direction='nearest') kısayolu
+
+        İki taraf da aynı adım ve fazda (ör. 100ms) tam düzenliyse en yakın
+        satır doğrudan (ts - başlangıç) // adım ile bulunur; aralık dışındaki
+        satırlar uç noktaya eşlenir ve tolerans kontrol edilir. Sonuç
+        merge_asof ile birebir aynıdır.
+
+        Args:
+            base_df: Timestamp'e göre sıralı ana DataFrame
+            merge_df: Timestamp'e göre sıralı birleştirilecek DataFrame
+            timestamp_col: Timestamp kolon ismi
+            tolerance: Merge toleransı
+
+        Returns:
+            Birleştirilmiş DataFrame, grid uygun değilse None
+        """
+        base_ts = base_df[timestamp_col]
+        merge_ts = merge_df[timestamp_col]
+        if (len(base_ts) < 2 or len(merge_ts) < 2 or
+                base_ts.dtype != 'datetime64[ns]' or merge_ts.dtype != 'datetime64[ns]'):
+            return None
+
+        base_ns = base_ts.to_numpy().view(np.int64)
+        merge_ns = merge_ts.to_numpy().view(np.int64)
+
+        step = merge_ns[1] - merge_ns[0]
+        if step <= 0:
+            return None
+        # NaT (int64 min) ve düzensiz örnekler adım kontrolünde elenir
+        base_steps = np.diff(base_ns)
+        merge_steps = np.diff(merge_ns)
+        if (merge_steps != step).any() or (base_steps % step).any() or (base_steps <= 0).any():
+            return None
+        if (base_ns[0] - merge_ns[0]) % step:
+            return None
+
+        # Grid pozisyonu; aralık dışı satırlar en yakın uca kırpılır
+        positions = np.clip((base_ns - merge_ns[0]) // step, 0, len(merge_ns) - 1)
+        within = np.abs(base_ns - merge_ns[positions]) <= tolerance.value
+        positions = np.where(within, positions, -1)
+
+        right = merge_df.drop(columns=[timestamp_col]).reset_index(drop=True).reindex(positions)
+        right.index = pd.RangeIndex(len(right))
+        return base_df.reset_index(drop=True).join(right, lsuffix='_x', rsuffix='_y')
+
     def merge_telemetry(self) -> pd.DataFrame:
         """
         Tüm telemetri verilerini birleştir
@@ -90,29 +458,124 @@ class TelemetryFusionEngine:
 
         # İlk dataset'i base olarak kullan
         dataset_names = list(self.datasets.keys())
-        base_df = self.datasets[dataset_names[0]].copy()
-
         logger.info(f"Using {dataset_names[0]} as base dataset")
 
-        # Diğer dataset'leri merge et
-        for i in range(1, len(dataset_names)):
-            name = dataset_names[i]
-            df = self.datasets[name]
+        all_timestamped = all('TimeStamp' in self.datasets[name].columns for name in dataset_names)
 
-            # Timestamp varsa ona göre, yoksa basit concat
-            if 'TimeStamp' in base_df.columns and 'TimeStamp' in df.columns:
-                base_df = self.merge_by_timestamp(base_df, df)
-            else:
-                # Kolon isimlerini conflict önlemek için suffix ekle
-                base_df = pd.concat([base_df, df], axis=1)
+        if self.backend == "polars" and all_timestamped:
+            base_df = self._merge_telemetry_polars(dataset_names)
+        else:
+            base_df = self._sorted_by_timestamp(dataset_names[0]).copy()
 
-            logger.info(f"Merged {name}")
+            # Diğer dataset'leri merge et
+            for name in dataset_names[1:]:
+                df = self._sorted_by_timestamp(name)
+
+                # Timestamp varsa ona göre, yoksa basit concat
+                if 'TimeStamp' in base_df.columns and 'TimeStamp' in df.columns:
+                    # merge_asof çıktısı zaten timestamp sıralı: tekrar sort yok
+                    base_df = self.merge_by_timestamp(base_df, df, presorted=True)
+                else:
+                    # Kolon isimlerini conflict önlemek için suffix ekle
+                    base_df = pd.concat([base_df, df], axis=1)
+
+                logger.info(f"Merged {name}")
 
         self.unified_df = base_df
         logger.info(f"Final unified dataset: {len(base_df)} rows, {len(base_df.columns)} columns")
 
         return base_df
 
+    def _sorted_by_timestamp(self, name: str) -> pd.DataFrame:
+        """
+        Dataset'in datetime timestamp'e göre sıralı hali (dataset başına bir kez)
+
+        Args:
+            name: Dataset ismi
+
+        Returns:
+            Sıralı DataFrame (TimeStamp yoksa orijinal DataFrame)
+        """
+        if name not in self._sorted_datasets:
+            df = self.datasets[name]
+            if 'TimeStamp' in df.columns:
+                df = df.assign(TimeStamp=pd.to_datetime(df['TimeStamp'], errors='coerce'))
+                df = df.sort_values('TimeStamp', kind='stable')
+            self._sorted_datasets[name] = df
+
+        return self._sorted_datasets[name]
+
+    def _merge_telemetry_polars(self, dataset_names: List[str], tolerance_ms: int = 100) -> pd.DataFrame:
+        """
+        Tüm dataset'leri Polars join_asof zinciriyle tek seferde birleştir
+
+        Her dataset bir kez sıralanır, join'ler lazy olarak kurulur ve
+        sonuç sadece sonda pandas'a çevrilir.
+
+        Polars strategy='nearest' eşit uzaklıkta sonraki satırı seçer, pandas
+        merge_asof(direction='nearest') önceki satırı. Aynı satırları seçmek için
+        nearest, backward + forward join'den pandas kuralıyla kurulur
+        (eşitlikte backward).
+
+        Args:
+            dataset_names: Birleştirilecek dataset isimleri (ilki base)
+            tolerance_ms: Merge toleransı (milisaniye)
+
+        Returns:
+            Birleştirilmiş DataFrame
+        """
+        base = pl.from_pandas(self._sorted_by_timestamp(dataset_names[0])).lazy()
+
+        for name in dataset_names[1:]:
+            other = pl.from_pandas(self._sorted_by_timestamp(name)).lazy()
+
+            # pandas merge_asof ile aynı çakışan kolon isimleri (_x / _y)
+            base_cols = base.collect_schema().names()
+            other_cols = other.collect_schema().names()
+            overlap = [c for c in base_cols if c in other_cols and c != 'TimeStamp']
+            if overlap:
+                base = base.rename({c: f'{c}_x' for c in overlap})
+                other = other.rename({c: f'{c}_y' for c in overlap})
+
+            base = self._join_asof_nearest(base, other, f'{tolerance_ms}ms')
+            logger.info(f"Merged {name}")
+
+        return base.collect().to_pandas()
+
+    @staticmethod
+    def _join_asof_nearest(base: 'pl.LazyFrame', other: 'pl.LazyFrame', tolerance: str) -> 'pl.LazyFrame':
+        """
+        pandas merge_asof(direction='nearest') ile aynı satırları seçen Polars join
+
+        Her base satırı için backward ve forward eşleşme alınır; forward sadece
+        kesin olarak daha yakınsa kullanılır (eşit uzaklıkta backward).
+
+        Args:
+            base: TimeStamp'e göre sıralı ana LazyFrame
+            other: TimeStamp'e göre sıralı birleştirilecek LazyFrame
+            tolerance: Merge toleransı (ör. '100ms')
+
+        Returns:
+            Birleştirilmiş LazyFrame (base kolonları + other kolonları)
+        """
+        other_cols = [c for c in other.collect_schema().names() if c != 'TimeStamp']
+        other = other.with_columns(pl.col('TimeStamp').alias('_match_ts'))
+
+        backward = base.join_asof(other, on='TimeStamp', strategy='backward', tolerance=tolerance)
+        forward = base.join_asof(other, on='TimeStamp', strategy='forward', tolerance=tolerance).select(
+            [pl.col(c).alias(f'{c}_fwd') for c in other_cols + ['_match_ts']]
+        )
+        joined = pl.concat([backward, forward], how='horizontal')
+
+        ts = pl.col('TimeStamp')
+        use_forward = pl.col('_match_ts_fwd').is_not_null() & (
+            pl.col('_match_ts').is_null()
+            | ((pl.col('_match_ts_fwd') - ts) < (ts - pl.col('_match_ts')))
+        )
+        return joined.with_columns(
+            [pl.when(use_forward).then(pl.col(f'{c}_fwd')).otherwise(pl.col(c)).alias(c) for c in other_cols]
+        ).drop([f'{c}_fwd' for c in other_cols] + ['_match_ts', '_match_ts_fwd'])
+
     def engineer_features(self, df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
         """
         Gelişmiş feature engineering - 6 yeni metrik
@@ -134,88 +597,57 @@ class TelemetryFusionEngine:
         if df is None:
             if self.unified_df is None:
                 raise ValueError("No unified data. Run merge_telemetry() first.")
-            df = self.unified_df.copy()
+            df = self.unified_df.copy(deep=False)
         else:
-            df = df.copy()
+            df = df.copy(deep=False)
 
         logger.info("Starting feature engineering...")
 
-        # ===== 1. BRAKE EFFICIENCY =====
-        if 'Speed' in df.columns and 'BrakePressure' in df.columns:
-            df['speed_delta'] = df['Speed'].diff()
-            df['brake_efficiency'] = np.where(
-                df['BrakePressure'] > 0,
-                abs(df['speed_delta']) / (df['BrakePressure'] + 1),  # +1: division by zero önleme
-                0
-            )
-            df['brake_efficiency'] = df['brake_efficiency'].fillna(0).clip(0, 100)
-            logger.info("✓ Brake efficiency calculated")
-
-        # ===== 2. THROTTLE SMOOTHNESS =====
-        if 'Throttle' in df.columns:
-            df['throttle_change'] = df['Throttle'].diff().abs()
-            df['throttle_smoothness'] = 100 - (df['throttle_change'].rolling(10, min_periods=1).mean() * 100)
-            df['throttle_smoothness'] = df['throttle_smoothness'].fillna(100).clip(0, 100)
-            logger.info("✓ Throttle smoothness calculated")
-
-        # ===== 3. G-FORCE MAGNITUDE =====
-        if 'LateralAcceleration' in df.columns and 'LongitudinalAcceleration' in df.columns:
-            df['g_force_magnitude'] = np.sqrt(
-                df['LateralAcceleration']**2 + df['LongitudinalAcceleration']**2
-            )
-            logger.info("✓ G-force magnitude calculated")
-        elif 'Speed' in df.columns:
-            # G-force yoksa speed değişiminden tahmin et
-            speed_change = df['Speed'].diff()
-            time_diff = df.index.to_series().diff().dt.total_seconds().fillna(1)
-            df['g_force_magnitude'] = abs(speed_change / time_diff) / 9.81  # m/s^2 to G
-            df['g_force_magnitude'] = df['g_force_magnitude'].fillna(0).clip(0, 5)
-            logger.info("✓ G-force magnitude estimated from speed")
-
-        # ===== 4. TIRE STRESS SCORE =====
-        if 'Speed' in df.columns and 'SteeringAngle' in df.columns:
-            speed_norm = df['Speed'] / (df['Speed'].max() + 1)
-            steering_norm = abs(df['SteeringAngle']) / (df['SteeringAngle'].abs().max() + 1)
-
-            if 'g_force_magnitude' in df.columns:
-                gforce_norm = df['g_force_magnitude'] / (df['g_force_magnitude'].max() + 1)
-                df['tire_stress'] = (
-                    speed_norm * 0.4 +
-                    steering_norm * 0.3 +
-                    gforce_norm * 0.3
-                ) * 100
-            else:
-                df['tire_stress'] = (
-                    speed_norm * 0.5 +
-                    steering_norm * 0.5
-                ) * 100
-
-            df['tire_stress'] = df['tire_stress'].fillna(0).clip(0, 100)
-            logger.info("✓ Tire stress score calculated")
-
-        # ===== 5. TURN ENTRY QUALITY =====
-        if 'SteeringAngle' in df.columns and 'BrakePressure' in df.columns:
-            df['is_turn_entry'] = (
-                (abs(df['SteeringAngle']) > 5) &
-                (df['BrakePressure'] > 20)
+        # Kanallar <5 anlamlı basamak: float32 yeterli, bellek yarıya iner
+        # (shallow copy: kolon yeniden atanır, çağıranın DataFrame'i değişmez)
+        for col in FLOAT32_CHANNELS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype(np.float32, copy=False)
+
+        if self.backend == "polars":
+            df = self._engineer_features_polars(df)
+            self.feature_engineered_df = df
+            logger.info(f"Feature engineering complete (polars): {len(df.columns)} total columns")
+            return df
+
+        def channel(col: str) -> Optional[np.ndarray]:
+            return df[col].to_numpy() if col in df.columns else None
+
+        speed = channel('Speed')
+        time_diff = None
+        if speed is not None and not ('LateralAcceleration' in df.columns and 'LongitudinalAcceleration' in df.columns):
+            # G-force yoksa speed değişiminden tahmin için zaman farkı
+            time_diff = df.index.to_series().diff().dt.total_seconds().fillna(1).to_numpy()
+
+        # Saf NumPy hesap; joblib varsa dizi byte'larına göre disk cache'ten gelir
+        feat, present, is_turn_entry = self._engineer(
+            speed,
+            channel('BrakePressure'),
+            channel('Throttle'),
+            channel('SteeringAngle'),
+            channel('LateralAcceleration'),
+            channel('LongitudinalAcceleration'),
+            time_diff,
+            FEATURE_CACHE_VERSION
+        )
+
+        feature_df = pd.DataFrame(feat, columns=present, index=df.index, copy=False)
+        if is_turn_entry is not None:
+            position = sum(
+                name in present for name in FEATURE_COLUMNS[:FEATURE_COLUMNS.index('is_turn_entry')]
             )
+            feature_df.insert(position, 'is_turn_entry', is_turn_entry)
 
-            # Trail braking quality: fren + direksiyon koordinasyonu
-            df['turn_entry_quality'] = np.where(
-                df['is_turn_entry'],
-                100 - (abs(df['SteeringAngle'] - df['BrakePressure']/10) * 2),
-                100
-            )
-            df['turn_entry_quality'] = df['turn_entry_quality'].clip(0, 100)
-            logger.info("✓ Turn entry quality calculated")
+        df = self._attach_columns(df, feature_df)
 
-        # ===== 6. SPEED CONSISTENCY =====
-        if 'Speed' in df.columns:
-            window_size = min(50, len(df) // 10)  # Adaptive window
-            df['speed_variance'] = df['Speed'].rolling(window_size, min_periods=1).std()
-            df['speed_consistency'] = 100 - (df['speed_variance'] * 5)
-            df['speed_consistency'] = df['speed_consistency'].fillna(100).clip(0, 100)
-            logger.info("✓ Speed consistency calculated")
+        for name, label in FEATURE_LOG_LABELS.items():
+            if name in present:
+                logger.info(f"✓ {label}")
 
         self.feature_engineered_df = df
         logger.info(f"Feature engineering complete: {len(df.columns)} total columns")
@@ -242,9 +674,9 @@ class TelemetryFusionEngine:
         if df is None:
             if self.feature_engineered_df is None:
                 raise ValueError("No feature-engineered data available.")
-            df = self.feature_engineered_df.copy()
-        else:
-            df = df.copy()
+            df = self.feature_engineered_df
+
+        # Girdi sadece okunur; yeni kolonlar en sonda tek concat ile eklenir
 
         if columns is None:
             # Numeric kolonları otomatik seç
@@ -253,26 +685,244 @@ class TelemetryFusionEngine:
 
         logger.info(f"Detecting anomalies in: {columns}")
 
+        if not columns or len(df) == 0:
+            return df.assign(total_anomalies=0)
+
+        # Rolling Z-score (100 nokta window); çok kısa veride window 0'a düşmesin
+        window_size = min(100, len(df) // 5)
+        if window_size < 1:
+            window_size = len(df)
+
+        # Sabit kolon: rolling std sıfır, hiçbir satır anomali olamaz (iki backend için ortak)
+        constant_columns = {
+            col for col in columns
+            if len(df) < 2 or np.ptp(df[col].to_numpy()) == 0
+        }
+
+        if self.backend == "polars":
+            return self._detect_anomalies_polars(df, columns, threshold, window_size, constant_columns)
+
+        new_cols: Dict[str, np.ndarray] = {}
+        anomaly_flags = []
+
         for col in columns:
-            # Rolling Z-score (100 nokta window)
-            window_size = min(100, len(df) // 5)
-            rolling_mean = df[col].rolling(window_size, min_periods=1).mean()
-            rolling_std = df[col].rolling(window_size, min_periods=1).std()
+            if col in constant_columns:
+                new_cols[f'{col}_zscore'] = np.zeros(len(df))
+                new_cols[f'{col}_anomaly'] = np.zeros(len(df), dtype=bool)
+                continue
+
+            if NUMBA_AVAILABLE:
+                zscore = _rolling_zscore(df[col].to_numpy(dtype=np.float64), window_size)
+            elif BOTTLENECK_AVAILABLE:
+                # float64: float32 move_std sabit pencerede 0 yerine gürültü üretiyor
+                values = df[col].to_numpy(dtype=np.float64)
+                rolling_mean = bn.move_mean(values, window=window_size, min_count=1)
+                rolling_std = bn.move_std(values, window=window_size, min_count=1, ddof=1)
+                zscore = np.abs(
+                    (values - rolling_mean) / (rolling_std + 1e-6)  # epsilon: division by zero önleme
+                )
+            else:
+                rolling_mean = df[col].rolling(window_size, min_periods=1).mean()
+                rolling_std = df[col].rolling(window_size, min_periods=1).std()
 
-            df[f'{col}_zscore'] = np.abs(
-                (df[col] - rolling_mean) / (rolling_std + 1e-6)  # epsilon: division by zero önleme
-            )
+                zscore = np.abs(
+                    (df[col] - rolling_mean) / (rolling_std + np.float32(1e-6))  # epsilon: division by zero önleme
+                ).to_numpy()
 
-            df[f'{col}_anomaly'] = df[f'{col}_zscore'] > threshold
+            anomaly = zscore > threshold
+            new_cols[f'{col}_zscore'] = zscore
+            new_cols[f'{col}_anomaly'] = anomaly
+            anomaly_flags.append(anomaly)
 
-            anomaly_count = df[f'{col}_anomaly'].sum()
+            anomaly_count = int(anomaly.sum())
             logger.info(f"  {col}: {anomaly_count} anomalies detected ({anomaly_count/len(df)*100:.2f}%)")
 
+        # Total anomaly count
+        if anomaly_flags:
+            new_cols['total_anomalies'] = np.add.reduce(np.vstack(anomaly_flags), axis=0, dtype=np.int64)
+        else:
+            new_cols['total_anomalies'] = np.zeros(len(df), dtype=np.int64)
+
+        return self._attach_columns(df, pd.DataFrame(new_cols, index=df.index, copy=False))
+
+    @staticmethod
+    def _attach_columns(df: pd.DataFrame, new_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Yeni kolonları tek concat ile ekle (mevcut kolon blokları kopyalanmaz)
+
+        Aynı isimli eski kolonlar (tekrar çalıştırma) önce düşürülür.
+
+        Args:
+            df: Girdi DataFrame (değiştirilmez)
+            new_df: Aynı index'e sahip yeni kolonlar
+
+        Returns:
+            Birleştirilmiş DataFrame
+        """
+        existing = [name for name in new_df.columns if name in df.columns]
+        if existing:
+            df = df.drop(columns=existing)
+        return pd.concat([df, new_df], axis=1, copy=False)
+
+    def _engineer_features_polars(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        engineer_features'ın Polars lazy karşılığı
+
+        Tüm feature'lar tek bir LazyFrame expression zincirinde kurulur ve
+        tek collect() ile hesaplanır; pandas'a sadece sonunda dönülür.
+
+        Args:
+            df: DataFrame
+
+        Returns:
+            Feature-engineered DataFrame
+        """
+        cols = set(df.columns)
+        lf = pl.from_pandas(df).lazy()
+
+        # ===== 1. BRAKE EFFICIENCY =====
+        if 'Speed' in cols and 'BrakePressure' in cols:
+            lf = lf.with_columns(pl.col('Speed').diff().alias('speed_delta'))
+            lf = lf.with_columns(
+                pl.when(pl.col('BrakePressure') > 0)
+                .then(pl.col('speed_delta').abs() / (pl.col('BrakePressure') + 1))
+                .otherwise(0.0)
+                .fill_null(0.0).fill_nan(0.0).clip(0, 100)
+                .alias('brake_efficiency')
+            )
+
+        # ===== 2. THROTTLE SMOOTHNESS =====
+        if 'Throttle' in cols:
+            lf = lf.with_columns(pl.col('Throttle').diff().abs().alias('throttle_change'))
+            lf = lf.with_columns(
+                (100 - pl.col('throttle_change').rolling_mean(10, min_samples=1) * 100)
+                .fill_null(100.0).fill_nan(100.0).clip(0, 100)
+                .alias('throttle_smoothness')
+            )
+
+        # ===== 3. G-FORCE MAGNITUDE =====
+        has_gforce = False
+        if 'LateralAcceleration' in cols and 'LongitudinalAcceleration' in cols:
+            lf = lf.with_columns(
+                (pl.col('LateralAcceleration').pow(2) + pl.col('LongitudinalAcceleration').pow(2))
+                .sqrt()
+                .alias('g_force_magnitude')
+            )
+            has_gforce = True
+        elif 'Speed' in cols:
+            # G-force yoksa speed değişiminden tahmin et (zaman index'ten)
+            time_diff = df.index.to_series().diff().dt.total_seconds().fillna(1)
+            lf = lf.with_columns(pl.Series('__time_diff', time_diff.to_numpy()))
+            lf = lf.with_columns(
+                ((pl.col('Speed').diff() / pl.col('__time_diff')).abs() / 9.81)
+                .fill_null(0.0).fill_nan(0.0).clip(0, 5)
+                .alias('g_force_magnitude')
+            ).drop('__time_diff')
+            has_gforce = True
+
+        # ===== 4. TIRE STRESS SCORE =====
+        if 'Speed' in cols and 'SteeringAngle' in cols:
+            speed_norm = pl.col('Speed') / (pl.col('Speed').max() + 1)
+            steering_norm = pl.col('SteeringAngle').abs() / (pl.col('SteeringAngle').abs().max() + 1)
+
+            if has_gforce:
+                gforce_norm = pl.col('g_force_magnitude') / (pl.col('g_force_magnitude').max() + 1)
+                tire_stress = (speed_norm * 0.4 + steering_norm * 0.3 + gforce_norm * 0.3) * 100
+            else:
+                tire_stress = (speed_norm * 0.5 + steering_norm * 0.5) * 100
+
+            lf = lf.with_columns(
+                tire_stress.fill_null(0.0).fill_nan(0.0).clip(0, 100).alias('tire_stress')
+            )
+
+        # ===== 5. TURN ENTRY QUALITY =====
+        if 'SteeringAngle' in cols and 'BrakePressure' in cols:
+            lf = lf.with_columns(
+                ((pl.col('SteeringAngle').abs() > 5) & (pl.col('BrakePressure') > 20))
+                .fill_null(False)
+                .alias('is_turn_entry')
+            )
+            lf = lf.with_columns(
+                pl.when(pl.col('is_turn_entry'))
+                .then(100 - (pl.col('SteeringAngle') - pl.col('BrakePressure') / 10).abs() * 2)
+                .otherwise(100.0)
+                .clip(0, 100)
+                .alias('turn_entry_quality')
+            )
+
+        # ===== 6. SPEED CONSISTENCY =====
+        if 'Speed' in cols:
+            window_size = min(50, len(df) // 10)  # Adaptive window
+            lf = lf.with_columns(
+                pl.col('Speed').rolling_std(window_size, min_samples=1).alias('speed_variance')
+            )
+            lf = lf.with_columns(
+                (100 - pl.col('speed_variance') * 5)
+                .fill_null(100.0).fill_nan(100.0).clip(0, 100)
+                .alias('speed_consistency')
+            )
+
+        result = lf.collect().to_pandas()
+        result.index = df.index
+        return result
+
+    def _detect_anomalies_polars(
+        self,
+        df: pd.DataFrame,
+        columns: List[str],
+        threshold: float,
+        window_size: int,
+        constant_columns: Set[str]
+    ) -> pd.DataFrame:
+        """
+        detect_anomalies'in Polars lazy karşılığı (rolling Z-score)
+
+        Args:
+            df: DataFrame
+            columns: Kontrol edilecek kolonlar
+            threshold: Z-score eşiği
+            window_size: Rolling pencere boyutu (detect_anomalies'te hesaplanır)
+            constant_columns: Z-score'u 0 kabul edilen sabit kolonlar
+
+        Returns:
+            DataFrame with anomaly flags
+        """
+        lf = pl.from_pandas(df).lazy()
+
+        for col in columns:
+            if col in constant_columns:
+                lf = lf.with_columns(
+                    pl.lit(0.0, dtype=pl.Float64).alias(f'{col}_zscore'),
+                    pl.lit(False).alias(f'{col}_anomaly')
+                )
+                continue
+
+            # Rolling Z-score
+            lf = lf.with_columns(
+                (
+                    (pl.col(col) - pl.col(col).rolling_mean(window_size, min_samples=1)) /
+                    (pl.col(col).rolling_std(window_size, min_samples=1) + 1e-6)  # epsilon: division by zero önleme
+                ).abs().alias(f'{col}_zscore')
+            )
+            lf = lf.with_columns(
+                (pl.col(f'{col}_zscore') > threshold).fill_null(False).alias(f'{col}_anomaly')
+            )
+
         # Total anomaly count
         anomaly_cols = [f'{col}_anomaly' for col in columns]
-        df['total_anomalies'] = df[anomaly_cols].sum(axis=1)
+        lf = lf.with_columns(
+            pl.sum_horizontal([pl.col(c).cast(pl.Int64) for c in anomaly_cols]).alias('total_anomalies')
+            if anomaly_cols else pl.lit(0).alias('total_anomalies')
+        )
 
-        return df
+        result = lf.collect().to_pandas()
+        result.index = df.index
+
+        for col in columns:
+            anomaly_count = result[f'{col}_anomaly'].sum()
+            logger.info(f"  {col}: {anomaly_count} anomalies detected ({anomaly_count/len(result)*100:.2f}%)")
+
+        return result
 
     def calculate_lap_statistics(self, df: pd.DataFrame, lap_col: str = 'LapNumber') -> Dict:
         """
@@ -289,19 +939,31 @@ class TelemetryFusionEngine:
             logger.warning(f"Lap column '{lap_col}' not found")
             return {}
 
-        lap_stats = {}
-
-        for lap_num in df[lap_col].unique():
-            lap_data = df[df[lap_col] == lap_num]
-
-            lap_stats[int(lap_num)] = {
-                'avg_speed': lap_data['Speed'].mean() if 'Speed' in lap_data.columns else None,
-                'max_speed': lap_data['Speed'].max() if 'Speed' in lap_data.columns else None,
-                'avg_brake_pressure': lap_data['BrakePressure'].mean() if 'BrakePressure' in lap_data.columns else None,
-                'avg_throttle': lap_data['Throttle'].mean() if 'Throttle' in lap_data.columns else None,
-                'anomaly_count': lap_data['total_anomalies'].sum() if 'total_anomalies' in lap_data.columns else 0,
-                'data_points': len(lap_data)
-            }
+        # Tek groupby geçişi; tur başına maske + tam kolon taraması yok
+        aggs = {}
+        if 'Speed' in df.columns:
+            aggs['avg_speed'] = ('Speed', 'mean')
+            aggs['max_speed'] = ('Speed', 'max')
+        if 'BrakePressure' in df.columns:
+            aggs['avg_brake_pressure'] = ('BrakePressure', 'mean')
+        if 'Throttle' in df.columns:
+            aggs['avg_throttle'] = ('Throttle', 'mean')
+        if 'total_anomalies' in df.columns:
+            aggs['anomaly_count'] = ('total_anomalies', 'sum')
+        aggs['data_points'] = (lap_col, 'size')
+
+        agg = df.groupby(lap_col, sort=False, observed=True).agg(**aggs)
+        agg.index = agg.index.astype(int)
+
+        defaults = {
+            'avg_speed': None, 'max_speed': None, 'avg_brake_pressure': None,
+            'avg_throttle': None, 'anomaly_count': 0
+        }
+        for name, value in defaults.items():
+            if name not in agg.columns:
+                agg[name] = value
+
+        lap_stats = agg[list(defaults) + ['data_points']].to_dict(orient='index')
 
         logger.info(f"Calculated statistics for {len(lap_stats)} laps")
         return lap_stats
@@ -11,14 +11,522 @@ Her viraj için:
 - Track position recommendations
 """
 
+import copy
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 import logging
+from operator import itemgetter
+from types import MappingProxyType
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 
+# Circuit of The Americas - 19 viraj database
+#
+# Her viraj için:
+# - Type (hairpin, fast sweeper, technical)
+# - Optimal speed range
+# - Brake point guidance
+# - Key characteristics
+_TURN_DB_RAW: Dict[int, Dict] = {
+    1: {
+        'name': 'Turn 1',
+        'type': 'slow_left',
+        'optimal_speed_range': (60, 80),  # km/h
+        'brake_point_distance': 120,  # meters before apex
+        'difficulty': 'medium',
+        'key_tip': 'Late apex, wide entry for T2 setup',
+        'common_mistake': 'Braking too early, missing apex speed'
+    },
+    2: {
+        'name': 'Turn 2',
+        'type': 'fast_right',
+        'optimal_speed_range': (120, 145),
+        'brake_point_distance': 0,  # Lift only
+        'difficulty': 'easy',
+        'key_tip': 'Committed lift, trust the grip',
+        'common_mistake': 'Over-slowing, losing momentum to T3'
+    },
+    3: {
+        'name': 'Turn 3-5 (Esses)',
+        'type': 'technical_complex',
+        'optimal_speed_range': (100, 130),
+        'brake_point_distance': 50,
+        'difficulty': 'hard',
+        'key_tip': 'Flow and rhythm critical, minimize steering corrections',
+        'common_mistake': 'Too aggressive T3 entry, compromising T5 exit'
+    },
+    6: {
+        'name': 'Turn 6',
+        'type': 'fast_left',
+        'optimal_speed_range': (160, 185),
+        'brake_point_distance': 0,
+        'difficulty': 'medium',
+        'key_tip': 'Full commitment, slight lift if needed',
+        'common_mistake': 'Lifting too much, scrubbing speed'
+    },
+    7: {
+        'name': 'Turn 7',
+        'type': 'fast_right',
+        'optimal_speed_range': (155, 175),
+        'brake_point_distance': 0,
+        'difficulty': 'easy',
+        'key_tip': 'Smooth arc, maintain throttle',
+        'common_mistake': 'Early turn-in, running wide'
+    },
+    8: {
+        'name': 'Turn 8',
+        'type': 'fast_left',
+        'optimal_speed_range': (150, 170),
+        'brake_point_distance': 0,
+        'difficulty': 'easy',
+        'key_tip': 'Constant radius, smooth inputs',
+        'common_mistake': 'Jerky steering, upsetting balance'
+    },
+    9: {
+        'name': 'Turn 9',
+        'type': 'fast_right',
+        'optimal_speed_range': (145, 165),
+        'brake_point_distance': 0,
+        'difficulty': 'easy',
+        'key_tip': 'Flow from T8, maintain momentum',
+        'common_mistake': 'Over-correcting from T8'
+    },
+    10: {
+        'name': 'Turn 10',
+        'type': 'slow_left',
+        'optimal_speed_range': (65, 85),
+        'brake_point_distance': 100,
+        'difficulty': 'medium',
+        'key_tip': 'Trail braking opportunity, late apex',
+        'common_mistake': 'Braking too hard, locking fronts'
+    },
+    11: {
+        'name': 'Turn 11 (Hairpin)',
+        'type': 'hairpin_left',
+        'optimal_speed_range': (55, 70),
+        'brake_point_distance': 150,
+        'difficulty': 'hard',
+        'key_tip': 'CRITICAL: Exit speed determines back straight time',
+        'common_mistake': 'Too much entry speed, compromising exit'
+    },
+    12: {
+        'name': 'Turn 12',
+        'type': 'fast_left',
+        'optimal_speed_range': (140, 160),
+        'brake_point_distance': 0,
+        'difficulty': 'medium',
+        'key_tip': 'Downhill compression, trust grip',
+        'common_mistake': 'Lifting mid-corner, losing time'
+    },
+    13: {
+        'name': 'Turn 13',
+        'type': 'medium_right',
+        'optimal_speed_range': (110, 130),
+        'brake_point_distance': 60,
+        'difficulty': 'medium',
+        'key_tip': 'Setup for T14-15 complex',
+        'common_mistake': 'Not enough rotation, wide T14 entry'
+    },
+    14: {
+        'name': 'Turn 14',
+        'type': 'slow_left',
+        'optimal_speed_range': (75, 95),
+        'brake_point_distance': 80,
+        'difficulty': 'medium',
+        'key_tip': 'Downhill braking, ABS management',
+        'common_mistake': 'Brake lock, flat-spotting tires'
+    },
+    15: {
+        'name': 'Turn 15 (Hairpin)',
+        'type': 'hairpin_right',
+        'optimal_speed_range': (60, 75),
+        'brake_point_distance': 120,
+        'difficulty': 'hard',
+        'key_tip': 'Long acceleration zone ahead, maximize exit',
+        'common_mistake': 'Early turn-in, apexing too soon'
+    },
+    16: {
+        'name': 'Turn 16',
+        'type': 'fast_left',
+        'optimal_speed_range': (135, 155),
+        'brake_point_distance': 0,
+        'difficulty': 'easy',
+        'key_tip': 'Flat out in most conditions',
+        'common_mistake': 'Unnecessary lift, losing momentum'
+    },
+    17: {
+        'name': 'Turn 17',
+        'type': 'fast_right',
+        'optimal_speed_range': (140, 160),
+        'brake_point_distance': 0,
+        'difficulty': 'easy',
+        'key_tip': 'Smooth transition from T16',
+        'common_mistake': 'Abrupt steering change'
+    },
+    18: {
+        'name': 'Turn 18',
+        'type': 'fast_left',
+        'optimal_speed_range': (145, 165),
+        'brake_point_distance': 0,
+        'difficulty': 'easy',
+        'key_tip': 'Final fast section, build confidence',
+        'common_mistake': 'Lifting due to lack of confidence'
+    },
+    19: {
+        'name': 'Turn 19',
+        'type': 'medium_right',
+        'optimal_speed_range': (100, 120),
+        'brake_point_distance': 70,
+        'difficulty': 'medium',
+        'key_tip': 'Exit onto main straight - CRITICAL for lap time',
+        'common_mistake': 'Too much speed mid-corner, poor exit'
+    }
+}
+
+# Instance'lar arasında paylaşılan salt-okunur görünüm (viraj config'leri dahil)
+_TURN_DB = MappingProxyType({
+    _turn: MappingProxyType(_config) for _turn, _config in _TURN_DB_RAW.items()
+})
+
+# Optimal speed range'in turn numarasıyla indekslenen paralel dizileri
+_OPT_MIN = np.full(20, np.nan)
+_OPT_MAX = np.full(20, np.nan)
+for _turn, _config in _TURN_DB.items():
+    _OPT_MIN[_turn], _OPT_MAX[_turn] = _config['optimal_speed_range']
+
+# Recommendation bit'leri (coaching['rec_flags']); bit sırası = öneri sırası
+REC_BRAKE_LATER = 1 << 0
+REC_TRUST_GRIP = 1 << 1
+REC_BRAKE_EARLIER = 1 << 2
+REC_EXIT_SPEED = 1 << 3
+REC_BRAKE_SMOOTHER = 1 << 4
+REC_THROTTLE_PROGRESSIVE = 1 << 5
+REC_STEERING_ARC = 1 << 6
+REC_KEY_TIP = 1 << 7
+REC_AVOID_MISTAKE = 1 << 8
+_REC_BITS = 9
+
+
+def _recommendation_texts(turn_config: Dict) -> Tuple[str, ...]:
+    """
+    Viraj konfigürasyonundan bit sırasına göre öneri metinleri
+
+    Steering önerisi düzeltme sayısına bağlı olduğu için %d şablonu olarak kalır.
+    """
+    return (
+        f"🏎️ Brake {turn_config['brake_point_distance'] - 10}m later to carry more speed",
+        "⚡ Trust the grip - you can carry more speed through apex",
+        f"🛑 Brake {turn_config['brake_point_distance'] + 10}m earlier",
+        "🎯 Focus on exit speed, not entry speed",
+        "🔧 Brake application too abrupt - smoother initial pressure",
+        "⚙️ Throttle too aggressive - progressive application needed",
+        "🎮 %d steering corrections - aim for single smooth arc",
+        f"💡 {turn_config['key_tip']}",
+        f"⚠️ Avoid: {turn_config['common_mistake']}"
+    )
+
+
+# Veritabanı virajları için öneri metinleri import sırasında bir kez hazırlanır
+_REC_TEXTS = {_turn: _recommendation_texts(_config) for _turn, _config in _TURN_DB.items()}
+
+# Analizde kullanılan telemetri kanalları
+TURN_CHANNELS = ('Speed', 'BrakePressure', 'Throttle', 'SteeringAngle')
+
+# Not ↔ puan tabloları (rapor ortalaması için; ASCII kod ortalaması 'E' üretebiliyordu)
+_GRADE_TO_INT = {'A': 4, 'B': 3, 'C': 2, 'D': 1, 'F': 0}
+_INT_TO_GRADE = 'FDCBA'
+
+# Yüzde cutoff'ları (D, C, B, A) ve searchsorted indeksine göre harf notları
+_GRADE_CUTOFFS = np.array([60, 70, 80, 90])
+_GRADE_LETTERS = np.array(['F', 'D', 'C', 'B', 'A'], dtype=object)
+
+# Öncelik sıralaması: priority (high > medium > low), sonra grade (F > A)
+_PRIORITY_RANK = {'high': 3, 'medium': 2, 'low': 1}
+_GRADE_RANK = {'F': 5, 'D': 4, 'C': 3, 'B': 2, 'A': 1, 'N/A': 0}
+
+# Tur başına kompakt metrik tablosu (metrics_df) kolonları
+METRICS_COLUMNS = [
+    'min_speed', 'max_speed', 'speed_delta', 'brake_smoothness', 'throttle_smoothness',
+    'steering_smoothness', 'steering_corrections', 'grade_int', 'priority_int'
+]
+
+# Bu basıncın üstündeki satırlar fren olayı sayılır (bar)
+BRAKE_EVENT_THRESHOLD = 10.0
+
+# analyze_turn_performance memoization limiti (19 viraj × birkaç tur, FIFO)
+ANALYSIS_CACHE_SIZE = 64
+
+# Speed status kodları (-1, 0, 1) → etiket
+SPEED_STATUS_LABELS = ('too_slow', 'optimal', 'too_fast')
+
+
+def _speed_status(
+    min_speed: np.ndarray,
+    optimal_min: np.ndarray,
+    optimal_max: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Optimal range kontrolü (tüm virajlar için tek seferde)
+
+    Args:
+        min_speed: Viraj başına minimum speed
+        optimal_min: Viraj başına optimal alt sınır
+        optimal_max: Viraj başına optimal üst sınır
+
+    Returns:
+        (status kodu: -1 too_slow / 0 optimal / 1 too_fast, speed_delta)
+    """
+    status = np.where(min_speed < optimal_min, -1, np.where(min_speed > optimal_max, 1, 0))
+    delta = np.where(
+        status < 0, optimal_min - min_speed, np.where(status > 0, min_speed - optimal_max, 0.0)
+    )
+    return status, delta
+
+
+def _segment_starts(sorted_codes: np.ndarray) -> np.ndarray:
+    """Sıralı grup kodlarında her segmentin başlangıç pozisyonu"""
+    if len(sorted_codes) == 0:
+        return np.array([], dtype=np.int64)
+    return np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+
+
+def _segment_reduce(
+    ufunc: np.ufunc,
+    values: np.ndarray,
+    starts: np.ndarray,
+    n_groups: int,
+    sorted_codes: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Segment başına ufunc.reduceat; veride olmayan gruplar NaN
+
+    Args:
+        ufunc: np.fmin / np.fmax (NaN atlanır), np.minimum veya np.add
+        values: Gruba göre sıralı değerler
+        starts: Segment başlangıçları
+        n_groups: Toplam grup sayısı
+        sorted_codes: Segment kodları (None: segmentler 0..n_groups-1)
+
+    Returns:
+        Grup başına sonuç
+    """
+    result = np.full(n_groups, np.nan)
+    if len(starts):
+        reduced = ufunc.reduceat(values, starts)
+        if sorted_codes is None:
+            return reduced
+        result[sorted_codes[starts]] = reduced
+    return result
+
+
+def _segment_mean(
+    values: np.ndarray,
+    starts: np.ndarray,
+    n_groups: int,
+    sorted_codes: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """NaN atlayan segment ortalaması (pandas mean eşdeğeri; boş grup NaN)"""
+    valid = ~np.isnan(values)
+    total = _segment_reduce(np.add, np.where(valid, values, 0.0), starts, n_groups, sorted_codes)
+    count = _segment_reduce(np.add, valid.astype(np.int64), starts, n_groups, sorted_codes)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return total / count
+
+
+def _segment_abs_diff(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Grup içi |diff| (Series.diff().abs() eşdeğeri, her segmentin ilki NaN)"""
+    changes = np.empty_like(values)
+    if len(values):
+        np.subtract(values[1:], values[:-1], out=changes[1:])
+        np.abs(changes, out=changes)
+        changes[starts] = np.nan
+    return changes
+
+
+def _smoothness_stats_loop(
+    brake: np.ndarray,
+    throttle: np.ndarray,
+    steering: np.ndarray,
+    starts: np.ndarray
+) -> Tuple[np.ndarray, ...]:
+    """
+    Viraj başına fren olayı + diff tabanlı smoothness istatistikleri
+
+    Tek döngüde: fren olayları (>10 bar) sayısı/toplamı/max'ı ve olaylar
+    arası |diff|, throttle |diff| toplamı ve >5° steering düzeltmeleri.
+    NaN değerler pandas diff/mean gibi atlanır.
+
+    Args:
+        brake, throttle, steering: Viraja göre sıralı float64 kanallar
+            (olmayan kanal NaN dizisi)
+        starts: Segment başlangıçları
+
+    Returns:
+        (brake_count, brake_sum, brake_max, brake_change_sum, brake_change_count,
+         throttle_change_sum, throttle_change_count, steering_corrections)
+    """
+    n_rows = brake.shape[0]
+    n_groups = starts.shape[0]
+    brake_count = np.zeros(n_groups, dtype=np.int64)
+    brake_sum = np.zeros(n_groups)
+    brake_max = np.full(n_groups, np.nan)
+    brake_change_sum = np.zeros(n_groups)
+    brake_change_count = np.zeros(n_groups, dtype=np.int64)
+    throttle_change_sum = np.zeros(n_groups)
+    throttle_change_count = np.zeros(n_groups, dtype=np.int64)
+    steering_corrections = np.zeros(n_groups, dtype=np.int64)
+
+    for g in range(n_groups):
+        begin = starts[g]
+        end = starts[g + 1] if g + 1 < n_groups else n_rows
+        prev_brake = np.nan
+
+        for i in range(begin, end):
+            # Brake events (fren olayları arası diff)
+            b = brake[i]
+            if b > BRAKE_EVENT_THRESHOLD:
+                if brake_count[g] == 0 or b > brake_max[g]:
+                    brake_max[g] = b
+                brake_count[g] += 1
+                brake_sum[g] += b
+                if prev_brake == prev_brake:
+                    brake_change_sum[g] += abs(b - prev_brake)
+                    brake_change_count[g] += 1
+                prev_brake = b
+
+            if i > begin:
+                change = abs(throttle[i] - throttle[i - 1])
+                if change == change:
+                    throttle_change_sum[g] += change
+                    throttle_change_count[g] += 1
+                if abs(steering[i] - steering[i - 1]) > 5:  # >5° changes
+                    steering_corrections[g] += 1
+
+    return (
+        brake_count, brake_sum, brake_max, brake_change_sum, brake_change_count,
+        throttle_change_sum, throttle_change_count, steering_corrections
+    )
+
+
+def _smoothness_stats_numpy(
+    brake: np.ndarray,
+    throttle: np.ndarray,
+    steering: np.ndarray,
+    starts: np.ndarray
+) -> Tuple[np.ndarray, ...]:
+    """_smoothness_stats_loop'un Numba olmadan segment reduction karşılığı"""
+    n_rows = brake.shape[0]
+    n_groups = starts.shape[0]
+    sorted_codes = np.repeat(np.arange(n_groups), np.diff(np.append(starts, n_rows)))
+
+    # Fren maskesi bir kez hesaplanır; sayım doğrudan maske üzerinden yapılır
+    events = brake > BRAKE_EVENT_THRESHOLD
+    brake_events = brake[events]
+    event_codes = sorted_codes[events]
+    event_starts = _segment_starts(event_codes)
+
+    brake_changes = _segment_abs_diff(brake_events, event_starts)
+    brake_changed = ~np.isnan(brake_changes)
+    throttle_changes = _segment_abs_diff(throttle, starts)
+    throttle_changed = ~np.isnan(throttle_changes)
+
+    def total(values: np.ndarray, value_starts: np.ndarray, codes: Optional[np.ndarray] = None) -> np.ndarray:
+        return np.nan_to_num(_segment_reduce(np.add, values, value_starts, n_groups, codes), nan=0.0)
+
+    return (
+        np.add.reduceat(events, starts, dtype=np.int64) if n_rows else np.zeros(n_groups, dtype=np.int64),
+        total(brake_events, event_starts, event_codes),
+        _segment_reduce(np.fmax, brake_events, event_starts, n_groups, event_codes),
+        total(np.where(brake_changed, brake_changes, 0.0), event_starts, event_codes),
+        total(brake_changed.astype(np.int64), event_starts, event_codes).astype(np.int64),
+        total(np.where(throttle_changed, throttle_changes, 0.0), starts),
+        total(throttle_changed.astype(np.int64), starts).astype(np.int64),
+        total((_segment_abs_diff(steering, starts) > 5).astype(np.int64), starts).astype(np.int64)
+    )
+
+
+def _apex_throttle_loop(
+    speed: np.ndarray,
+    throttle: np.ndarray,
+    starts: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Viraj başına apex (ilk minimum speed) ve apex sonrası throttle > 50% sayısı
+
+    Apex pozisyonel argmin'dir (NaN atlanır, tamamı NaN ise segment başı);
+    index etiketine ya da DataFrame dilimine bağlı değildir.
+
+    Args:
+        speed, throttle: Viraja göre sıralı float64 kanallar
+        starts: Segment başlangıçları
+
+    Returns:
+        (apex: segment içi pozisyon, throttle_on_length)
+    """
+    n_rows = speed.shape[0]
+    n_groups = starts.shape[0]
+    apex = np.zeros(n_groups, dtype=np.int64)
+    throttle_on_length = np.zeros(n_groups, dtype=np.int64)
+
+    for g in range(n_groups):
+        begin = starts[g]
+        end = starts[g + 1] if g + 1 < n_groups else n_rows
+
+        best = np.nan
+        apex_row = begin
+        for i in range(begin, end):
+            v = speed[i]
+            if v == v and not (v >= best):
+                best = v
+                apex_row = i
+        apex[g] = apex_row - begin
+
+        for i in range(apex_row, end):
+            if throttle[i] > 50:
+                throttle_on_length[g] += 1
+
+    return apex, throttle_on_length
+
+
+def _apex_throttle_numpy(
+    speed: np.ndarray,
+    throttle: np.ndarray,
+    starts: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """_apex_throttle_loop'un Numba olmadan segment reduction karşılığı"""
+    n_rows = speed.shape[0]
+    n_groups = starts.shape[0]
+    size = np.diff(np.append(starts, n_rows))
+    sorted_codes = np.repeat(np.arange(n_groups), size)
+    position = np.arange(n_rows) - np.repeat(starts, size)
+
+    min_speed = _segment_reduce(np.fmin, speed, starts, n_groups)
+    is_min = speed == min_speed[sorted_codes]
+    apex = _segment_reduce(np.minimum, np.where(is_min, position, n_rows), starts, n_groups)
+    apex[apex == n_rows] = 0  # Tamamı NaN speed: baştan
+    apex = apex.astype(np.int64)
+
+    throttle_on = (position >= apex[sorted_codes]) & (throttle > 50)
+    throttle_on_length = _segment_reduce(np.add, throttle_on.astype(np.int64), starts, n_groups)
+    return apex, throttle_on_length.astype(np.int64)
+
+
+if NUMBA_AVAILABLE:
+    _smoothness_stats = njit(cache=True)(_smoothness_stats_loop)
+    _apex_throttle = njit(cache=True)(_apex_throttle_loop)
+else:
+    _smoothness_stats = _smoothness_stats_numpy
+    _apex_throttle = _apex_throttle_numpy
+
+
 class TurnCoachingSystem:
     """
     19 viraj için detaylı coaching sistemi
@@ -31,178 +539,15 @@ class TurnCoachingSystem:
     """
 
     def __init__(self):
-        # COTA 19-turn configuration
-        self.turn_database = self._initialize_turn_database()
+        # COTA 19-turn configuration (modül sabiti, instance başına kurulmaz)
+        self.turn_database = _TURN_DB
         self.coaching_history: List[Dict] = []
 
-    def _initialize_turn_database(self) -> Dict[int, Dict]:
-        """
-        Circuit of The Americas - 19 viraj database
+        # Son analyze_all_turns çağrısının sayısal özeti (turn_number index'li)
+        self.metrics_df = self._build_metrics_df([])
 
-        Her viraj için:
-        - Type (hairpin, fast sweeper, technical)
-        - Optimal speed range
-        - Brake point guidance
-        - Key characteristics
-
-        Returns:
-            Dict with turn configurations
-        """
-        return {
-            1: {
-                'name': 'Turn 1',
-                'type': 'slow_left',
-                'optimal_speed_range': (60, 80),  # km/h
-                'brake_point_distance': 120,  # meters before apex
-                'difficulty': 'medium',
-                'key_tip': 'Late apex, wide entry for T2 setup',
-                'common_mistake': 'Braking too early, missing apex speed'
-            },
-            2: {
-                'name': 'Turn 2',
-                'type': 'fast_right',
-                'optimal_speed_range': (120, 145),
-                'brake_point_distance': 0,  # Lift only
-                'difficulty': 'easy',
-                'key_tip': 'Committed lift, trust the grip',
-                'common_mistake': 'Over-slowing, losing momentum to T3'
-            },
-            3: {
-                'name': 'Turn 3-5 (Esses)',
-                'type': 'technical_complex',
-                'optimal_speed_range': (100, 130),
-                'brake_point_distance': 50,
-                'difficulty': 'hard',
-                'key_tip': 'Flow and rhythm critical, minimize steering corrections',
-                'common_mistake': 'Too aggressive T3 entry, compromising T5 exit'
-            },
-            6: {
-                'name': 'Turn 6',
-                'type': 'fast_left',
-                'optimal_speed_range': (160, 185),
-                'brake_point_distance': 0,
-                'difficulty': 'medium',
-                'key_tip': 'Full commitment, slight lift if needed',
-                'common_mistake': 'Lifting too much, scrubbing speed'
-            },
-            7: {
-                'name': 'Turn 7',
-                'type': 'fast_right',
-                'optimal_speed_range': (155, 175),
-                'brake_point_distance': 0,
-                'difficulty': 'easy',
-                'key_tip': 'Smooth arc, maintain throttle',
-                'common_mistake': 'Early turn-in, running wide'
-            },
-            8: {
-                'name': 'Turn 8',
-                'type': 'fast_left',
-                'optimal_speed_range': (150, 170),
-                'brake_point_distance': 0,
-                'difficulty': 'easy',
-                'key_tip': 'Constant radius, smooth inputs',
-                'common_mistake': 'Jerky steering, upsetting balance'
-            },
-            9: {
-                'name': 'Turn 9',
-                'type': 'fast_right',
-                'optimal_speed_range': (145, 165),
-                'brake_point_distance': 0,
-                'difficulty': 'easy',
-                'key_tip': 'Flow from T8, maintain momentum',
-                'common_mistake': 'Over-correcting from T8'
-            },
-            10: {
-                'name': 'Turn 10',
-                'type': 'slow_left',
-                'optimal_speed_range': (65, 85),
-                'brake_point_distance': 100,
-                'difficulty': 'medium',
-                'key_tip': 'Trail braking opportunity, late apex',
-                'common_mistake': 'Braking too hard, locking fronts'
-            },
-            11: {
-                'name': 'Turn 11 (Hairpin)',
-                'type': 'hairpin_left',
-                'optimal_speed_range': (55, 70),
-                'brake_point_distance': 150,
-                'difficulty': 'hard',
-                'key_tip': 'CRITICAL: Exit speed determines back straight time',
-                'common_mistake': 'Too much entry speed, compromising exit'
-            },
-            12: {
-                'name': 'Turn 12',
-                'type': 'fast_left',
-                'optimal_speed_range': (140, 160),
-                'brake_point_distance': 0,
-                'difficulty': 'medium',
-                'key_tip': 'Downhill compression, trust grip',
-                'common_mistake': 'Lifting mid-corner, losing time'
-            },
-            13: {
-                'name': 'Turn 13',
-                'type': 'medium_right',
-                'optimal_speed_range': (110, 130),
-                'brake_point_distance': 60,
-                'difficulty': 'medium',
-                'key_tip': 'Setup for T14-15 complex',
-                'common_mistake': 'Not enough rotation, wide T14 entry'
-            },
-            14: {
-                'name': 'Turn 14',
-                'type': 'slow_left',
-                'optimal_speed_range': (75, 95),
-                'brake_point_distance': 80,
-                'difficulty': 'medium',
-                'key_tip': 'Downhill braking, ABS management',
-                'common_mistake': 'Brake lock, flat-spotting tires'
-            },
-            15: {
-                'name': 'Turn 15 (Hairpin)',
-                'type': 'hairpin_right',
-                'optimal_speed_range': (60, 75),
-                'brake_point_distance': 120,
-                'difficulty': 'hard',
-                'key_tip': 'Long acceleration zone ahead, maximize exit',
-                'common_mistake': 'Early turn-in, apexing too soon'
-            },
-            16: {
-                'name': 'Turn 16',
-                'type': 'fast_left',
-                'optimal_speed_range': (135, 155),
-                'brake_point_distance': 0,
-                'difficulty': 'easy',
-                'key_tip': 'Flat out in most conditions',
-                'common_mistake': 'Unnecessary lift, losing momentum'
-            },
-            17: {
-                'name': 'Turn 17',
-                'type': 'fast_right',
-                'optimal_speed_range': (140, 160),
-                'brake_point_distance': 0,
-                'difficulty': 'easy',
-                'key_tip': 'Smooth transition from T16',
-                'common_mistake': 'Abrupt steering change'
-            },
-            18: {
-                'name': 'Turn 18',
-                'type': 'fast_left',
-                'optimal_speed_range': (145, 165),
-                'brake_point_distance': 0,
-                'difficulty': 'easy',
-                'key_tip': 'Final fast section, build confidence',
-                'common_mistake': 'Lifting due to lack of confidence'
-            },
-            19: {
-                'name': 'Turn 19',
-                'type': 'medium_right',
-                'optimal_speed_range': (100, 120),
-                'brake_point_distance': 70,
-                'difficulty': 'medium',
-                'key_tip': 'Exit onto main straight - CRITICAL for lap time',
-                'common_mistake': 'Too much speed mid-corner, poor exit'
-            }
-        }
+        # (turn, kanallar, veri hash'i) → analiz sonucu
+        self._analysis_cache: Dict[Tuple, Dict] = {}
 
     def analyze_turn_performance(
         self,
@@ -217,17 +562,51 @@ class TurnCoachingSystem:
             turn_data: DataFrame for this turn (Speed, BrakePressure, Throttle, SteeringAngle)
 
         Returns:
-            Dict with performance metrics + coaching
+            Dict with performance metrics + coaching (cache'ten bağımsız kopya)
         """
         if turn_number not in self.turn_database:
             logger.warning(f"Turn {turn_number} not in database")
             return {}
 
+        # Aynı telemetri tekrar gelirse (UI refresh, rapor) analiz atlanır
+        channels = tuple(col for col in TURN_CHANNELS if col in turn_data.columns)
+        data_hash = hash(turn_data[list(channels)].to_numpy(dtype=np.float64).tobytes())
+        cache_key = (turn_number, channels, data_hash)
+        # Çağıran sonucu değiştirebilir: cache kaydı dışarı verilmez, kopyası döner
+        if cache_key in self._analysis_cache:
+            return copy.deepcopy(self._analysis_cache[cache_key])
+
         turn_config = self.turn_database[turn_number]
 
         # Extract metrics
         metrics = self._extract_turn_metrics(turn_data, turn_config)
+        analysis = self._build_turn_analysis(turn_number, metrics, turn_config)
+
+        if len(self._analysis_cache) >= ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.pop(next(iter(self._analysis_cache)))
+        self._analysis_cache[cache_key] = analysis
+
+        return copy.deepcopy(analysis)
 
+    def _build_turn_analysis(
+        self,
+        turn_number: int,
+        metrics: Dict,
+        turn_config: Dict,
+        grade: Optional[str] = None
+    ) -> Dict:
+        """
+        Metriklerden coaching + grade ile viraj sonucu oluştur
+
+        Args:
+            turn_number: Turn ID (1-19)
+            metrics: Extracted metrics
+            turn_config: Turn configuration
+            grade: Önceden (toplu) hesaplanmış not; None ise hesaplanır
+
+        Returns:
+            Dict with performance metrics + coaching
+        """
         # Generate coaching
         coaching = self._generate_turn_coaching(
             turn_number,
@@ -235,12 +614,19 @@ class TurnCoachingSystem:
             turn_config
         )
 
+        if grade is None:
+            grade = self._calculate_turn_grade(metrics, turn_config)
+
+        # Öncelik sıralama anahtarı: priority rank üst 4 bit, grade rank alt 4 bit
+        priority_key = (_PRIORITY_RANK.get(coaching['priority'], 0) << 4) | _GRADE_RANK.get(grade, 0)
+
         return {
             'turn_number': turn_number,
             'turn_name': turn_config['name'],
             'metrics': metrics,
             'coaching': coaching,
-            'grade': self._calculate_turn_grade(metrics, turn_config)
+            'grade': grade,
+            'priority_key': priority_key
         }
 
     def _extract_turn_metrics(
@@ -255,42 +641,167 @@ class TurnCoachingSystem:
             turn_data: Turn telemetry
             turn_config: Turn configuration
 
+        Returns:
+            Dict with extracted metrics
+        """
+        # Tek viraj = tek grup
+        table = self._extract_metrics_table(
+            turn_data, np.zeros(len(turn_data), dtype=np.int8), groups=[0]
+        )
+        row = table.loc[0].to_dict()
+
+        if 'min_speed' in row:
+            optimal_min, optimal_max = turn_config['optimal_speed_range']
+            status, delta = _speed_status(np.array([row['min_speed']]), optimal_min, optimal_max)
+            row['speed_status'], row['speed_delta'] = status[0], delta[0]
+
+        return self._metrics_from_row(row, turn_config, turn_data.columns)
+
+    def _extract_metrics_table(
+        self,
+        telemetry_df: pd.DataFrame,
+        keys: Union[np.ndarray, pd.Categorical],
+        groups: Optional[List] = None
+    ) -> pd.DataFrame:
+        """
+        Tüm virajların ham metriklerini tek geçişte çıkar
+
+        Satırlar bir kez viraj ID'sine göre (stable) sıralanır; min/max/mean
+        ve diff tabanlı smoothness metrikleri segment reduction'ları
+        (reduceat) ile tüm virajlar için birlikte hesaplanır.
+        Viraj başına maske taraması ya da DataFrame kopyası yok.
+
+        Args:
+            telemetry_df: Telemetry DataFrame
+            keys: Satır başına viraj ID'si (NaN: hiçbir viraja ait değil);
+                Categorical ise hash yerine mevcut kodları kullanılır
+            groups: Sonuçta olması gereken viraj ID'leri (None: veride olanlar)
+
+        Returns:
+            DataFrame indexed by turn ID (ham agregasyonlar)
+        """
+        columns = telemetry_df.columns
+        codes, turn_ids = pd.factorize(keys)
+        n_groups = len(turn_ids)
+
+        # Viraj sırasına diz (grup içi satır sırası korunur). Telemetri zaten
+        # viraj sırasındaysa (tipik tur verisi) gather atlanır, kolonlar view
+        if (codes >= 0).all() and (codes[1:] >= codes[:-1]).all():
+            order = slice(None)
+            n_sorted = len(codes)
+        else:
+            rows = np.flatnonzero(codes >= 0)
+            order = rows[np.argsort(codes[rows], kind='stable')]
+            n_sorted = len(order)
+        sorted_codes = codes[order]
+        starts = _segment_starts(sorted_codes)
+        size = np.diff(np.append(starts, n_sorted))
+
+        def channel(col: str) -> np.ndarray:
+            return telemetry_df[col].to_numpy(dtype=np.float64)[order]
+
+        table = pd.DataFrame({'size': size}, index=np.asarray(turn_ids))
+
+        # Speed analysis
+        if 'Speed' in columns:
+            speed = channel('Speed')
+            min_speed = _segment_reduce(np.fmin, speed, starts, n_groups)
+            table['min_speed'] = min_speed
+            table['max_speed'] = _segment_reduce(np.fmax, speed, starts, n_groups)
+            table['avg_speed'] = _segment_mean(speed, starts, n_groups)
+
+        # Fren olayları + diff tabanlı smoothness tek kernel geçişinde
+        missing = np.full(n_sorted, np.nan)
+        brake = channel('BrakePressure') if 'BrakePressure' in columns else missing
+        throttle = channel('Throttle') if 'Throttle' in columns else missing
+        steering = channel('SteeringAngle') if 'SteeringAngle' in columns else missing
+        (
+            brake_count, brake_sum, brake_max, brake_change_sum, brake_change_count,
+            throttle_change_sum, throttle_change_count, steering_corrections
+        ) = _smoothness_stats(brake, throttle, steering, starts)
+
+        # Brake analysis (sadece fren olayları, >10 bar)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if 'BrakePressure' in columns:
+                table['max_brake_pressure'] = brake_max
+                table['avg_brake_pressure'] = brake_sum / brake_count
+                table['brake_count'] = brake_count
+                table['brake_change'] = brake_change_sum / brake_change_count
+
+            if 'Throttle' in columns:
+                table['throttle_change'] = throttle_change_sum / throttle_change_count
+
+        # Throttle analysis
+        if 'Throttle' in columns:
+            # Apex = viraj içindeki ilk minimum speed noktası (pozisyonel argmin;
+            # Speed yoksa NaN dizisi → segment başı)
+            apex, throttle_on_length = _apex_throttle(
+                speed if 'Speed' in columns else missing, throttle, starts
+            )
+            table['post_apex_length'] = size - apex
+            table['throttle_on_length'] = throttle_on_length
+
+        # Steering analysis
+        if 'SteeringAngle' in columns:
+            table['max_steering_angle'] = _segment_reduce(np.fmax, np.abs(steering), starts, n_groups)
+            table['steering_corrections'] = steering_corrections
+
+        if groups is not None:
+            table = table.reindex(groups)
+
+        # Olayı olmayan gruplarda sayaçlar 0
+        count_columns = [
+            'size', 'brake_count', 'post_apex_length', 'throttle_on_length', 'steering_corrections'
+        ]
+        for col in count_columns:
+            if col in table.columns:
+                table[col] = table[col].fillna(0).astype(np.int64)
+
+        return table
+
+    def _metrics_from_row(
+        self,
+        row: Dict,
+        turn_config: Dict,
+        columns: pd.Index
+    ) -> Dict:
+        """
+        Agregasyon satırından metrik dict'i oluştur
+
+        Args:
+            row: _extract_metrics_table satırı
+            turn_config: Turn configuration
+            columns: Telemetri kolonları (hangi analizlerin yapılacağı)
+
         Returns:
             Dict with extracted metrics
         """
         metrics = {}
+        n_rows = int(row['size'])
 
         # Speed analysis
-        if 'Speed' in turn_data.columns:
-            metrics['min_speed'] = float(turn_data['Speed'].min())
-            metrics['max_speed'] = float(turn_data['Speed'].max())
-            metrics['avg_speed'] = float(turn_data['Speed'].mean())
+        if 'Speed' in columns:
+            metrics['min_speed'] = float(row['min_speed'])
+            metrics['max_speed'] = float(row['max_speed'])
+            metrics['avg_speed'] = float(row['avg_speed'])
 
-            # Optimal range check
-            optimal_min, optimal_max = turn_config['optimal_speed_range']
-            if metrics['min_speed'] < optimal_min:
-                metrics['speed_status'] = 'too_slow'
-                metrics['speed_delta'] = optimal_min - metrics['min_speed']
-            elif metrics['min_speed'] > optimal_max:
-                metrics['speed_status'] = 'too_fast'
-                metrics['speed_delta'] = metrics['min_speed'] - optimal_max
-            else:
-                metrics['speed_status'] = 'optimal'
-                metrics['speed_delta'] = 0
+            # Optimal range check (status/delta _speed_status ile hesaplandı)
+            status = int(row['speed_status'])
+            metrics['speed_status'] = SPEED_STATUS_LABELS[status + 1]
+            metrics['speed_delta'] = float(row['speed_delta']) if status else 0
 
         # Brake analysis
-        if 'BrakePressure' in turn_data.columns:
-            brake_events = turn_data[turn_data['BrakePressure'] > 10]
+        if 'BrakePressure' in columns:
+            brake_count = int(row['brake_count'])
 
-            if len(brake_events) > 0:
-                metrics['max_brake_pressure'] = float(brake_events['BrakePressure'].max())
-                metrics['avg_brake_pressure'] = float(brake_events['BrakePressure'].mean())
-                metrics['brake_application_length'] = len(brake_events)
+            if brake_count > 0:
+                metrics['max_brake_pressure'] = float(row['max_brake_pressure'])
+                metrics['avg_brake_pressure'] = float(row['avg_brake_pressure'])
+                metrics['brake_application_length'] = brake_count
 
                 # Brake smoothness (variance)
-                if len(brake_events) > 1:
-                    brake_changes = brake_events['BrakePressure'].diff().abs()
-                    metrics['brake_smoothness'] = 100 - float(brake_changes.mean())
+                if brake_count > 1:
+                    metrics['brake_smoothness'] = 100 - float(row['brake_change'])
                 else:
                     metrics['brake_smoothness'] = 100
             else:
@@ -299,35 +810,31 @@ class TurnCoachingSystem:
                 metrics['brake_smoothness'] = 100  # No braking = smooth
 
         # Throttle analysis
-        if 'Throttle' in turn_data.columns:
-            # Find throttle application point (when throttle > 50% after minimum)
-            min_speed_idx = turn_data['Speed'].idxmin() if 'Speed' in turn_data.columns else 0
-
-            post_apex = turn_data.loc[min_speed_idx:]
-            if len(post_apex) > 0 and 'Throttle' in post_apex.columns:
-                throttle_on = post_apex[post_apex['Throttle'] > 50]
-                if len(throttle_on) > 0:
-                    metrics['throttle_application_point'] = 'early' if len(throttle_on) > len(post_apex) * 0.7 else 'late'
+        if 'Throttle' in columns:
+            # Throttle application point (apex sonrası throttle > 50%)
+            post_apex_length = int(row['post_apex_length'])
+            throttle_on_length = int(row['throttle_on_length'])
+            if post_apex_length > 0:
+                if throttle_on_length > 0:
+                    metrics['throttle_application_point'] = 'early' if throttle_on_length > post_apex_length * 0.7 else 'late'
                 else:
                     metrics['throttle_application_point'] = 'none'
 
             # Throttle smoothness
-            if len(turn_data) > 1:
-                throttle_changes = turn_data['Throttle'].diff().abs()
-                metrics['throttle_smoothness'] = 100 - float(throttle_changes.mean())
+            if n_rows > 1:
+                metrics['throttle_smoothness'] = 100 - float(row['throttle_change'])
             else:
                 metrics['throttle_smoothness'] = 100
 
         # Steering analysis
-        if 'SteeringAngle' in turn_data.columns:
-            metrics['max_steering_angle'] = float(turn_data['SteeringAngle'].abs().max())
+        if 'SteeringAngle' in columns:
+            metrics['max_steering_angle'] = float(row['max_steering_angle'])
 
             # Steering corrections (rapid changes)
-            if len(turn_data) > 1:
-                steering_changes = turn_data['SteeringAngle'].diff().abs()
-                corrections = steering_changes[steering_changes > 5]  # >5° changes
-                metrics['steering_corrections'] = len(corrections)
-                metrics['steering_smoothness'] = 100 - (len(corrections) / len(turn_data) * 100)
+            if n_rows > 1:
+                corrections = int(row['steering_corrections'])
+                metrics['steering_corrections'] = corrections
+                metrics['steering_smoothness'] = 100 - (corrections / n_rows * 100)
             else:
                 metrics['steering_corrections'] = 0
                 metrics['steering_smoothness'] = 100
@@ -355,29 +862,21 @@ class TurnCoachingSystem:
             'primary_issue': None,
             'recommendations': [],
             'strong_points': [],
-            'priority': 'medium'
+            'priority': 'medium',
+            'rec_flags': 0
         }
+        flags = 0
 
         # Speed coaching
         if 'speed_status' in metrics:
             if metrics['speed_status'] == 'too_slow':
                 coaching['primary_issue'] = f"Minimum speed {metrics['speed_delta']:.1f} km/h below optimal"
-                coaching['recommendations'].append(
-                    f"🏎️ Brake {turn_config['brake_point_distance'] - 10}m later to carry more speed"
-                )
-                coaching['recommendations'].append(
-                    "⚡ Trust the grip - you can carry more speed through apex"
-                )
+                flags |= REC_BRAKE_LATER | REC_TRUST_GRIP
                 coaching['priority'] = 'high'
 
             elif metrics['speed_status'] == 'too_fast':
                 coaching['primary_issue'] = f"Entry speed {metrics['speed_delta']:.1f} km/h too high"
-                coaching['recommendations'].append(
-                    f"🛑 Brake {turn_config['brake_point_distance'] + 10}m earlier"
-                )
-                coaching['recommendations'].append(
-                    "🎯 Focus on exit speed, not entry speed"
-                )
+                flags |= REC_BRAKE_EARLIER | REC_EXIT_SPEED
                 coaching['priority'] = 'high'
 
             else:
@@ -388,9 +887,7 @@ class TurnCoachingSystem:
         # Brake coaching
         if 'brake_smoothness' in metrics:
             if metrics['brake_smoothness'] < 70:
-                coaching['recommendations'].append(
-                    "🔧 Brake application too abrupt - smoother initial pressure"
-                )
+                flags |= REC_BRAKE_SMOOTHER
             else:
                 coaching['strong_points'].append(
                     f"✅ Good brake control (smoothness: {metrics['brake_smoothness']:.0f}%)"
@@ -399,16 +896,12 @@ class TurnCoachingSystem:
         # Throttle coaching
         if 'throttle_smoothness' in metrics:
             if metrics['throttle_smoothness'] < 75:
-                coaching['recommendations'].append(
-                    "⚙️ Throttle too aggressive - progressive application needed"
-                )
+                flags |= REC_THROTTLE_PROGRESSIVE
 
         # Steering coaching
         if 'steering_corrections' in metrics:
             if metrics['steering_corrections'] > 3:
-                coaching['recommendations'].append(
-                    f"🎮 {metrics['steering_corrections']} steering corrections - aim for single smooth arc"
-                )
+                flags |= REC_STEERING_ARC
                 coaching['priority'] = 'high'
             else:
                 coaching['strong_points'].append(
@@ -416,15 +909,24 @@ class TurnCoachingSystem:
                 )
 
         # Turn-specific tip
-        coaching['recommendations'].append(
-            f"💡 {turn_config['key_tip']}"
-        )
+        flags |= REC_KEY_TIP
 
         # Common mistake warning
         if not coaching['strong_points']:  # If struggling
-            coaching['recommendations'].append(
-                f"⚠️ Avoid: {turn_config['common_mistake']}"
-            )
+            flags |= REC_AVOID_MISTAKE
+
+        # Bitmask → hazır metinler (yalnızca steering sayısı formatlanır)
+        if turn_config is _TURN_DB.get(turn_number):
+            texts = _REC_TEXTS[turn_number]
+        else:
+            texts = _recommendation_texts(turn_config)
+        recommendations = [texts[bit] for bit in range(_REC_BITS) if flags >> bit & 1]
+        if flags & REC_STEERING_ARC:
+            idx = bin(flags & (REC_STEERING_ARC - 1)).count('1')
+            recommendations[idx] %= metrics['steering_corrections']
+
+        coaching['recommendations'] = recommendations
+        coaching['rec_flags'] = flags
 
         return coaching
 
@@ -443,51 +945,58 @@ class TurnCoachingSystem:
         Returns:
             Grade string
         """
-        score = 0
-        max_score = 0
+        return self._calculate_turn_grades([metrics])[0]
+
+    @staticmethod
+    def _calculate_turn_grades(metrics_list: List[Dict]) -> List[str]:
+        """
+        Birden çok viraj için notları tek vektörel hesapla (A-F)
+
+        Puanlama: speed 40 (optimal 40, delta <5 → 30, <10 → 20, aksi 10),
+        brake/throttle/steering smoothness 20'şer puan; sadece metrikte olan
+        bileşenler max_score'a girer. Yüzde, cutoff'lara searchsorted ile eşlenir.
+
+        Args:
+            metrics_list: Viraj başına performance metrics
+
+        Returns:
+            Viraj başına grade string (metrik yoksa 'N/A')
+        """
+        n_turns = len(metrics_list)
+        score = np.zeros(n_turns)
+        max_score = np.zeros(n_turns)
 
         # Speed score (40 points)
-        if 'speed_status' in metrics:
-            max_score += 40
-            if metrics['speed_status'] == 'optimal':
-                score += 40
-            elif metrics['speed_delta'] < 5:
-                score += 30
-            elif metrics['speed_delta'] < 10:
-                score += 20
-            else:
-                score += 10
+        has_speed = np.fromiter(('speed_status' in m for m in metrics_list), dtype=bool, count=n_turns)
+        optimal = np.fromiter(
+            (m.get('speed_status') == 'optimal' for m in metrics_list), dtype=bool, count=n_turns
+        )
+        speed_delta = np.fromiter(
+            (m.get('speed_delta', np.nan) for m in metrics_list), dtype=np.float64, count=n_turns
+        )
+        speed_score = np.select([optimal, speed_delta < 5, speed_delta < 10], [40, 30, 20], default=10)
+        score += np.where(has_speed, speed_score, 0)
+        max_score += np.where(has_speed, 40, 0)
+
+        # Brake / throttle / steering smoothness (20 points each)
+        for key in ('brake_smoothness', 'throttle_smoothness', 'steering_smoothness'):
+            present = np.fromiter((key in m for m in metrics_list), dtype=bool, count=n_turns)
+            smoothness = np.fromiter(
+                (m.get(key, 0.0) for m in metrics_list), dtype=np.float64, count=n_turns
+            )
+            score += np.where(present, (smoothness / 100) * 20, 0.0)
+            max_score += np.where(present, 20, 0)
 
-        # Brake smoothness (20 points)
-        if 'brake_smoothness' in metrics:
-            max_score += 20
-            score += (metrics['brake_smoothness'] / 100) * 20
+        with np.errstate(invalid='ignore', divide='ignore'):
+            percentage = (score / max_score) * 100
 
-        # Throttle smoothness (20 points)
-        if 'throttle_smoothness' in metrics:
-            max_score += 20
-            score += (metrics['throttle_smoothness'] / 100) * 20
-
-        # Steering smoothness (20 points)
-        if 'steering_smoothness' in metrics:
-            max_score += 20
-            score += (metrics['steering_smoothness'] / 100) * 20
-
-        if max_score == 0:
-            return 'N/A'
-
-        percentage = (score / max_score) * 100
-
-        if percentage >= 90:
-            return 'A'
-        elif percentage >= 80:
-            return 'B'
-        elif percentage >= 70:
-            return 'C'
-        elif percentage >= 60:
-            return 'D'
-        else:
-            return 'F'
+        # NaN yüzde: tüm karşılaştırmalar False → 'F'
+        grade_idx = np.searchsorted(_GRADE_CUTOFFS, percentage, side='right')
+        grade_idx[np.isnan(percentage)] = 0
+        grades = _GRADE_LETTERS[grade_idx]
+        grades[max_score == 0] = 'N/A'
+
+        return grades.tolist()
 
     def analyze_all_turns(
         self,
@@ -505,25 +1014,86 @@ class TurnCoachingSystem:
             List of turn analysis dicts
         """
         all_turns = []
+        pending = []  # (all_turns pozisyonu, turn, metrics, config)
 
         if sector_column not in telemetry_df.columns:
             logger.warning(f"{sector_column} column not found - cannot analyze turns")
             return []
 
+        # Tüm virajların metrikleri tek groupby geçişinde. Categorical Sector
+        # kolonları materialize edilmeden mevcut kodlarıyla gruplanır
+        sector = telemetry_df[sector_column]
+        keys = sector.array if isinstance(sector.dtype, pd.CategoricalDtype) else sector.to_numpy()
+        table = self._extract_metrics_table(telemetry_df, keys)
+        rows = dict(zip(table.index, table.to_dict(orient='records')))
+
+        # Optimal range kontrolü tüm virajlar için tek seferde
+        turns = np.array([t for t in range(1, 20) if t in rows and t in self.turn_database], dtype=np.int64)
+        if 'min_speed' in table.columns and len(turns):
+            min_speed = np.array([rows[t]['min_speed'] for t in turns])
+            status, delta = _speed_status(min_speed, _OPT_MIN[turns], _OPT_MAX[turns])
+            for turn, turn_status, turn_delta in zip(turns, status, delta):
+                rows[turn]['speed_status'] = turn_status
+                rows[turn]['speed_delta'] = turn_delta
+
         for turn_num in range(1, 20):  # 19 turns
-            turn_data = telemetry_df[telemetry_df[sector_column] == turn_num]
+            row = rows.get(turn_num)
 
-            if len(turn_data) > 0:
-                analysis = self.analyze_turn_performance(turn_num, turn_data)
-                all_turns.append(analysis)
-            else:
+            if row is None:
                 logger.debug(f"No data for turn {turn_num}")
+                continue
+
+            if turn_num not in self.turn_database:
+                logger.warning(f"Turn {turn_num} not in database")
+                all_turns.append({})
+                continue
+
+            turn_config = self.turn_database[turn_num]
+            metrics = self._metrics_from_row(row, turn_config, telemetry_df.columns)
+            pending.append((len(all_turns), turn_num, metrics, turn_config))
+            all_turns.append({})
+
+        # Notlar tüm virajlar için tek vektörel geçişte
+        grades = self._calculate_turn_grades([job[2] for job in pending])
+        for (position, turn_num, metrics, turn_config), grade in zip(pending, grades):
+            all_turns[position] = self._build_turn_analysis(turn_num, metrics, turn_config, grade)
 
         self.coaching_history = all_turns
+        self.metrics_df = self._build_metrics_df(all_turns)
         logger.info(f"Analyzed {len(all_turns)} turns")
 
         return all_turns
 
+    @staticmethod
+    def _build_metrics_df(all_turns: List[Dict]) -> pd.DataFrame:
+        """
+        Viraj analizlerinden sayısal metrik tablosu oluştur
+
+        Turlar arası karşılaştırma (ör. hangi virajda gelişildi) iki tablonun
+        farkı ile yapılabilir. Eksik metrikler NaN, grade 'N/A' ise -1.
+
+        Args:
+            all_turns: analyze_all_turns sonuç listesi
+
+        Returns:
+            DataFrame indexed by turn_number (METRICS_COLUMNS)
+        """
+        analyzed = [t for t in all_turns if t]
+        records = [
+            {
+                **{col: t['metrics'].get(col, np.nan) for col in METRICS_COLUMNS[:7]},
+                'grade_int': _GRADE_TO_INT.get(t['grade'], -1),
+                'priority_int': _PRIORITY_RANK.get(t['coaching']['priority'], 0)
+            }
+            for t in analyzed
+        ]
+        metrics_df = pd.DataFrame(
+            records,
+            index=pd.Index([t['turn_number'] for t in analyzed], dtype=np.int64, name='turn_number'),
+            columns=METRICS_COLUMNS
+        )
+        return metrics_df.astype(np.float64).astype({'grade_int': np.int8, 'priority_int': np.int8})
+
     def get_priority_coaching(
         self,
         top_n: int = 5
@@ -541,17 +1111,10 @@ class TurnCoachingSystem:
             return []
 
         # Sort by priority (high > medium > low) and grade (F > A)
-        priority_map = {'high': 3, 'medium': 2, 'low': 1}
-        grade_map = {'F': 5, 'D': 4, 'C': 3, 'B': 2, 'A': 1, 'N/A': 0}
-
-        sorted_turns = sorted(
-            self.coaching_history,
-            key=lambda x: (
-                priority_map.get(x['coaching']['priority'], 0),
-                grade_map.get(x['grade'], 0)
-            ),
-            reverse=True
-        )
+        # priority_key analiz oluşturulurken paketlenir; stable sort eşitlikte
+        # sırayı korur (veritabanında olmayan virajların boş sonuçları atlanır)
+        history = [t for t in self.coaching_history if t]
+        sorted_turns = sorted(history, key=itemgetter('priority_key'), reverse=True)
 
         return sorted_turns[:top_n]
 
@@ -565,55 +1128,59 @@ class TurnCoachingSystem:
         if not self.coaching_history:
             return "No turn data analyzed yet"
 
-        report = "=== TURN-BY-TURN COACHING REPORT ===\n\n"
+        # Parçalar listede toplanıp bir kez birleştirilir (+= kopyası yok)
+        parts = ["=== TURN-BY-TURN COACHING REPORT ===\n\n"]
+        append = parts.append
 
         # Overall summary
-        grades = [t['grade'] for t in self.coaching_history if t['grade'] != 'N/A']
-        avg_grade = sum(ord(g) for g in grades) / len(grades) if grades else 0
+        analyzed = [t for t in self.coaching_history if t]
+        grades = [t['grade'] for t in analyzed if t['grade'] != 'N/A']
+        if grades:
+            grade_points = np.fromiter(
+                (_GRADE_TO_INT[g] for g in grades), dtype=np.int8, count=len(grades)
+            )
+            avg_grade = _INT_TO_GRADE[int(round(grade_points.mean()))]
+        else:
+            avg_grade = 'N/A'
 
-        report += f"Turns Analyzed: {len(self.coaching_history)}/19\n"
-        report += f"Average Performance: {chr(int(avg_grade)) if avg_grade > 0 else 'N/A'}\n\n"
+        append(f"Turns Analyzed: {len(self.coaching_history)}/19\n")
+        append(f"Average Performance: {avg_grade}\n\n")
 
         # Priority coaching
-        report += "🔥 PRIORITY IMPROVEMENTS:\n"
+        append("🔥 PRIORITY IMPROVEMENTS:\n")
         priority_turns = self.get_priority_coaching(top_n=5)
 
         for i, turn in enumerate(priority_turns, 1):
-            report += f"\n{i}. {turn['turn_name']} (Grade: {turn['grade']})\n"
+            append(f"\n{i}. {turn['turn_name']} (Grade: {turn['grade']})\n")
 
             if turn['coaching']['primary_issue']:
-                report += f"   Issue: {turn['coaching']['primary_issue']}\n"
+                append(f"   Issue: {turn['coaching']['primary_issue']}\n")
 
             for rec in turn['coaching']['recommendations'][:2]:  # Top 2 recommendations
-                report += f"   → {rec}\n"
+                append(f"   → {rec}\n")
 
         # Strong points
-        report += "\n\n✅ STRONG POINTS:\n"
-        strong_turns = [t for t in self.coaching_history if t['grade'] in ['A', 'B']]
+        append("\n\n✅ STRONG POINTS:\n")
+        strong_turns = [t for t in analyzed if t['grade'] in ['A', 'B']]
 
         for turn in strong_turns[:3]:
-            report += f"• {turn['turn_name']}: {', '.join(turn['coaching']['strong_points'][:2])}\n"
+            append(f"• {turn['turn_name']}: {', '.join(turn['coaching']['strong_points'][:2])}\n")
 
-        return report
+        return ''.join(parts)
 
 
 # Test
 if __name__ == "__main__":
-    # Sample data
+    # Sample data (19 turns × 50 points; viraj başına ortalama/std, PCG64)
+    rng = np.random.default_rng(0)
+    turn_means = np.repeat([70, 135, 115, 160, 65, 125, 110], [1, 1, 3, 5, 1, 7, 1])  # T1, T2, T3-5, T6-10, T11, T12-18, T19
+    turn_stds = np.repeat([10, 10, 15, 10, 8, 12, 10], [1, 1, 3, 5, 1, 7, 1])
     sample_df = pd.DataFrame({
         'Sector': np.repeat(range(1, 20), 50),  # 19 turns, 50 points each
-        'Speed': np.concatenate([
-            np.random.normal(70, 10, 50),   # T1 slow
-            np.random.normal(135, 10, 50),  # T2 fast
-            np.random.normal(115, 15, 50),  # T3-5 complex
-            *[np.random.normal(160, 10, 50) for _ in range(5)],  # T6-10 fast
-            np.random.normal(65, 8, 50),    # T11 hairpin
-            *[np.random.normal(125, 12, 50) for _ in range(7)],  # T12-18
-            np.random.normal(110, 10, 50)   # T19
-        ]),
-        'BrakePressure': np.random.uniform(0, 100, 950),
-        'Throttle': np.random.uniform(0, 100, 950),
-        'SteeringAngle': np.random.normal(0, 20, 950)
+        'Speed': rng.normal(turn_means[:, None], turn_stds[:, None], (19, 50)).ravel(),
+        'BrakePressure': rng.uniform(0, 100, 950),
+        'Throttle': rng.uniform(0, 100, 950),
+        'SteeringAngle': rng.normal(0, 20, 950)
     })
 
     coach = TurnCoachingSystem()
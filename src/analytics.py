@@ -16,18 +16,30 @@ def detect_anomalies(df_main, df_ref, speed_threshold=15.0):
     
     # Let's use interpolation on a common distance grid
     # Create a common distance axis based on the reference lap
-    common_distance = df_ref['distance']
+    # (columns converted to ndarrays once; no intermediate Series / index alignment)
+    common_distance = df_ref['distance'].to_numpy()
+    ref_speed = df_ref['speed'].to_numpy()
+    
+    # np.interp assumes increasing xp; concatenated laps may not be sorted,
+    # so sort only when the one-pass monotonic check fails
+    main_distance = df_main['distance'].to_numpy()
+    main_speed = df_main['speed'].to_numpy()
+    if main_distance.size > 1 and not (np.diff(main_distance) >= 0).all():
+        order = np.argsort(main_distance, kind='stable')
+        main_distance = main_distance[order]
+        main_speed = main_speed[order]
     
     # Interpolate Main Speed to Ref Distance
-    main_speed_interp = np.interp(common_distance, df_main['distance'], df_main['speed'])
+    main_speed_interp = np.interp(common_distance, main_distance, main_speed)
     
     # Calculate Delta
     # Positive Delta = Ref is faster (Main is slower) -> Anomaly
-    speed_delta = df_ref['speed'] - main_speed_interp
+    speed_delta = ref_speed - main_speed_interp
     
-    # Find Anomalies
-    anomalies = df_ref[speed_delta > speed_threshold].copy()
-    anomalies['speed_delta'] = speed_delta[speed_delta > speed_threshold]
-    anomalies['main_speed'] = main_speed_interp[speed_delta > speed_threshold]
+    # Find Anomalies (positions computed once, reused for every column)
+    anomaly_idx = np.flatnonzero(speed_delta > speed_threshold)
+    anomalies = df_ref.iloc[anomaly_idx].copy()
+    anomalies['speed_delta'] = speed_delta[anomaly_idx]
+    anomalies['main_speed'] = main_speed_interp[anomaly_idx]
     
     return anomalies
@@ -1,89 +1,462 @@
+import hashlib
+import re
+from pathlib import Path
+
 import pandas as pd
 import streamlit as st
 import numpy as np
 
-@st.cache_data
-def load_data(file_path, vehicle_id=None, nrows=500000):
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Long-format telemetry: only the columns load_data uses (skips meta_*, expire_at, ...)
+TELEMETRY_COLUMNS = ['lap', 'telemetry_name', 'telemetry_value', 'timestamp', 'vehicle_id']
+# Low-cardinality labels are kept as categoricals (int codes instead of one string per row)
+TELEMETRY_DTYPES = {'telemetry_name': 'category', 'vehicle_id': 'category'}
+
+# Weather: numeric readings only (TIME_UTC_STR repeats TIME_UTC_SECONDS as text)
+WEATHER_COLUMNS = [
+    'TIME_UTC_SECONDS', 'AIR_TEMP', 'TRACK_TEMP', 'HUMIDITY', 'PRESSURE',
+    'WIND_SPEED', 'WIND_DIRECTION', 'RAIN'
+]
+
+# Weather readings fit narrow types: small counts/codes -> smallest int,
+# sensor values (0.1 resolution, < 7 significant digits) -> float32.
+# TIME_UTC_SECONDS stays int64 (epoch seconds).
+WEATHER_INT_COLUMNS = ['HUMIDITY', 'WIND_DIRECTION', 'RAIN']
+WEATHER_FLOAT_COLUMNS = ['AIR_TEMP', 'TRACK_TEMP', 'PRESSURE', 'WIND_SPEED']
+
+# Plotted sensor channels: float32 (~7 significant digits) is far below what a
+# chart can show and halves the memory every trace/copy of them moves.
+# distance is accumulated in float64 first and only stored as float32.
+TELEMETRY_FLOAT32_COLUMNS = ['speed', 'nmot', 'ath', 'pbrake_f', 'Steering_Angle', 'distance']
+
+# Part of load_data's wide-frame snapshot name: bump whenever the pivot ->
+# ffill -> distance -> float32 pipeline (_build_telemetry and its helpers) changes
+TELEMETRY_PIPELINE_VERSION = 1
+
+# Streaming reader block size (bytes)
+TELEMETRY_BLOCK_SIZE = 8 << 20
+
+# Parquet snapshots of parsed CSVs live in the project's (git-ignored) .cache/
+# folder, never next to the user's data files
+PARQUET_CACHE_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'parquet'
+# Part of every snapshot name: bump when a reader or its output schema changes,
+# so existing snapshots (which are only checked against the CSV mtime) are ignored
+PARQUET_CACHE_VERSION = 1
+
+
+def _read_csv(file_path, **kwargs):
     """
-    Loads telemetry data from CSV.
-    Pivots the long-format data to wide-format.
-    Calculates Distance from Speed.
+    pd.read_csv using Arrow's multithreaded parser when available.
+    The pyarrow engine has no nrows support, so partial reads stay on the C engine.
     """
+    if PYARROW_AVAILABLE and 'nrows' not in kwargs:
+        kwargs['engine'] = 'pyarrow'
+    return pd.read_csv(file_path, **kwargs)
+
+
+def _usecols(file_path, wanted, sep=','):
+    """
+    Header names of file_path whose stripped name is in `wanted` (only the
+    header line is read). None when nothing matches, i.e. read every column.
+    """
+    header = pd.read_csv(file_path, sep=sep, nrows=0).columns
+    present = [col for col in header if col.strip() in wanted]
+    return present or None
+
+
+def _parquet_cache_path(file_path, tag=None):
+    """
+    Parquet cache file for the CSV in PARQUET_CACHE_DIR. The name carries a hash
+    of the CSV's full path (same-named files in different folders), the tag
+    (differently-filtered reads) and PARQUET_CACHE_VERSION.
+    """
+    path = Path(file_path).resolve()
+    source = hashlib.sha1(str(path).encode('utf-8')).hexdigest()[:10]
+    name = f"{path.stem}-{source}"
+    if tag:
+        name += '.' + re.sub(r'[^A-Za-z0-9_-]+', '_', tag)
+    return PARQUET_CACHE_DIR / f"{name}.v{PARQUET_CACHE_VERSION}.parquet"
+
+
+def _cached_read(file_path, parser, tag=None, use_cache=True):
+    """
+    Parse a CSV through `parser`, keeping a Parquet copy in PARQUET_CACHE_DIR.
+    Later calls read the typed Parquet file instead of re-tokenizing the CSV,
+    as long as it is at least as new as the CSV. Cache write failures
+    (read-only folder, unsupported column types) just skip caching.
+    """
+    if not (use_cache and PYARROW_AVAILABLE and isinstance(file_path, (str, Path))):
+        return parser(file_path)
+
+    cache_path = _parquet_cache_path(file_path, tag)
     try:
-        # Load a chunk of data
-        # We need to read enough rows to get a meaningful segment
-        df_raw = pd.read_csv(file_path, nrows=nrows)
-        
-        # Filter by vehicle_id if provided, else pick the first one
-        if vehicle_id:
+        if cache_path.exists() and cache_path.stat().st_mtime >= Path(file_path).stat().st_mtime:
+            return pd.read_parquet(cache_path, engine='pyarrow')
+    except (OSError, pa.ArrowException):
+        pass  # Unreadable cache: parse the CSV again
+
+    df = parser(file_path)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(cache_path, engine='pyarrow', compression='zstd')
+    except (OSError, ValueError, TypeError, pa.ArrowException):
+        pass
+    return df
+
+
+def _read_telemetry_pandas(file_path, vehicle_id, nrows):
+    """
+    First `nrows` rows of the telemetry CSV, filtered to one vehicle
+    (the first vehicle in the file when vehicle_id is not given).
+    """
+    df_raw = _read_csv(
+        file_path, nrows=nrows, usecols=TELEMETRY_COLUMNS, dtype=TELEMETRY_DTYPES
+    )
+    
+    # Filter by vehicle_id if provided, else pick the first one
+    if vehicle_id:
+        df_raw = df_raw[df_raw['vehicle_id'] == vehicle_id]
+    else:
+        unique_vehicles = df_raw['vehicle_id'].unique()
+        if len(unique_vehicles) > 0:
+            vehicle_id = unique_vehicles[0]
             df_raw = df_raw[df_raw['vehicle_id'] == vehicle_id]
-        else:
-            unique_vehicles = df_raw['vehicle_id'].unique()
-            if len(unique_vehicles) > 0:
-                vehicle_id = unique_vehicles[0]
-                df_raw = df_raw[df_raw['vehicle_id'] == vehicle_id]
-        
-        if df_raw.empty:
-            return pd.DataFrame()
+    return df_raw
 
-        # Pivot the data
-        # We assume timestamp is the common index. 
-        # However, timestamps might be slightly off between sensors.
-        # We'll pivot on 'timestamp' and 'telemetry_name'.
-        
-        # First, ensure timestamp is datetime
-        df_raw['timestamp'] = pd.to_datetime(df_raw['timestamp'])
-        
-        # Pivot
-        df_pivot = df_raw.pivot_table(
-            index='timestamp', 
-            columns='telemetry_name', 
-            values='telemetry_value',
-            aggfunc='first' # In case of duplicates
+
+def _read_telemetry_arrow(file_path, vehicle_id, nrows):
+    """
+    Same rows as _read_telemetry_pandas, but streamed block by block with
+    pyarrow.csv.open_csv: each block is filtered by vehicle_id before anything
+    is kept, so only the selected vehicle's rows are ever materialized.
+    """
+    reader = pa_csv.open_csv(
+        file_path,
+        read_options=pa_csv.ReadOptions(block_size=TELEMETRY_BLOCK_SIZE),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=TELEMETRY_COLUMNS,
+            column_types={
+                'lap': pa.int64(),
+                'telemetry_name': pa.string(),
+                'telemetry_value': pa.float64(),
+                # ISO-8601 UTC ('...T20:00:00.000Z') parsed by Arrow's C++ reader;
+                # other formats raise ArrowInvalid and go through pandas
+                'timestamp': pa.timestamp('ns', tz='UTC'),
+                'vehicle_id': pa.string()
+            }
         )
+    )
+
+    batches = []
+    rows_read = 0
+    for batch in reader:
+        if nrows is not None:
+            if rows_read >= nrows:
+                break
+            batch = batch.slice(0, nrows - rows_read)
+        rows_read += batch.num_rows
+
+        if not vehicle_id and batch.num_rows:
+            vehicle_id = batch.column('vehicle_id')[0].as_py()
+        mask = pc.equal(batch.column('vehicle_id'), pa.scalar(vehicle_id, type=pa.string()))
+        batch = batch.filter(mask)
+        if batch.num_rows:
+            batches.append(batch)
+
+    table = pa.Table.from_batches(batches, schema=reader.schema)
+    for name in ('telemetry_name', 'vehicle_id'):
+        index = table.schema.get_field_index(name)
+        table = table.set_column(index, name, pc.dictionary_encode(table.column(name)))
+    return table.to_pandas()
+
+
+def _read_telemetry(file_path, vehicle_id, nrows):
+    """Filtered long-format telemetry; Arrow streaming with a pandas fallback"""
+    if PYARROW_AVAILABLE:
+        try:
+            return _read_telemetry_arrow(file_path, vehicle_id, nrows)
+        except pa.ArrowInvalid:
+            # Values outside the fixed schema: pandas' type inference handles them
+            pass
+    return _read_telemetry_pandas(file_path, vehicle_id, nrows)
+
+
+def _coerce_numeric(df, cols):
+    """
+    Convert the listed columns that exist in df to numeric in a single apply
+    (invalid values -> NaN).
+    """
+    present = [col for col in cols if col in df.columns]
+    if present:
+        df[present] = df[present].apply(pd.to_numeric, errors='coerce')
+    return df
+
+
+def _factorize_names(names):
+    """
+    pd.factorize(names, sort=True) for channel names. Categorical input is
+    remapped from its codes (no string hashing); categories that do not occur
+    are left out, so the result is the same as for plain strings.
+    """
+    if not isinstance(names.dtype, pd.CategoricalDtype):
+        return pd.factorize(names, sort=True)
+
+    codes = names.cat.codes.to_numpy()
+    categories = names.cat.categories.to_numpy()
+    used = np.zeros(len(categories), dtype=bool)
+    used[codes[codes >= 0]] = True
+    kept = np.flatnonzero(used)
+    kept = kept[np.argsort(categories[kept], kind='stable')]
+
+    remap = np.full(len(categories), -1, dtype=np.intp)
+    remap[kept] = np.arange(len(kept))
+    return np.where(codes >= 0, remap[codes], -1), pd.Index(categories[kept])
+
+
+def _pivot_first(df_raw):
+    """
+    Long -> wide telemetry: first non-null telemetry_value per (timestamp, telemetry_name).
+    Same result as pivot_table(aggfunc='first'), but built by scattering the
+    first occurrences into a preallocated grid instead of a groupby-reduce.
+    """
+    # Rows without a timestamp or channel name have no cell (factorize codes them -1)
+    df_values = df_raw[
+        df_raw['telemetry_value'].notna()
+        & df_raw['timestamp'].notna()
+        & df_raw['telemetry_name'].notna()
+    ]
+    ts_codes, timestamps = pd.factorize(df_values['timestamp'], sort=True)
+    name_codes, names = _factorize_names(df_values['telemetry_name'])
+
+    # Duplicate readings: keep the first one (pairs are unique after this)
+    first = ~pd.Series(ts_codes * len(names) + name_codes).duplicated().to_numpy()
+
+    values = df_values['telemetry_value'].to_numpy()
+    grid = np.full((len(timestamps), len(names)), np.nan, dtype=np.result_type(values.dtype, np.float64))
+    grid[ts_codes[first], name_codes[first]] = values[first]
+
+    return pd.DataFrame(
+        grid,
+        index=pd.Index(timestamps, name='timestamp'),
+        columns=pd.Index(names, name='telemetry_name')
+    )
+
+
+def _ffill_columns_loop(columns):
+    """
+    Forward fill each row of a (columns x samples) float array and drop the
+    leading samples where any column has not reported yet.
+    Returns (filled array trimmed to [:, start:], start).
+    """
+    m, n = columns.shape
+    out = np.empty_like(columns)
+    start = 0
+    for j in range(m):
+        first = n
+        last = np.nan
+        for i in range(n):
+            value = columns[j, i]
+            if value == value:
+                last = value
+                if first == n:
+                    first = i
+            out[j, i] = last
+        if first > start:
+            start = first
+    return out[:, start:], start
+
+
+if NUMBA_AVAILABLE:
+    _ffill_columns = njit(cache=True)(_ffill_columns_loop)
+
+
+def _ffill_dropna(df):
+    """
+    Same result as df.ffill().dropna() for the pivoted telemetry: the float
+    sensor block is filled and trimmed in one pass per column, other columns
+    (lap) are just sliced. Without numba, or with gaps outside the float
+    block, this is plain pandas (NumPy's running-max ffill is no faster than
+    pandas' own).
+    """
+    is_float = (df.dtypes == np.float64).to_numpy()
+    others = df.columns[~is_float]
+    if not NUMBA_AVAILABLE or not is_float.any() or df[others].isna().to_numpy().any():
+        return df.ffill().dropna()
+
+    # pandas keeps a float block as (columns x rows): work on it in that layout
+    block = np.ascontiguousarray(df.loc[:, is_float].to_numpy().T)
+    filled, start = _ffill_columns(block)
+    result = pd.DataFrame(filled.T, index=df.index[start:], columns=df.columns[is_float])
+    for col in others:
+        result[col] = df[col].to_numpy()[start:]
+    if not result.columns.equals(df.columns):
+        result = result[df.columns]
+    return result
+
+
+def _load_raw_telemetry(file_path, vehicle_id, nrows, use_cache):
+    """Long-format telemetry rows (cached read) with timestamp as datetime."""
+    df_raw = _cached_read(
+        file_path,
+        lambda path: _read_telemetry(path, vehicle_id, nrows),
+        tag=f"{vehicle_id or 'first'}-{nrows}",
+        use_cache=use_cache
+    )
+    if not df_raw.empty and not pd.api.types.is_datetime64_any_dtype(df_raw['timestamp']):
+        df_raw['timestamp'] = pd.to_datetime(df_raw['timestamp'])
+    return df_raw
+
+
+def _split_channels(df_raw):
+    """
+    Long -> columnar telemetry: {telemetry_name: (timestamps, values)} with one
+    pair of contiguous arrays per channel, in file order. Missing readings are
+    dropped. Channels are cut out of a single stable sort by name code.
+    """
+    # Rows without a timestamp or channel name have no cell (factorize codes them -1)
+    df_values = df_raw[
+        df_raw['telemetry_value'].notna()
+        & df_raw['timestamp'].notna()
+        & df_raw['telemetry_name'].notna()
+    ]
+    name_codes, names = _factorize_names(df_values['telemetry_name'])
+    order = np.argsort(name_codes, kind='stable')
+    bounds = np.searchsorted(name_codes[order], np.arange(len(names) + 1))
+
+    # datetime64 (UTC) rather than an object array of Timestamps
+    timestamps = df_values['timestamp'].to_numpy(dtype='datetime64[ns]')[order]
+    values = df_values['telemetry_value'].to_numpy()[order]
+    return {
+        name: (timestamps[bounds[i]:bounds[i + 1]], values[bounds[i]:bounds[i + 1]])
+        for i, name in enumerate(names)
+    }
+
+
+def _read_weather(file_path):
+    """Weather CSV, used columns only, numeric readings downcast (see WEATHER_*_COLUMNS)."""
+    df = _read_csv(file_path, sep=';', usecols=_usecols(file_path, WEATHER_COLUMNS, sep=';'))
+    for col in WEATHER_INT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce', downcast='integer')
+    for col in WEATHER_FLOAT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce', downcast='float')
+    return df
+
+
+def _build_telemetry(file_path, vehicle_id, nrows):
+    """Wide-format telemetry for load_data: pivot, forward fill, distance."""
+    # No raw snapshot here: load_data caches the finished frame instead
+    df_raw = _load_raw_telemetry(file_path, vehicle_id, nrows, use_cache=False)
+    
+    if df_raw.empty:
+        return pd.DataFrame()
+
+    # Pivot the data
+    # We assume timestamp is the common index. 
+    # However, timestamps might be slightly off between sensors.
+    # We'll pivot on 'timestamp' and 'telemetry_name'.
+    
+    # Pivot (first reading per timestamp/sensor, see _pivot_first)
+    df_pivot = _pivot_first(df_raw)
+    
+    # Extract Lap number (it's a column, not a telemetry_name)
+    # We group by timestamp and take the first lap value found
+    # (groupby.first skips missing laps, which drop_duplicates would keep;
+    # no sort needed since join aligns on the pivot's index)
+    lap_series = df_raw.groupby('timestamp', sort=False)['lap'].first()
+    df_pivot = df_pivot.join(lap_series)
+    
+    # Forward fill missing values (sensors report at different rates)
+    df_pivot = _ffill_dropna(df_pivot)
+    
+    # Reset index to make timestamp a column
+    df_pivot = df_pivot.reset_index()
+    
+    # Ensure numeric types for key columns
+    numeric_cols = ['speed', 'nmot', 'Steering_Angle', 'ath', 'pbrake_f', 'pbrake_r', 'accx_can', 'accy_can']
+    df_pivot = _coerce_numeric(df_pivot, numeric_cols)
+    
+    # Calculate Distance
+    # Speed is likely in km/h or m/s. Let's assume km/h for racing.
+    # Distance = Speed * Time
+    if 'speed' in df_pivot.columns:
+        # Calculate time delta in seconds
+        df_pivot['time_delta'] = df_pivot['timestamp'].diff().dt.total_seconds().fillna(0)
         
-        # Extract Lap number (it's a column, not a telemetry_name)
-        # We group by timestamp and take the first lap value found
-        lap_series = df_raw.groupby('timestamp')['lap'].first()
-        df_pivot = df_pivot.join(lap_series)
-        
-        # Forward fill missing values (sensors report at different rates)
-        df_pivot = df_pivot.fillna(method='ffill').dropna()
-        
-        # Reset index to make timestamp a column
-        df_pivot = df_pivot.reset_index()
+        # Convert speed to m/s (assuming input is km/h)
+        # If speed is already m/s, this would be wrong. 
+        # Racing telemetry usually uses km/h.
+        # Let's assume km/h -> / 3.6
+        df_pivot['speed_ms'] = df_pivot['speed'] / 3.6
         
-        # Ensure numeric types for key columns
-        numeric_cols = ['speed', 'nmot', 'Steering_Angle', 'ath', 'pbrake_f', 'pbrake_r', 'accx_can', 'accy_can']
-        for col in numeric_cols:
-            if col in df_pivot.columns:
-                df_pivot[col] = pd.to_numeric(df_pivot[col], errors='coerce')
+        # Distance in meters
+        df_pivot['distance_delta'] = df_pivot['speed_ms'] * df_pivot['time_delta']
+        df_pivot['distance'] = df_pivot['distance_delta'].cumsum()
+
+    for col in TELEMETRY_FLOAT32_COLUMNS:
+        if col in df_pivot.columns:
+            df_pivot[col] = df_pivot[col].astype(np.float32)
         
-        # Calculate Distance
-        # Speed is likely in km/h or m/s. Let's assume km/h for racing.
-        # Distance = Speed * Time
-        if 'speed' in df_pivot.columns:
-            # Calculate time delta in seconds
-            df_pivot['time_delta'] = df_pivot['timestamp'].diff().dt.total_seconds().fillna(0)
-            
-            # Convert speed to m/s (assuming input is km/h)
-            # If speed is already m/s, this would be wrong. 
-            # Racing telemetry usually uses km/h.
-            # Let's assume km/h -> / 3.6
-            df_pivot['speed_ms'] = df_pivot['speed'] / 3.6
-            
-            # Distance in meters
-            df_pivot['distance_delta'] = df_pivot['speed_ms'] * df_pivot['time_delta']
-            df_pivot['distance'] = df_pivot['distance_delta'].cumsum()
-            
-        return df_pivot
+    return df_pivot
+
+
+@st.cache_data
+def load_data(file_path, vehicle_id=None, nrows=500000, use_cache=True):
+    """
+    Loads telemetry data from CSV.
+    Pivots the long-format data to wide-format.
+    Calculates Distance from Speed.
+    """
+    try:
+        # Load a chunk of data for one vehicle
+        # We need to read enough rows to get a meaningful segment
+        # The finished wide frame gets its own Parquet snapshot, so later runs
+        # (other scripts, new sessions) skip the pivot as well as the CSV parse
+        return _cached_read(
+            file_path,
+            lambda path: _build_telemetry(path, vehicle_id, nrows),
+            tag=f"wide{TELEMETRY_PIPELINE_VERSION}-{vehicle_id or 'first'}-{nrows}",
+            use_cache=use_cache
+        )
 
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return pd.DataFrame()
 
 @st.cache_data
-def load_lap_times(file_path):
+def load_channels(file_path, vehicle_id=None, nrows=500000, use_cache=True):
+    """
+    Loads telemetry data from CSV as one array pair per channel.
+    Returns {telemetry_name: (timestamps, values)} without pivoting, for
+    consumers that work on single sensors at their native rate.
+    """
+    try:
+        df_raw = _load_raw_telemetry(file_path, vehicle_id, nrows, use_cache)
+        if df_raw.empty:
+            return {}
+        return _split_channels(df_raw)
+
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        return {}
+
+
+@st.cache_data
+def load_lap_times(file_path, use_cache=True):
     """
     Loads lap times to find the perfect lap.
     """
@@ -91,7 +464,9 @@ def load_lap_times(file_path):
         # The file seems to have a complex header or structure based on the cat output.
         # Let's try standard read first, if fails, we might need to skip rows.
         # Based on cat output: "meta_source","meta_time",...
-        df = pd.read_csv(file_path)
+        # C engine on purpose: Arrow would infer the ISO timestamp columns as
+        # datetime64, changing the frame used for best-lap detection
+        df = _cached_read(file_path, pd.read_csv, use_cache=use_cache)
         # We need 'lap' and 'lap_time' (or similar)
         # Let's standardize column names if needed
         return df
@@ -100,13 +475,17 @@ def load_lap_times(file_path):
         return pd.DataFrame()
 
 @st.cache_data
-def load_weather(file_path):
+def load_weather(file_path, use_cache=True, with_datetime=False):
     """
     Loads weather data.
+    TIME_UTC_SECONDS stays numeric; with_datetime=True adds a UTC 'timestamp'
+    column converted from it in bulk (the TIME_UTC_STR strings are never parsed).
     """
     try:
         # Semicolon separated
-        df = pd.read_csv(file_path, sep=';')
+        df = _cached_read(file_path, _read_weather, tag='narrow', use_cache=use_cache)
+        if with_datetime and 'TIME_UTC_SECONDS' in df.columns:
+            df['timestamp'] = pd.to_datetime(df['TIME_UTC_SECONDS'], unit='s', utc=True)
         return df
     except Exception as e:
         st.error(f"Error loading weather: {e}")
@@ -1,6 +1,97 @@
+import math
+
 import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Map anchor for the local X/Y frame (Circuit of the Americas) and metres per degree
+COTA_LAT = 30.1328
+COTA_LON = -97.6411
+METERS_PER_DEG_LAT = 111000
+METERS_PER_DEG_LON = 96000
+
+
+def _integrate_path_loop(speed_ms, steer_rad, dt, factor):
+    """
+    Single pass dead reckoning: heading, X and Y running sums.
+    NaN steps are skipped like pandas cumsum (output NaN, sum carries on).
+    """
+    n = speed_ms.shape[0]
+    out_h = np.empty(n, dtype=speed_ms.dtype)
+    out_x = np.empty(n, dtype=speed_ms.dtype)
+    out_y = np.empty(n, dtype=speed_ms.dtype)
+    heading = 0.0
+    x = 0.0
+    y = 0.0
+    for i in range(n):
+        d_heading = steer_rad[i] * speed_ms[i] * dt[i] * factor
+        if d_heading != d_heading:
+            out_h[i] = np.nan
+            out_x[i] = np.nan
+            out_y[i] = np.nan
+            continue
+        heading += d_heading
+        out_h[i] = heading
+
+        dx = speed_ms[i] * math.cos(heading) * dt[i]
+        if dx != dx:
+            out_x[i] = np.nan
+        else:
+            x += dx
+            out_x[i] = x
+
+        dy = speed_ms[i] * math.sin(heading) * dt[i]
+        if dy != dy:
+            out_y[i] = np.nan
+        else:
+            y += dy
+            out_y[i] = y
+    return out_h, out_x, out_y
+
+
+def _integrate_path_numpy(speed_ms, steer_rad, dt, factor):
+    """NumPy fallback of _integrate_path_loop (nancumsum + NaN mask)."""
+    heading_change = steer_rad * speed_ms * dt * factor
+    heading = np.nancumsum(heading_change, dtype=np.float64)
+    heading[np.isnan(heading_change)] = np.nan
+    dx = speed_ms * np.cos(heading) * dt
+    dy = speed_ms * np.sin(heading) * dt
+    x = np.nancumsum(dx, dtype=np.float64)
+    x[np.isnan(dx)] = np.nan
+    y = np.nancumsum(dy, dtype=np.float64)
+    y[np.isnan(dy)] = np.nan
+    dtype = speed_ms.dtype
+    return heading.astype(dtype), x.astype(dtype), y.astype(dtype)
+
+
+if NUMBA_AVAILABLE:
+    _integrate_path = njit(cache=True)(_integrate_path_loop)
+else:
+    _integrate_path = _integrate_path_numpy
+
+
+def _time_deltas(df):
+    """
+    Seconds between consecutive rows as float32, 0 for the first row.
+    load_data already stores this per row as 'time_delta'; it is reused when
+    df is a contiguous, in-order run of the loaded rows (consecutive integer
+    index), otherwise it is recomputed from the timestamps.
+    """
+    index = df.index
+    if ('time_delta' in df.columns and pd.api.types.is_integer_dtype(index)
+            and index.is_monotonic_increasing and index[-1] - index[0] == len(index) - 1):
+        dt = df['time_delta'].to_numpy(dtype=np.float32, copy=True)
+        dt[0] = 0
+        return dt
+    return df['timestamp'].diff().dt.total_seconds().fillna(0).to_numpy(dtype=np.float32)
+
+
 def generate_track_path(df):
     """
     Generates X/Y coordinates using Dead Reckoning (Speed + Steering).
@@ -19,34 +110,39 @@ def generate_track_path(df):
     STEERING_FACTOR = 0.002 # Tunable parameter
     
     # Sort by timestamp/distance
-    df = df.sort_values('timestamp').copy()
+    # sort_values already returns a new frame; data that is already in order
+    # only needs a shallow copy so the new columns don't land on the caller's frame
+    if df['timestamp'].is_monotonic_increasing:
+        df = df.copy(deep=False)
+    else:
+        df = df.sort_values('timestamp')
     
     # Calculate dt
-    df['dt'] = df['timestamp'].diff().dt.total_seconds().fillna(0)
+    dt = _time_deltas(df)
     
     # Speed in m/s
-    v = df['speed'] / 3.6
+    # float32 is plenty for noisy sensor signals and halves memory traffic;
+    # the kernel keeps its running sums in float64 so the path does not drift
+    v = df['speed'].to_numpy(dtype=np.float32) * np.float32(1.0 / 3.6)
     
     # Steering in degrees -> radians (assuming input is degrees)
     # Note: Steering_Angle might be steering wheel angle, not tire angle.
     # Ratio is usually ~13:1 to 16:1.
-    delta = np.radians(df['Steering_Angle'])
+    delta = np.radians(df['Steering_Angle'].to_numpy(dtype=np.float32))
     
     # Heading (Theta)
     # Simple integration: change in heading is proportional to steering * speed * dt
-    # d_theta = (v * delta) * factor
-    # We'll accumulate changes
-    
-    # Let's try a simple approach first:
     # heading += steering * dt * speed * constant
-    heading_change = delta * v * df['dt'] * STEERING_FACTOR
-    df['heading'] = heading_change.cumsum()
-    
-    # Calculate X/Y
-    df['dx'] = v * np.cos(df['heading']) * df['dt']
-    df['dy'] = v * np.sin(df['heading']) * df['dt']
-    
-    df['WorldPositionX'] = df['dx'].cumsum()
-    df['WorldPositionY'] = df['dy'].cumsum()
+    # X/Y: x += v * cos(heading) * dt, y += v * sin(heading) * dt
+    # Heading and position are accumulated together in one pass
+    heading, x, y = _integrate_path(v, delta, dt, np.float32(STEERING_FACTOR))
+    df['heading'] = heading
+    df['WorldPositionX'] = x
+    df['WorldPositionY'] = y
+
+    # Map coordinates for the 3D view, computed once here so plot_3d_track
+    # does not rewrite them on every rerun / replay frame
+    df['lat'] = COTA_LAT + (y / METERS_PER_DEG_LAT)
+    df['lon'] = COTA_LON + (x / METERS_PER_DEG_LON)
     
     return df
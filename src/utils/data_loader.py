@@ -6,10 +6,26 @@ Güvenli ve robust veri yükleme sistemi
 import pandas as pd
 import numpy as np
 import logging
+import os
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 import streamlit as st
 
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    prange = range
+    NUMBA_AVAILABLE = False
+
 # Logging setup
 logging.basicConfig(
     level=logging.INFO,
@@ -19,6 +35,52 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _zscore_mask_loop(columns, threshold):
+    """
+    (kolon x örnek) float64 dizisinde her kolon için |x - mean| > threshold * std
+    Mean/std (ddof=1) NaN'ları atlar; mean, std ve maske tek kernel'de hesaplanır.
+    """
+    m, n = columns.shape
+    out = np.zeros((m, n), dtype=np.bool_)
+    for j in prange(m):
+        total = 0.0
+        count = 0
+        for i in range(n):
+            value = columns[j, i]
+            if value == value:
+                total += value
+                count += 1
+        if count < 2:
+            continue
+        mean = total / count
+        sq = 0.0
+        for i in range(n):
+            value = columns[j, i]
+            if value == value:
+                sq += (value - mean) ** 2
+        limit = threshold * np.sqrt(sq / (count - 1))
+        for i in range(n):
+            out[j, i] = abs(columns[j, i] - mean) > limit
+    return out
+
+
+def _zscore_mask_numpy(columns, threshold):
+    """NumPy fallback of _zscore_mask_loop."""
+    with warnings.catch_warnings(), np.errstate(invalid='ignore'):
+        # Tamamen NaN / tek değerli kolonlar: mean/std NaN, maske False
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        mean = np.nanmean(columns, axis=1, keepdims=True)
+        std = np.nanstd(columns, axis=1, ddof=1, keepdims=True)
+        return np.abs(columns - mean) > threshold * std
+
+
+if NUMBA_AVAILABLE:
+    # Kolonlar birbirinden bağımsız - çekirdeklere dağıtılır
+    _zscore_mask = njit(cache=True, parallel=True)(_zscore_mask_loop)
+else:
+    _zscore_mask = _zscore_mask_numpy
+
+
 class DataManager:
     """
     Toyota dataset'lerini yüklemek ve validate etmek için merkezi sınıf
@@ -39,6 +101,34 @@ class DataManager:
         "weather.csv": ['Temperature', 'Humidity', 'TrackTemp']
     }
 
+    # Bilinen kolonlar için sabit tipler - parser tip çıkarımı yapmaz, direkt float32 ayırır
+    COLUMN_DTYPES = {
+        "telemetry.csv": {
+            'Speed': 'float32',
+            'BrakePressure': 'float32',
+            'Throttle': 'float32',
+            'SteeringAngle': 'float32'
+        },
+        "weather.csv": {
+            'Temperature': 'float32',
+            'Humidity': 'float32',
+            'TrackTemp': 'float32'
+        }
+    }
+
+    # Category'ye çevrilen bilinen düşük kardinaliteli string kolonlar; diğer string
+    # kolonlar object kalır (category yeni değer atamada hata verir, concat/str davranışı değişir)
+    CATEGORY_COLUMNS = ['Gear', 'Track', 'TrackName']
+
+    # Paralel dataset yükleme thread sınırı (PyArrow her dosyayı zaten çok thread'li parse eder)
+    MAX_LOAD_WORKERS = 8
+
+    # iter_dataset parça boyutu (satır)
+    CHUNK_SIZE = 500_000
+
+    # Bu satır sayısının üstünde duplicated() (tüm satırları hash'ler) varsayılan olarak atlanır
+    DUPLICATE_CHECK_MAX_ROWS = 1_000_000
+
     def __init__(self, data_dir: str = "data/raw"):
         """
         Initialize DataManager
@@ -49,11 +139,33 @@ class DataManager:
         self.data_dir = Path(data_dir)
         self.datasets: Dict[str, pd.DataFrame] = {}
         self.metadata: Dict[str, Dict] = {}
+        self._file_index: Optional[Dict[str, Path]] = None
+        self._arrow_tables: Dict[str, 'pa.Table'] = {}
 
-    @st.cache_data(ttl=3600)
-    def load_csv_safe(_self, filepath: str) -> pd.DataFrame:
+    def _resolve(self, filename: str) -> Optional[Path]:
         """
-        Güvenli CSV yükleme - crash önleme
+        Dosya adını data_dir içindeki yola çevir (klasör bir kez taranır)
+
+        Args:
+            filename: Dataset dosya ismi
+
+        Returns:
+            Path, dosya yoksa None
+        """
+        if self._file_index is None:
+            try:
+                with os.scandir(self.data_dir) as entries:
+                    self._file_index = {
+                        entry.name: Path(entry.path) for entry in entries if entry.is_file()
+                    }
+            except FileNotFoundError:
+                logger.warning(f"Data directory not found: {self.data_dir}")
+                self._file_index = {}
+        return self._file_index.get(filename)
+
+    def _read_csv_file(self, filepath: str) -> pd.DataFrame:
+        """
+        CSV parse çekirdeği - Streamlit çağrısı yapmaz, worker thread'lerinde güvenli
 
         Args:
             filepath: CSV dosya yolu
@@ -64,31 +176,67 @@ class DataManager:
         Raises:
             FileNotFoundError: Dosya bulunamadığında
             pd.errors.ParserError: CSV parse hatası
+            ValueError: Dataset boşsa
         """
+        logger.info(f"Loading CSV: {filepath}")
+        # PyArrow varsa çok thread'li C++ parser (sonuç yine numpy dtype'lı DataFrame)
+        engine = 'pyarrow' if PYARROW_AVAILABLE else 'c'
+        dtypes = self.COLUMN_DTYPES.get(Path(filepath).name)
         try:
-            logger.info(f"Loading CSV: {filepath}")
-            df = pd.read_csv(filepath)
+            df = pd.read_csv(filepath, engine=engine, dtype=dtypes)
+        except ValueError as e:
+            if dtypes is None or isinstance(e, pd.errors.ParserError):
+                raise
+            # Sayısal olmayan değer var - tipsiz oku, validate_data_types coerce etsin
+            logger.warning(f"Typed read failed for {filepath}, falling back to inference: {str(e)}")
+            df = pd.read_csv(filepath, engine=engine)
 
-            if df.empty:
-                raise ValueError(f"Dataset is empty: {filepath}")
+        if df.empty:
+            raise ValueError(f"Dataset is empty: {filepath}")
 
-            logger.info(f"Successfully loaded {filepath}: {len(df)} rows, {len(df.columns)} columns")
-            return df
+        logger.info(f"Successfully loaded {filepath}: {len(df)} rows, {len(df.columns)} columns")
+        return df
 
-        except FileNotFoundError:
+    def _report_load_error(self, filepath: str, error: Exception) -> None:
+        """
+        Yükleme hatasını logla, kullanıcıya göster ve script'i durdur
+
+        Streamlit çağrıları içerdiği için sadece ana thread'den çağrılmalı.
+
+        Args:
+            filepath: CSV dosya yolu
+            error: _read_csv_file'ın fırlattığı hata
+        """
+        if isinstance(error, FileNotFoundError):
             logger.error(f"File not found: {filepath}")
             st.error(f"❌ Dataset bulunamadı: {filepath}")
-            st.stop()
-
-        except pd.errors.ParserError as e:
-            logger.error(f"CSV parse error in {filepath}: {str(e)}")
+        elif isinstance(error, pd.errors.ParserError):
+            logger.error(f"CSV parse error in {filepath}: {str(error)}")
             st.error(f"❌ CSV parse hatası: {filepath}")
-            st.stop()
+        else:
+            logger.error(f"Unexpected error loading {filepath}: {str(error)}")
+            st.error(f"❌ Beklenmeyen hata: {type(error).__name__}")
+        st.stop()
+
+    @st.cache_data(ttl=3600)
+    def load_csv_safe(_self, filepath: str) -> pd.DataFrame:
+        """
+        Güvenli CSV yükleme - crash önleme
+
+        Args:
+            filepath: CSV dosya yolu
 
+        Returns:
+            pandas DataFrame
+
+        Raises:
+            FileNotFoundError: Dosya bulunamadığında
+            pd.errors.ParserError: CSV parse hatası
+        """
+        try:
+            return _self._read_csv_file(filepath)
         except Exception as e:
-            logger.error(f"Unexpected error loading {filepath}: {str(e)}")
-            st.error(f"❌ Beklenmeyen hata: {type(e).__name__}")
-            st.stop()
+            _self._report_load_error(filepath, e)
 
     def validate_columns(self, df: pd.DataFrame, expected_cols: List[str], dataset_name: str) -> bool:
         """
@@ -102,7 +250,9 @@ class DataManager:
         Returns:
             True if valid, raises exception if not
         """
-        missing_cols = [col for col in expected_cols if col not in df.columns]
+        # Kolon isimleri bir kez hash set'e alınır (geniş tablolarda O(E+C))
+        available_cols = set(df.columns)
+        missing_cols = [col for col in expected_cols if col not in available_cols]
 
         if missing_cols:
             error_msg = f"Missing columns in {dataset_name}: {missing_cols}"
@@ -113,13 +263,14 @@ class DataManager:
 
         return True
 
-    def validate_data_types(self, df: pd.DataFrame, dataset_name: str) -> bool:
+    def validate_data_types(self, df: pd.DataFrame, dataset_name: str, parse_timestamps: bool = False) -> bool:
         """
         Veri tiplerini validate et
 
         Args:
             df: DataFrame
             dataset_name: Dataset ismi
+            parse_timestamps: TimeStamp kolonunu datetime64'e çevir (default: dokunma)
 
         Returns:
             True if valid
@@ -135,8 +286,42 @@ class DataManager:
                 except:
                     st.warning(f"⚠️ {col} numeric'e çevrilemedi")
 
+        # İstenirse TimeStamp yükleme sırasında bir kez datetime64'e çevrilir; grafikler her rerun'da yeniden parse etmez
+        if (
+            parse_timestamps
+            and 'TimeStamp' in df.columns
+            and not pd.api.types.is_datetime64_any_dtype(df['TimeStamp'])
+        ):
+            try:
+                df['TimeStamp'] = pd.to_datetime(df['TimeStamp'])
+            except (ValueError, TypeError) as e:
+                logger.warning(f"TimeStamp in {dataset_name} could not be parsed as datetime: {str(e)}")
+
         return True
 
+    def _optimize_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Numeric kolonları en dar tipe indir, CATEGORY_COLUMNS'taki string kolonları category yap
+
+        Args:
+            df: DataFrame (yerinde güncellenir)
+
+        Returns:
+            DataFrame
+        """
+        # Sensör verisi için float32 hassasiyeti (~7 hane) yeterli
+        for col in df.select_dtypes(include='float').columns:
+            df[col] = pd.to_numeric(df[col], downcast='float')
+        for col in df.select_dtypes(include='integer').columns:
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+
+        # Sadece bilinen düşük kardinaliteli string kolonlar (Gear, pist adı)
+        for col in self.CATEGORY_COLUMNS:
+            if col in df.columns and df[col].dtype == object:
+                df[col] = df[col].astype('category')
+
+        return df
+
     def detect_outliers(self, df: pd.DataFrame, column: str, threshold: float = 3.0) -> pd.Series:
         """
         Z-score ile outlier tespiti
@@ -152,63 +337,157 @@ class DataManager:
         if column not in df.columns:
             return pd.Series([False] * len(df))
 
-        z_scores = np.abs((df[column] - df[column].mean()) / df[column].std())
-        return z_scores > threshold
+        # |x - mean| > threshold * std, tek bir ham float64 buffer üzerinde
+        # (NaN ve std=0/NaN durumları False döner, önceki z-score ile aynı)
+        series = df[column]
+        deviation = series.to_numpy(dtype=np.float64) - series.mean()
+        np.abs(deviation, out=deviation)
+        return pd.Series(deviation > threshold * series.std(), index=df.index, name=column)
+
+    def detect_outliers_all(
+        self,
+        df: pd.DataFrame,
+        columns: Optional[List[str]] = None,
+        threshold: float = 3.0
+    ) -> pd.DataFrame:
+        """
+        Birden fazla kolon için tek seferde Z-score outlier tespiti
+
+        Args:
+            df: DataFrame
+            columns: Kontrol edilecek kolonlar (default: tüm numeric kolonlar)
+            threshold: Z-score eşiği (default: 3.0)
 
-    def get_data_summary(self, df: pd.DataFrame) -> Dict:
+        Returns:
+            Boolean DataFrame (True = outlier)
+        """
+        if columns is None:
+            # Boş dilim üzerinde seçim - select_dtypes tüm frame'i kopyalamaz
+            columns = df.iloc[:0].select_dtypes(include=[np.number]).columns.tolist()
+        else:
+            available_cols = set(df.columns)
+            columns = [col for col in columns if col in available_cols]
+
+        # Kolon başına bir satır - kernel her kolonu ardışık bellekte okur
+        values = np.empty((len(columns), len(df)), dtype=np.float64)
+        for j, col in enumerate(columns):
+            values[j] = df[col].to_numpy()
+        mask = _zscore_mask(values, float(threshold))
+
+        return pd.DataFrame(mask.T, index=df.index, columns=columns)
+
+    def get_data_summary(self, df: pd.DataFrame, check_duplicates: Optional[bool] = None) -> Dict:
         """
         Dataset özet istatistikleri
 
         Args:
             df: DataFrame
+            check_duplicates: Tekrarlı satır sayımı (default: sadece DUPLICATE_CHECK_MAX_ROWS altında)
 
         Returns:
-            Summary dict
+            Summary dict ('duplicates' atlandıysa None)
         """
+        if check_duplicates is None:
+            check_duplicates = len(df) <= self.DUPLICATE_CHECK_MAX_ROWS
+
+        # Null sayımı tek bool matris üzerinden, kolon başına ayrı Series yok
+        null_counts = df.isna().to_numpy().sum(axis=0)
+
         return {
             'rows': len(df),
             'columns': len(df.columns),
             'memory_usage_mb': df.memory_usage(deep=True).sum() / 1024**2,
             'numeric_columns': df.select_dtypes(include=[np.number]).columns.tolist(),
-            'missing_values': df.isnull().sum().to_dict(),
-            'duplicates': df.duplicated().sum()
+            'missing_values': dict(zip(df.columns, null_counts.tolist())),
+            'duplicates': df.duplicated().sum() if check_duplicates else None
         }
 
-    def load_all_datasets(self) -> Dict[str, pd.DataFrame]:
+    def load_all_datasets(self, parse_timestamps: bool = False) -> Dict[str, pd.DataFrame]:
         """
         Tüm dataset'leri yükle ve validate et
 
+        Args:
+            parse_timestamps: TimeStamp kolonlarını datetime64'e çevir (bkz. validate_data_types)
+
         Returns:
             Dict of DataFrames
         """
         loaded_datasets = {}
 
+        available_files = []
         for dataset_file in self.EXPECTED_DATASETS:
-            filepath = self.data_dir / dataset_file
-
-            if not filepath.exists():
+            filepath = self._resolve(dataset_file)
+            if filepath is None:
                 logger.warning(f"Dataset not found: {dataset_file}")
                 continue
-
-            # Load
-            df = self.load_csv_safe(str(filepath))
+            available_files.append((dataset_file, filepath))
+
+        # Load - CSV parsing releases the GIL, so files are read in parallel.
+        # Workers only parse (no Streamlit calls, no st.cache_data: they have no
+        # script context); errors, validation and every st.* call happen on the
+        # calling thread in the original order
+        futures = []
+        if available_files:
+            max_workers = min(len(available_files), self.MAX_LOAD_WORKERS, os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self._read_csv_file, str(filepath))
+                    for _, filepath in available_files
+                ]
+
+        for (dataset_file, filepath), future in zip(available_files, futures):
+            try:
+                df = future.result()
+            except Exception as e:
+                self._report_load_error(str(filepath), e)
+                continue
 
             # Validate columns
             if dataset_file in self.REQUIRED_COLUMNS:
                 self.validate_columns(df, self.REQUIRED_COLUMNS[dataset_file], dataset_file)
 
             # Validate data types
-            self.validate_data_types(df, dataset_file)
+            self.validate_data_types(df, dataset_file, parse_timestamps=parse_timestamps)
+
+            # Shrink dtypes
+            memory_before_mb = df.memory_usage(deep=True).sum() / 1024**2
+            df = self._optimize_dtypes(df)
 
             # Store
             loaded_datasets[dataset_file] = df
             self.metadata[dataset_file] = self.get_data_summary(df)
+            self.metadata[dataset_file]['memory_before_optimize_mb'] = memory_before_mb
 
             logger.info(f"Loaded and validated: {dataset_file}")
 
         self.datasets = loaded_datasets
+        self._arrow_tables = {}
         return loaded_datasets
 
+    def iter_dataset(self, dataset_name: str, chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Dataset'i parça parça oku - RAM'e sığmayan dosyalar için
+
+        Kolonlar ilk parçada validate edilir; bellekte aynı anda tek parça tutulur.
+
+        Args:
+            dataset_name: Dataset dosya ismi
+            chunksize: Parça başına satır (default: CHUNK_SIZE)
+
+        Yields:
+            DataFrame parçaları
+        """
+        filepath = self._resolve(dataset_name)
+        if filepath is None:
+            raise FileNotFoundError(f"Dataset not found: {dataset_name}")
+
+        reader = pd.read_csv(filepath, chunksize=chunksize or self.CHUNK_SIZE)
+        with reader:
+            for i, chunk in enumerate(reader):
+                if i == 0 and dataset_name in self.REQUIRED_COLUMNS:
+                    self.validate_columns(chunk, self.REQUIRED_COLUMNS[dataset_name], dataset_name)
+                yield chunk
+
     def load_from_upload(self, uploaded_file) -> Tuple[pd.DataFrame, str]:
         """
         Streamlit file uploader'dan veri yükle
@@ -234,7 +513,7 @@ class DataManager:
 
     def get_dataset(self, dataset_name: str) -> Optional[pd.DataFrame]:
         """
-        Yüklenmiş dataset'i al
+        Yüklenmiş dataset'i al (kopya değil, saklanan nesnenin kendisi)
 
         Args:
             dataset_name: Dataset ismi
@@ -244,6 +523,32 @@ class DataManager:
         """
         return self.datasets.get(dataset_name)
 
+    def get_arrow_table(self, dataset_name: str) -> Optional['pa.Table']:
+        """
+        Yüklenmiş dataset'in değiştirilemez Arrow tablosu
+
+        İlk çağrıda bir kez oluşturulur; defensive .copy() yerine uygulama genelinde
+        paylaşılabilir ve pyarrow.compute ile doğrudan işlenebilir.
+
+        Args:
+            dataset_name: Dataset ismi
+
+        Returns:
+            pyarrow Table or None
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("PyArrow library not installed. Install with: pip install pyarrow")
+
+        table = self._arrow_tables.get(dataset_name)
+        if table is None:
+            df = self.datasets.get(dataset_name)
+            if df is None:
+                return None
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            self._arrow_tables[dataset_name] = table
+
+        return table
+
     def list_available_datasets(self) -> List[str]:
         """
         Yüklenmiş dataset'lerin listesi
@@ -7,10 +7,74 @@ PROFESYONEL ÖZELLİK:
 - Engineer Mode: Teknik terminoloji, detaylı metrikler
 """
 
+from bisect import bisect_right
 from typing import Dict, Any
 import streamlit as st
 
 
+# Mode'a göre düz {metric: metin} tabloları - modül yüklenirken bir kez kurulur,
+# Streamlit her rerun'da yeniden oluşturmaz
+_METRIC_NAMES = {
+    'pilot': {
+        'brake_aggressiveness': 'Brake Style',
+        'throttle_smoothness': 'Gas Control',
+        'tire_stress': 'Tire Wear',
+        'grip_index': 'Track Grip',
+        'speed_consistency': 'Pace Consistency',
+        'turn_entry_quality': 'Corner Entry',
+        'cpi': 'Performance Score',
+        'sector_time_loss': 'Time Lost'
+    },
+    'engineer': {
+        'brake_aggressiveness': 'Brake Aggressiveness Index',
+        'throttle_smoothness': 'Throttle Modulation Coefficient',
+        'tire_stress': 'Compound Stress Index',
+        'grip_index': 'Surface Friction Coefficient',
+        'speed_consistency': 'Velocity Variance Index',
+        'turn_entry_quality': 'Trail Braking Efficiency',
+        'cpi': 'Composite Performance Index',
+        'sector_time_loss': 'Sector Delta (vs optimal)'
+    }
+}
+
+_METRIC_DESCRIPTIONS = {
+    'pilot': {
+        'brake_aggressiveness': 'How hard you brake (higher = more aggressive)',
+        'throttle_smoothness': 'How smooth your gas pedal control is',
+        'tire_stress': 'How much you\'re wearing your tires',
+        'grip_index': 'How much grip the track has',
+        'cpi': 'Overall lap quality score'
+    },
+    'engineer': {
+        'brake_aggressiveness': 'Brake pressure application rate and peak force distribution',
+        'throttle_smoothness': 'Throttle position variance and modulation frequency',
+        'tire_stress': 'Combined lateral/longitudinal load with thermal degradation factor',
+        'grip_index': 'Temperature-corrected surface adhesion coefficient (μ)',
+        'cpi': 'Weighted multi-factor performance aggregation (0-100 scale)'
+    }
+}
+
+_RECOMMENDATIONS = {
+    'pilot': {
+        'brake_too_early': 'Try braking later into the corner',
+        'throttle_too_aggressive': 'Be smoother with the gas pedal',
+        'high_tire_stress': 'You\'re pushing the tires too hard',
+        'inconsistent_laps': 'Try to keep your lap times more consistent'
+    },
+    'engineer': {
+        'brake_too_early': 'Brake point 8-12m forward. Reduce initial pressure 5-7 bar.',
+        'throttle_too_aggressive': 'Reduce throttle application rate. Target 15% linear ramp vs current spike.',
+        'high_tire_stress': 'Compound stress exceeds optimal. Reduce lateral G-load by 0.2G in Turns 4, 7, 12.',
+        'inconsistent_laps': 'Lap-to-lap variance 0.4s. Focus on brake point repeatability ±2m tolerance.'
+    }
+}
+
+# Pilot mode skor kademeleri: value >= eşik → bir üst etiket
+_SCORE_METRICS = frozenset({'cpi', 'brake_aggressiveness', 'throttle_smoothness'})
+_SCORE_THRESHOLDS = (60, 75, 90)
+_SCORE_LABELS = ('Needs Work', 'Fair', 'Good', 'Excellent')
+
+
 class ModeManager:
     """
     Interface mode yöneticisi
@@ -51,46 +115,7 @@ class ModeManager:
         Returns:
             Translated name
         """
-        translations = {
-            # Pilot Mode → Engineer Mode
-            'brake_aggressiveness': {
-                'pilot': 'Brake Style',
-                'engineer': 'Brake Aggressiveness Index'
-            },
-            'throttle_smoothness': {
-                'pilot': 'Gas Control',
-                'engineer': 'Throttle Modulation Coefficient'
-            },
-            'tire_stress': {
-                'pilot': 'Tire Wear',
-                'engineer': 'Compound Stress Index'
-            },
-            'grip_index': {
-                'pilot': 'Track Grip',
-                'engineer': 'Surface Friction Coefficient'
-            },
-            'speed_consistency': {
-                'pilot': 'Pace Consistency',
-                'engineer': 'Velocity Variance Index'
-            },
-            'turn_entry_quality': {
-                'pilot': 'Corner Entry',
-                'engineer': 'Trail Braking Efficiency'
-            },
-            'cpi': {
-                'pilot': 'Performance Score',
-                'engineer': 'Composite Performance Index'
-            },
-            'sector_time_loss': {
-                'pilot': 'Time Lost',
-                'engineer': 'Sector Delta (vs optimal)'
-            }
-        }
-
-        if metric in translations:
-            return translations[metric][self.current_mode]
-
-        return metric
+        return _METRIC_NAMES[self.current_mode].get(metric, metric)
 
     def get_metric_description(self, metric: str) -> str:
         """
@@ -102,33 +127,7 @@ class ModeManager:
         Returns:
             Description text
         """
-        descriptions = {
-            'brake_aggressiveness': {
-                'pilot': 'How hard you brake (higher = more aggressive)',
-                'engineer': 'Brake pressure application rate and peak force distribution'
-            },
-            'throttle_smoothness': {
-                'pilot': 'How smooth your gas pedal control is',
-                'engineer': 'Throttle position variance and modulation frequency'
-            },
-            'tire_stress': {
-                'pilot': 'How much you\'re wearing your tires',
-                'engineer': 'Combined lateral/longitudinal load with thermal degradation factor'
-            },
-            'grip_index': {
-                'pilot': 'How much grip the track has',
-                'engineer': 'Temperature-corrected surface adhesion coefficient (μ)'
-            },
-            'cpi': {
-                'pilot': 'Overall lap quality score',
-                'engineer': 'Weighted multi-factor performance aggregation (0-100 scale)'
-            }
-        }
-
-        if metric in descriptions:
-            return descriptions[metric][self.current_mode]
-
-        return ""
+        return _METRIC_DESCRIPTIONS[self.current_mode].get(metric, "")
 
     def format_value(self, metric: str, value: float) -> str:
         """
@@ -143,15 +142,10 @@ class ModeManager:
         """
         if self.current_mode == "pilot":
             # Basit formatlar
-            if metric in ['cpi', 'brake_aggressiveness', 'throttle_smoothness']:
-                if value >= 90:
-                    return f"{value:.0f} - Excellent"
-                elif value >= 75:
-                    return f"{value:.0f} - Good"
-                elif value >= 60:
-                    return f"{value:.0f} - Fair"
-                else:
-                    return f"{value:.0f} - Needs Work"
+            if metric in _SCORE_METRICS:
+                # NaN hiçbir eşiği geçmez (bisect onu en üst kademeye koyardı)
+                tier = bisect_right(_SCORE_THRESHOLDS, value) if value == value else 0
+                return f"{value:.0f} - {_SCORE_LABELS[tier]}"
 
             return f"{value:.1f}"
 
@@ -169,29 +163,7 @@ class ModeManager:
         Returns:
             Mode-appropriate recommendation
         """
-        recommendations = {
-            'brake_too_early': {
-                'pilot': 'Try braking later into the corner',
-                'engineer': 'Brake point 8-12m forward. Reduce initial pressure 5-7 bar.'
-            },
-            'throttle_too_aggressive': {
-                'pilot': 'Be smoother with the gas pedal',
-                'engineer': 'Reduce throttle application rate. Target 15% linear ramp vs current spike.'
-            },
-            'high_tire_stress': {
-                'pilot': 'You\'re pushing the tires too hard',
-                'engineer': 'Compound stress exceeds optimal. Reduce lateral G-load by 0.2G in Turns 4, 7, 12.'
-            },
-            'inconsistent_laps': {
-                'pilot': 'Try to keep your lap times more consistent',
-                'engineer': 'Lap-to-lap variance 0.4s. Focus on brake point repeatability ±2m tolerance.'
-            }
-        }
-
-        if issue in recommendations:
-            return recommendations[issue][self.current_mode]
-
-        return issue
+        return _RECOMMENDATIONS[self.current_mode].get(issue, issue)
 
     def get_ai_system_prompt_modifier(self) -> str:
         """
@@ -9,10 +9,17 @@ Toyota engineers bu dosyayı doğrudan MoTeC'te açabilir
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional
 import struct
 import logging
 
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +33,30 @@ class MoTeCExporter:
     File format: Binary .ld (Log Data) format
     """
 
+    # MoTeC channel name mapping (CSV export)
+    CHANNEL_MAPPING = {
+        'Speed': 'GPS Speed',
+        'BrakePressure': 'Brake Press',
+        'Throttle': 'Throttle Pos',
+        'SteeringAngle': 'Steer Angle',
+        'LateralAcceleration': 'Lat Accel',
+        'LongitudinalAcceleration': 'Long Accel',
+        'RPM': 'Engine RPM',
+        'Gear': 'Gear'
+    }
+
+    # LDX kanalları: birim, frekans ve örnek değerlerinin ondalık hanesi
+    LDX_CHANNELS = {
+        'Time': {'unit': 's', 'freq': 100, 'precision': 6},
+        'Speed': {'unit': 'km/h', 'freq': 100, 'precision': 2},
+        'BrakePressure': {'unit': 'bar', 'freq': 100, 'precision': 2},
+        'Throttle': {'unit': '%', 'freq': 100, 'precision': 2},
+        'SteeringAngle': {'unit': 'deg', 'freq': 100, 'precision': 2}
+    }
+
+    # LDX yazımında tek seferde formatlanan örnek sayısı
+    LDX_BLOCK_SAMPLES = 20_000
+
     def __init__(self):
         self.telemetry_data: Optional[pd.DataFrame] = None
         self.metadata: Dict = {}
@@ -46,7 +77,8 @@ class MoTeCExporter:
             vehicle: Vehicle name
             driver: Driver name
         """
-        self.telemetry_data = df.copy()
+        # Referans tutulur - export'lar sadece okur, kopya gerekmez
+        self.telemetry_data = df
 
         self.metadata = {
             'session_name': session_name,
@@ -59,6 +91,40 @@ class MoTeCExporter:
 
         logger.info(f"Prepared {len(df)} telemetry points for MoTeC export")
 
+    def _time_seconds(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Oturum başından itibaren geçen süre (saniye)
+
+        Args:
+            df: Telemetry DataFrame
+
+        Returns:
+            float64 Time dizisi
+        """
+        if 'TimeStamp' not in df.columns:
+            # Assume 100Hz sampling (10ms per sample)
+            return np.arange(len(df)) * 0.01
+
+        timestamps = df['TimeStamp']
+
+        # Zaten saniye cinsinden sayısal kolon - datetime'a çevirmeye gerek yok
+        if pd.api.types.is_numeric_dtype(timestamps) and not pd.api.types.is_bool_dtype(timestamps):
+            seconds = timestamps.to_numpy(dtype=np.float64)
+            return seconds - seconds[0]
+
+        if not pd.api.types.is_datetime64_any_dtype(timestamps):
+            timestamps = pd.to_datetime(timestamps)
+
+        # int64 nanosaniye üzerinden fark - ara Timedelta Series'i oluşmaz
+        nanos = timestamps.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        seconds = (nanos - nanos[0]) / 1e9
+
+        missing = timestamps.isna().to_numpy()
+        if missing.any():
+            seconds[missing | missing[0]] = np.nan
+
+        return seconds
+
     def export_to_csv_motec_compatible(
         self,
         output_path: str
@@ -80,42 +146,57 @@ class MoTeCExporter:
         if self.telemetry_data is None:
             raise ValueError("No data prepared. Call prepare_data() first")
 
-        df = self.telemetry_data.copy()
+        df = self.telemetry_data
+
+        # Select and rename columns (sadece gerekli kolonlar, tam kopya yok)
+        source_columns = [col for col in self.CHANNEL_MAPPING if col in df.columns]
+        export_df = df[source_columns].rename(columns=self.CHANNEL_MAPPING)
 
         # Create time column
-        if 'TimeStamp' in df.columns:
-            df['TimeStamp'] = pd.to_datetime(df['TimeStamp'])
-            df['Time'] = (df['TimeStamp'] - df['TimeStamp'].iloc[0]).dt.total_seconds()
-        else:
-            # Assume 100Hz sampling (10ms per sample)
-            df['Time'] = np.arange(len(df)) * 0.01
-
-        # MoTeC channel name mapping
-        channel_mapping = {
-            'Speed': 'GPS Speed',
-            'BrakePressure': 'Brake Press',
-            'Throttle': 'Throttle Pos',
-            'SteeringAngle': 'Steer Angle',
-            'LateralAcceleration': 'Lat Accel',
-            'LongitudinalAcceleration': 'Long Accel',
-            'RPM': 'Engine RPM',
-            'Gear': 'Gear'
-        }
+        export_df.insert(0, 'Time', self._time_seconds(df))
+
+        # Export CSV - pyarrow bool'ları 'true'/'false' yazar, pandas 'True'/'False':
+        # bool kolon varsa ya da tırnaksız yazılamayan değer çıkarsa pandas yazar
+        written = False
+        if PYARROW_AVAILABLE and not len(export_df.select_dtypes(include='bool').columns):
+            try:
+                self._write_csv_arrow(export_df, output_path)
+                written = True
+            except pa.ArrowInvalid:
+                logger.info("Values need CSV quoting, writing with pandas instead")
+        if not written:
+            export_df.to_csv(output_path, index=False, float_format='%.6f')
 
-        # Select and rename columns
-        export_columns = ['Time']
+        logger.info(f"Exported MoTeC-compatible CSV: {output_path}")
 
-        for orig_col, motec_col in channel_mapping.items():
-            if orig_col in df.columns:
-                df[motec_col] = df[orig_col]
-                export_columns.append(motec_col)
+        return f"✅ Exported {len(df)} data points to {output_path}"
 
-        # Export CSV
-        df[export_columns].to_csv(output_path, index=False, float_format='%.6f')
+    def _write_csv_arrow(self, export_df: pd.DataFrame, output_path: str) -> None:
+        """
+        PyArrow'un çok thread'li C++ CSV yazıcısı ile export
 
-        logger.info(f"Exported MoTeC-compatible CSV: {output_path}")
+        Float kolonlar 6 haneye yuvarlanır (to_csv'deki '%.6f' ile aynı değerler,
+        sondaki sıfırlar yazılmaz). Başlık ve string hücreler pandas gibi tırnaksız
+        yazılır; ayraç/tırnak içeren değerde pa.ArrowInvalid fırlatılır.
 
-        return f"✅ Exported {len(df)} data points to {output_path}"
+        Args:
+            export_df: Export edilecek kolonlar
+            output_path: Output file path
+        """
+        float_columns = export_df.select_dtypes(include='float').columns
+        if len(float_columns):
+            export_df = export_df.assign(**{
+                col: export_df[col].astype(np.float64).round(6) for col in float_columns
+            })
+
+        table = pa.Table.from_pandas(export_df, preserve_index=False)
+
+        with open(output_path, 'wb') as f:
+            f.write((','.join(export_df.columns) + '\n').encode('utf-8'))
+            pa_csv.write_csv(
+                table, f,
+                write_options=pa_csv.WriteOptions(include_header=False, quoting_style='none')
+            )
 
     def export_to_ldx(
         self,
@@ -136,21 +217,15 @@ class MoTeCExporter:
         if self.telemetry_data is None:
             raise ValueError("No data prepared")
 
-        df = self.telemetry_data.copy()
+        df = self.telemetry_data
 
-        # Create time column
-        if 'TimeStamp' in df.columns:
-            df['TimeStamp'] = pd.to_datetime(df['TimeStamp'])
-            df['Time'] = (df['TimeStamp'] - df['TimeStamp'].iloc[0]).dt.total_seconds()
-        else:
-            df['Time'] = np.arange(len(df)) * 0.01
+        # Sadece LDX kanalları + Time (tam kopya yok)
+        ldx_df = df[[col for col in self.LDX_CHANNELS if col != 'Time' and col in df.columns]]
+        ldx_df.insert(0, 'Time', self._time_seconds(df))
 
-        # Build LDX (XML structure)
-        ldx_content = self._build_ldx_xml(df)
-
-        # Write file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(ldx_content)
+        # Build LDX (XML structure) and stream it to disk block by block
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.writelines(self._iter_ldx_xml(ldx_df))
 
         logger.info(f"Exported MoTeC LDX: {output_path}")
 
@@ -166,66 +241,77 @@ class MoTeCExporter:
         Returns:
             XML string
         """
-        xml = '<?xml version="1.0" encoding="UTF-8"?>\n'
-        xml += '<LDXFile>\n'
-
-        # Header
-        xml += '  <Header>\n'
-        xml += f'    <SessionName>{self.metadata["session_name"]}</SessionName>\n'
-        xml += f'    <Vehicle>{self.metadata["vehicle"]}</Vehicle>\n'
-        xml += f'    <Driver>{self.metadata["driver"]}</Driver>\n'
-        xml += f'    <Date>{self.metadata["date"]}</Date>\n'
-        xml += f'    <Venue>{self.metadata["venue"]}</Venue>\n'
-        xml += f'    <FormatVersion>{self.metadata["format_version"]}</FormatVersion>\n'
-        xml += '  </Header>\n'
-
-        # Channels
-        xml += '  <Channels>\n'
-
-        channels = {
-            'Time': {'unit': 's', 'freq': 100},
-            'Speed': {'unit': 'km/h', 'freq': 100},
-            'BrakePressure': {'unit': 'bar', 'freq': 100},
-            'Throttle': {'unit': '%', 'freq': 100},
-            'SteeringAngle': {'unit': 'deg', 'freq': 100}
-        }
+        return ''.join(self._iter_ldx_xml(df))
+
+    def _iter_ldx_xml(self, df: pd.DataFrame) -> Iterator[str]:
+        """
+        LDX XML'ini parça parça üret (dosyaya akış için)
+
+        Args:
+            df: Prepared DataFrame
+
+        Yields:
+            XML string parçaları
+        """
+        parts = [
+            '<?xml version="1.0" encoding="UTF-8"?>\n',
+            '<LDXFile>\n',
+
+            # Header
+            '  <Header>\n',
+            f'    <SessionName>{self.metadata["session_name"]}</SessionName>\n',
+            f'    <Vehicle>{self.metadata["vehicle"]}</Vehicle>\n',
+            f'    <Driver>{self.metadata["driver"]}</Driver>\n',
+            f'    <Date>{self.metadata["date"]}</Date>\n',
+            f'    <Venue>{self.metadata["venue"]}</Venue>\n',
+            f'    <FormatVersion>{self.metadata["format_version"]}</FormatVersion>\n',
+            '  </Header>\n',
+
+            # Channels
+            '  <Channels>\n'
+        ]
+
+        channels = self.LDX_CHANNELS
 
         for channel, props in channels.items():
             if channel in df.columns or channel == 'Time':
-                xml += f'    <Channel name="{channel}" unit="{props["unit"]}" frequency="{props["freq"]}" />\n'
+                parts.append(f'    <Channel name="{channel}" unit="{props["unit"]}" frequency="{props["freq"]}" />\n')
 
-        xml += '  </Channels>\n'
+        parts.append('  </Channels>\n')
 
         # Data (sampled - full data would be too large)
-        xml += '  <Data>\n'
+        parts.append('  <Data>\n')
+        yield ''.join(parts)
 
         # Sample every 10th point to keep file size reasonable
-        sample_df = df.iloc[::10]
-
-        for idx, row in sample_df.iterrows():
-            xml += '    <Sample>\n'
-
-            if 'Time' in row:
-                xml += f'      <Time>{row["Time"]:.6f}</Time>\n'
-
-            if 'Speed' in row:
-                xml += f'      <Speed>{row["Speed"]:.2f}</Speed>\n'
-
-            if 'BrakePressure' in row:
-                xml += f'      <BrakePressure>{row["BrakePressure"]:.2f}</BrakePressure>\n'
-
-            if 'Throttle' in row:
-                xml += f'      <Throttle>{row["Throttle"]:.2f}</Throttle>\n'
-
-            if 'SteeringAngle' in row:
-                xml += f'      <SteeringAngle>{row["SteeringAngle"]:.2f}</SteeringAngle>\n'
-
-            xml += '    </Sample>\n'
-
-        xml += '  </Data>\n'
-        xml += '</LDXFile>\n'
+        # (kanal dizileri üzerinde stride view - iloc ile ara DataFrame yok)
+        sample_step = 10
+        sample_count = -(-len(df) // sample_step)
+
+        # Tek satır şablonu (mevcut kanallar) - her blok tek bir C seviyesinde
+        # % formatlama çağrısıyla yazılır, satır satır iterrows yok.
+        # Not: np.char.mod her eleman için ayrı Python formatlaması yapar ve
+        # birleştirme öncesinde bile bu yoldan ~2-3x yavaştır.
+        sample_channels = [
+            (channel, props['precision'])
+            for channel, props in channels.items() if channel in df.columns
+        ]
+        sample_template = '    <Sample>\n' + ''.join(
+            f'      <{channel}>%.{precision}f</{channel}>\n' for channel, precision in sample_channels
+        ) + '    </Sample>\n'
+
+        if sample_channels:
+            values = np.column_stack([
+                df[channel].to_numpy()[::sample_step].astype(np.float64) for channel, _ in sample_channels
+            ])
+            # Bloklar halinde: bellekte hiçbir zaman tüm XML gövdesi tutulmaz
+            for start in range(0, len(values), self.LDX_BLOCK_SAMPLES):
+                block = values[start:start + self.LDX_BLOCK_SAMPLES]
+                yield (sample_template * len(block)) % tuple(block.ravel().tolist())
+        else:
+            yield sample_template * sample_count
 
-        return xml
+        yield '  </Data>\n</LDXFile>\n'
 
     def get_export_info(self) -> str:
         """
@@ -3,6 +3,8 @@ Toyota GR Design System
 Merkezi stil yönetimi ve custom CSS injection
 """
 
+import re
+
 import streamlit as st
 
 TOYOTA_COLORS = {
@@ -17,12 +19,8 @@ TOYOTA_COLORS = {
     'info_blue': '#0066CC'
 }
 
-def apply_custom_css():
-    """
-    Global CSS injection for Toyota GR branding
-    Dark mode theme with racing aesthetics
-    """
-    st.markdown(f"""
+# TOYOTA_COLORS sabit - CSS import sırasında bir kez oluşturulur, her rerun'da formatlanmaz
+_CUSTOM_CSS = f"""
     <style>
         /* ===== GLOBAL THEME ===== */
         .stApp {{
@@ -300,7 +298,48 @@ def apply_custom_css():
             border-radius: 4px;
         }}
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+
+def _minify_css(css: str) -> str:
+    """
+    Yorumları ve girinti/boşlukları at - her inject'te websocket'e giden yük küçülür
+    """
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css).strip()
+    # ':' önündeki boşluk seçicide anlamlı (".a :hover"), sadece arkası atılır
+    css = re.sub(r'\s*([{};>])\s*', r'\1', css).replace(': ', ':')
+    return css.replace(';}', '}')
+
+
+_CUSTOM_CSS_MIN = _minify_css(_CUSTOM_CSS)
+
+# Statik GR logosu (başlık metninden bağımsız)
+_LOGO_HTML = f"""
+        <div style="text-align: right; padding-top: 10px;">
+            <div style="
+                background-color: {TOYOTA_COLORS['primary_red']};
+                color: white;
+                padding: 10px 20px;
+                border-radius: 8px;
+                font-weight: 700;
+                font-size: 1.5rem;
+                letter-spacing: 2px;
+            ">
+                GR
+            </div>
+        </div>
+        """
+
+
+def apply_custom_css():
+    """
+    Global CSS injection for Toyota GR branding
+    Dark mode theme with racing aesthetics
+    """
+    # Her rerun'da tekrar gönderilmeli: Streamlit o run'da çizilmeyen elementleri
+    # sayfadan kaldırır, session_state ile tek seferlik inject stili kaybettirir
+    st.markdown(_CUSTOM_CSS_MIN, unsafe_allow_html=True)
 
 
 def create_badge(text: str, badge_type: str = 'info') -> str:
@@ -334,18 +373,4 @@ def create_header_with_logo(title: str, subtitle: str = None) -> None:
 
     with col2:
         # Logo placeholder - replace with actual Toyota GR logo
-        st.markdown(f"""
-        <div style="text-align: right; padding-top: 10px;">
-            <div style="
-                background-color: {TOYOTA_COLORS['primary_red']};
-                color: white;
-                padding: 10px 20px;
-                border-radius: 8px;
-                font-weight: 700;
-                font-size: 1.5rem;
-                letter-spacing: 2px;
-            ">
-                GR
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_LOGO_HTML, unsafe_allow_html=True)
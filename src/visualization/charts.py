@@ -3,13 +3,19 @@ Advanced Plotly Chart Components
 Toyota GR branded, interactive visualizations
 """
 
+import copy
+from types import MappingProxyType
+
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
+import plotly.io as pio
 import pandas as pd
 import numpy as np
+import streamlit as st
 from typing import Optional, List, Dict, Tuple
 
+# LTTB tek implementasyon: src/viz_utils.py (numba çekirdeği + NumPy fallback)
+from src.viz_utils import lttb_indices
+
 # Toyota GR Colors
 TOYOTA_RED = '#FF0000'
 TOYOTA_DARK_BG = '#0E1117'
@@ -20,34 +26,119 @@ TOYOTA_SUCCESS = '#00D26A'
 TOYOTA_WARNING = '#FFD600'
 TOYOTA_ERROR = '#FF4B4B'
 
+# Builder'lar arasında paylaşılan sabit renk/hover şablonları
+_TRACE_COLORS = (TOYOTA_RED, '#FF6600', '#FFAA00', TOYOTA_SUCCESS, '#0066CC')
+_RED_FILL_RGBA = 'rgba(255, 0, 0, 0.2)'
+_RED_FILL_RGBA_RADAR = 'rgba(255, 0, 0, 0.3)'
+_HOVER_LAP_TIME = '<b>Lap %{x}</b><br>Time: %{y:.3f}s<extra></extra>'
+_HOVER_SPEED = '<b>Speed: %{y:.1f} km/h</b><br>Position: %{x:.1f}<extra></extra>'
+_HOVER_CPI = '<b>Lap %{x}</b><br>CPI: %{y:.1f}/100<br>%{text}<extra></extra>'
+_HOVER_SECTOR = '<b>Sector %{x}</b><br>Time Loss: %{y:.3f}s<extra></extra>'
+_HOVER_ANOMALY = '<b>Anomaly Detected</b><br>Count: %{y}<br>Position: %{x:.1f}<extra></extra>'
+
+# Renk skalaları import'ta Plotly'nin kendi validator'ıyla bir kez çözülür; colorbar ayarları da sabit
+_CPI_COLORSCALE = go.scatter.Marker(colorscale='RdYlGn').colorscale
+_CPI_COLORBAR = dict(title='CPI', tickfont=dict(color=TOYOTA_TEXT_WHITE))
+_SECTOR_COLORSCALE = go.bar.Marker(colorscale='Reds').colorscale
+_SECTOR_COLORBAR = dict(title='Time Loss (s)', tickfont=dict(color=TOYOTA_TEXT_WHITE))
+
+# Trace başına tarayıcıya gönderilen en fazla nokta (LTTB ile seyreltilir)
+MAX_TRACE_POINTS = 4000
+
+
+# Tüm grafiklerin ortak layout teması - her çağrıda yeniden kurulmaz (salt okunur)
+_PLOTLY_THEME = MappingProxyType({
+    'plot_bgcolor': TOYOTA_SECONDARY_BG,
+    'paper_bgcolor': TOYOTA_DARK_BG,
+    'font': {'color': TOYOTA_TEXT_WHITE, 'family': 'Helvetica Neue, Arial'},
+    'xaxis': {
+        'gridcolor': '#3a3a3a',
+        'zerolinecolor': '#3a3a3a',
+        'color': TOYOTA_TEXT_WHITE
+    },
+    'yaxis': {
+        'gridcolor': '#3a3a3a',
+        'zerolinecolor': '#3a3a3a',
+        'color': TOYOTA_TEXT_WHITE
+    },
+    'hovermode': 'x unified',
+    'hoverlabel': {
+        'bgcolor': TOYOTA_SECONDARY_BG,
+        'font_size': 12,
+        'font_family': 'Helvetica Neue'
+    }
+})
+
+
+# Tema, varsayılan 'plotly' şablonunun üstüne bir kez Plotly template olarak kaydedilir;
+# grafikler sadece adıyla referans verir. Global default değiştirilmez (diğer sayfalar etkilenmez).
+# Template'teki xaxis/yaxis tüm subplot eksenlerine uygulanır.
+_PLOTLY_TEMPLATE = 'toyota_gr'
+pio.templates[_PLOTLY_TEMPLATE] = go.layout.Template(pio.templates['plotly'])
+pio.templates[_PLOTLY_TEMPLATE].layout.update(dict(_PLOTLY_THEME))
+
 
 def get_plotly_theme() -> dict:
     """
-    Toyota GR themed Plotly layout template
+    Toyota GR themed Plotly layout template (değiştirilebilir kopya)
     """
-    return {
-        'plot_bgcolor': TOYOTA_SECONDARY_BG,
-        'paper_bgcolor': TOYOTA_DARK_BG,
-        'font': {'color': TOYOTA_TEXT_WHITE, 'family': 'Helvetica Neue, Arial'},
-        'xaxis': {
-            'gridcolor': '#3a3a3a',
-            'zerolinecolor': '#3a3a3a',
-            'color': TOYOTA_TEXT_WHITE
-        },
-        'yaxis': {
-            'gridcolor': '#3a3a3a',
-            'zerolinecolor': '#3a3a3a',
-            'color': TOYOTA_TEXT_WHITE
-        },
-        'hovermode': 'x unified',
-        'hoverlabel': {
-            'bgcolor': TOYOTA_SECONDARY_BG,
-            'font_size': 12,
-            'font_family': 'Helvetica Neue'
-        }
-    }
+    return copy.deepcopy(dict(_PLOTLY_THEME))
+
+
+def _downsample(x, y, n_out: int = MAX_TRACE_POINTS):
+    """
+    Uzun trace'leri Plotly'ye vermeden önce LTTB ile seyrelt
+
+    Args:
+        x: X değerleri (Series/Index/array)
+        y: Y değerleri
+        n_out: Hedef nokta sayısı
+
+    Returns:
+        (x, y) - kısa trace'ler olduğu gibi döner
+    """
+    if len(y) <= n_out:
+        return x, y
+
+    x_values = np.asarray(x, dtype=np.float64)
+    y_values = np.asarray(y, dtype=np.float64)
+    idx = lttb_indices(x_values, y_values, n_out)
+    return np.asarray(x)[idx], np.asarray(y)[idx]
+
+
+def _elapsed_seconds(timestamps: pd.Series) -> pd.Series:
+    """
+    İlk örnekten itibaren geçen süre (saniye) - kaynak kolon yerinde değiştirilmez
+    """
+    if not pd.api.types.is_datetime64_any_dtype(timestamps):
+        timestamps = pd.to_datetime(timestamps)
+    return (timestamps - timestamps.iloc[0]).dt.total_seconds()
+
+
+def _sorted_lap_durations(laps: np.ndarray, timestamps: pd.Series, lap_col: str) -> Optional[pd.DataFrame]:
+    """
+    Tur başına (max - min) TimeStamp süresi - turlar zaten sıralıysa (telemetri akışı)
+    groupby yerine int64 nanosaniye üzerinde reduceat ile tek geçiş
 
+    groupby(lap_col)['TimeStamp'].agg(['min', 'max']) ile aynı sonuç; NaT değerler
+    yok sayılır (tamamı NaT olan tur → NaN). Turlar sıralı değilse None döner.
+    """
+    if len(laps) == 0 or pd.isna(laps).any() or not (laps[1:] >= laps[:-1]).all():
+        return None
+
+    nanos = timestamps.to_numpy(dtype='datetime64[ns]').view(np.int64)
+    starts = np.flatnonzero(np.r_[True, laps[1:] != laps[:-1]])
+
+    is_nat = nanos == np.iinfo(np.int64).min
+    lap_max = np.maximum.reduceat(nanos, starts)
+    lap_min = np.minimum.reduceat(np.where(is_nat, np.iinfo(np.int64).max, nanos), starts)
+    durations = (lap_max - lap_min) / 1e9
+    durations[np.add.reduceat(~is_nat, starts) == 0] = np.nan
+
+    return pd.DataFrame({lap_col: laps[starts], 'LapTime': durations})
 
+
+@st.cache_data(show_spinner=False, max_entries=32)
 def create_lap_time_evolution(df: pd.DataFrame, lap_col: str = 'LapNumber') -> go.Figure:
     """
     Lap time evolution chart with best lap highlight
@@ -64,9 +155,15 @@ def create_lap_time_evolution(df: pd.DataFrame, lap_col: str = 'LapNumber') -> g
 
     # Calculate lap times (assuming we have timestamp data)
     if 'TimeStamp' in df.columns and 'LapTime' not in df.columns:
-        df['TimeStamp'] = pd.to_datetime(df['TimeStamp'])
-        lap_times = df.groupby(lap_col)['TimeStamp'].agg(['min', 'max'])
-        lap_times['LapTime'] = (lap_times['max'] - lap_times['min']).dt.total_seconds()
+        timestamps = df['TimeStamp']
+        if not pd.api.types.is_datetime64_any_dtype(timestamps):
+            timestamps = pd.to_datetime(timestamps)
+        lap_times = None
+        if pd.api.types.is_numeric_dtype(df[lap_col]) and not pd.api.types.is_bool_dtype(df[lap_col]):
+            lap_times = _sorted_lap_durations(df[lap_col].to_numpy(), timestamps, lap_col)
+        if lap_times is None:
+            lap_times = timestamps.groupby(df[lap_col]).agg(['min', 'max'])
+            lap_times['LapTime'] = (lap_times['max'] - lap_times['min']).dt.total_seconds()
     elif 'LapTime' in df.columns:
         lap_times = df.groupby(lap_col)['LapTime'].mean().reset_index()
     else:
@@ -84,9 +181,10 @@ def create_lap_time_evolution(df: pd.DataFrame, lap_col: str = 'LapNumber') -> g
 
     # Find best lap
     if 'LapTime' in lap_times.columns:
-        best_lap_idx = lap_times['LapTime'].idxmin()
-        best_lap_num = lap_times.loc[best_lap_idx, lap_col] if lap_col in lap_times.columns else best_lap_idx
-        best_lap_time = lap_times.loc[best_lap_idx, 'LapTime']
+        lap_time_arr = lap_times['LapTime'].to_numpy()
+        best_pos = int(np.nanargmin(lap_time_arr))
+        best_lap_num = lap_times[lap_col].iat[best_pos] if lap_col in lap_times.columns else lap_times.index[best_pos]
+        best_lap_time = lap_time_arr[best_pos]
     else:
         best_lap_num = 0
         best_lap_time = 0
@@ -101,7 +199,7 @@ def create_lap_time_evolution(df: pd.DataFrame, lap_col: str = 'LapNumber') -> g
         name='Lap Time',
         line=dict(color=TOYOTA_RED, width=3),
         marker=dict(size=8, color=TOYOTA_RED),
-        hovertemplate='<b>Lap %{x}</b><br>Time: %{y:.3f}s<extra></extra>'
+        hovertemplate=_HOVER_LAP_TIME
     ))
 
     # Best lap marker
@@ -138,7 +236,7 @@ def create_lap_time_evolution(df: pd.DataFrame, lap_col: str = 'LapNumber') -> g
         },
         xaxis_title='Lap Number',
         yaxis_title='Lap Time (seconds)',
-        **get_plotly_theme(),
+        template=_PLOTLY_TEMPLATE,
         showlegend=True,
         legend=dict(
             bgcolor=TOYOTA_SECONDARY_BG,
@@ -151,6 +249,7 @@ def create_lap_time_evolution(df: pd.DataFrame, lap_col: str = 'LapNumber') -> g
     return fig
 
 
+@st.cache_data(show_spinner=False, max_entries=32)
 def create_speed_trace(df: pd.DataFrame, lap_num: Optional[int] = None) -> go.Figure:
     """
     Speed trace visualization with distance/time
@@ -162,22 +261,24 @@ def create_speed_trace(df: pd.DataFrame, lap_num: Optional[int] = None) -> go.Fi
     Returns:
         Plotly Figure
     """
-    if 'Speed' not in df.columns:
+    if 'Speed' not in df.columns or len(df) == 0:
         return go.Figure()
 
-    # Filter by lap if specified
+    # Filter by lap if specified (sadece gerekli kolonlar, df kopyalanmaz/değiştirilmez)
+    columns = [col for col in ('Speed', 'Distance', 'TimeStamp') if col in df.columns]
     if lap_num is not None and 'LapNumber' in df.columns:
-        data = df[df['LapNumber'] == lap_num].copy()
+        lap_mask = df['LapNumber'].to_numpy() == lap_num
+        if not lap_mask.any():
+            return go.Figure()
+        data = df.loc[lap_mask, columns]
         title = f'Speed Trace - Lap {lap_num}'
     else:
-        data = df.copy()
+        data = df
         title = 'Speed Trace - All Laps'
 
     # Create distance axis if not exists
     if 'Distance' not in data.columns and 'TimeStamp' in data.columns:
-        data['TimeStamp'] = pd.to_datetime(data['TimeStamp'])
-        data['Time'] = (data['TimeStamp'] - data['TimeStamp'].iloc[0]).dt.total_seconds()
-        x_data = data['Time']
+        x_data = _elapsed_seconds(data['TimeStamp'])
         x_title = 'Time (seconds)'
     elif 'Distance' in data.columns:
         x_data = data['Distance']
@@ -189,21 +290,23 @@ def create_speed_trace(df: pd.DataFrame, lap_num: Optional[int] = None) -> go.Fi
     fig = go.Figure()
 
     # Speed trace
-    fig.add_trace(go.Scatter(
-        x=x_data,
-        y=data['Speed'],
+    trace_x, trace_y = _downsample(x_data, data['Speed'])
+    fig.add_trace(go.Scattergl(
+        x=trace_x,
+        y=trace_y,
         mode='lines',
         name='Speed',
         line=dict(color=TOYOTA_RED, width=2),
         fill='tozeroy',
-        fillcolor=f'rgba(255, 0, 0, 0.2)',
-        hovertemplate='<b>Speed: %{y:.1f} km/h</b><br>Position: %{x:.1f}<extra></extra>'
+        fillcolor=_RED_FILL_RGBA,
+        hovertemplate=_HOVER_SPEED
     ))
 
-    # Add max speed marker
-    max_speed_idx = data['Speed'].idxmax()
-    max_speed = data.loc[max_speed_idx, 'Speed']
-    max_speed_x = x_data.iloc[data.index.get_loc(max_speed_idx)] if hasattr(x_data, 'iloc') else x_data[max_speed_idx]
+    # Add max speed marker (pozisyonel argmax - label lookup zinciri yok)
+    speed_arr = data['Speed'].to_numpy()
+    max_pos = int(np.nanargmax(speed_arr))
+    max_speed = speed_arr[max_pos]
+    max_speed_x = np.asarray(x_data)[max_pos]
 
     fig.add_trace(go.Scatter(
         x=[max_speed_x],
@@ -221,13 +324,14 @@ def create_speed_trace(df: pd.DataFrame, lap_num: Optional[int] = None) -> go.Fi
         title={'text': f'🏎️ {title}', 'font': {'size': 20}},
         xaxis_title=x_title,
         yaxis_title='Speed (km/h)',
-        **get_plotly_theme(),
+        template=_PLOTLY_TEMPLATE,
         height=400
     )
 
     return fig
 
 
+@st.cache_data(show_spinner=False, max_entries=32)
 def create_telemetry_overlay(
     df: pd.DataFrame,
     channels: List[str] = ['Speed', 'BrakePressure', 'Throttle'],
@@ -244,19 +348,24 @@ def create_telemetry_overlay(
     Returns:
         Plotly Figure with subplots
     """
-    # Filter data
-    if lap_num is not None and 'LapNumber' in df.columns:
-        data = df[df['LapNumber'] == lap_num].copy()
-    else:
-        data = df.copy()
-
     # Filter available channels
-    available_channels = [ch for ch in channels if ch in data.columns]
+    available_channels = [ch for ch in channels if ch in df.columns]
 
-    if not available_channels:
+    if not available_channels or len(df) == 0:
         return go.Figure()
 
-    # Create subplots
+    # Filter data (sadece gerekli kolonlar, df kopyalanmaz/değiştirilmez)
+    if lap_num is not None and 'LapNumber' in df.columns:
+        lap_mask = df['LapNumber'].to_numpy() == lap_num
+        if not lap_mask.any():
+            return go.Figure()
+        columns = available_channels + (['TimeStamp'] if 'TimeStamp' in df.columns else [])
+        data = df.loc[lap_mask, columns]
+    else:
+        data = df
+
+    # Create subplots (plotly.subplots sadece bu grafikte gerekli - import'u ilk kullanımda)
+    from plotly.subplots import make_subplots
     fig = make_subplots(
         rows=len(available_channels),
         cols=1,
@@ -267,37 +376,34 @@ def create_telemetry_overlay(
 
     # X-axis
     if 'TimeStamp' in data.columns:
-        data['TimeStamp'] = pd.to_datetime(data['TimeStamp'])
-        x_data = (data['TimeStamp'] - data['TimeStamp'].iloc[0]).dt.total_seconds()
+        x_data = _elapsed_seconds(data['TimeStamp'])
         x_title = 'Time (s)'
     else:
         x_data = data.index
         x_title = 'Data Point'
 
     # Add traces
-    colors = [TOYOTA_RED, '#FF6600', '#FFAA00', '#00D26A', '#0066CC']
-
+    # Trace'ler ve eksen başlıkları tek seferde eklenir (kanal başına validation/relayout yok)
+    traces = []
     for i, channel in enumerate(available_channels):
-        fig.add_trace(
-            go.Scatter(
-                x=x_data,
-                y=data[channel],
-                mode='lines',
-                name=channel,
-                line=dict(color=colors[i % len(colors)], width=2),
-                showlegend=False
-            ),
-            row=i+1,
-            col=1
-        )
+        trace_x, trace_y = _downsample(x_data, data[channel])
+        traces.append(go.Scattergl(
+            x=trace_x,
+            y=trace_y,
+            mode='lines',
+            name=channel,
+            line=dict(color=_TRACE_COLORS[i % len(_TRACE_COLORS)], width=2),
+            showlegend=False
+        ))
+    rows = list(range(1, len(available_channels) + 1))
+    fig.add_traces(traces, rows=rows, cols=[1] * len(traces))
 
-        # Update y-axis title
-        fig.update_yaxes(
-            title_text=channel,
-            row=i+1,
-            col=1,
-            gridcolor='#3a3a3a'
-        )
+    # Update y-axis titles (make_subplots tek kolonda eksenleri yaxis, yaxis2, ... diye adlandırır)
+    fig.update_yaxes(gridcolor='#3a3a3a')
+    fig.update_layout({
+        f'yaxis{row if row > 1 else ""}': {'title_text': channel}
+        for row, channel in zip(rows, available_channels)
+    })
 
     # Update x-axis
     fig.update_xaxes(
@@ -322,6 +428,7 @@ def create_telemetry_overlay(
     return fig
 
 
+@st.cache_data(show_spinner=False, max_entries=32)
 def create_cpi_breakdown_chart(cpi_result: Dict) -> go.Figure:
     """
     CPI breakdown radar/bar chart
@@ -347,7 +454,7 @@ def create_cpi_breakdown_chart(cpi_result: Dict) -> go.Figure:
         r=values,
         theta=categories,
         fill='toself',
-        fillcolor=f'rgba(255, 0, 0, 0.3)',
+        fillcolor=_RED_FILL_RGBA_RADAR,
         line=dict(color=TOYOTA_RED, width=3),
         marker=dict(size=8, color=TOYOTA_RED),
         name='Performance'
@@ -389,6 +496,7 @@ def create_cpi_breakdown_chart(cpi_result: Dict) -> go.Figure:
     return fig
 
 
+@st.cache_data(show_spinner=False, max_entries=32)
 def create_cpi_trend(lap_cpis: Dict[int, Dict]) -> go.Figure:
     """
     CPI trend across laps
@@ -402,8 +510,8 @@ def create_cpi_trend(lap_cpis: Dict[int, Dict]) -> go.Figure:
     if not lap_cpis:
         return go.Figure()
 
-    laps = sorted(lap_cpis.keys())
-    cpi_scores = [lap_cpis[lap]['total_cpi'] for lap in laps]
+    laps = np.array(sorted(lap_cpis.keys()))
+    cpi_scores = np.fromiter((lap_cpis[lap]['total_cpi'] for lap in laps), dtype=np.float64, count=laps.size)
     grades = [lap_cpis[lap]['grade'] for lap in laps]
 
     fig = go.Figure()
@@ -418,49 +526,50 @@ def create_cpi_trend(lap_cpis: Dict[int, Dict]) -> go.Figure:
         marker=dict(
             size=10,
             color=cpi_scores,
-            colorscale='RdYlGn',
+            colorscale=_CPI_COLORSCALE,
             showscale=True,
-            colorbar=dict(title='CPI', tickfont=dict(color=TOYOTA_TEXT_WHITE))
+            colorbar=_CPI_COLORBAR
         ),
         text=[f'Grade: {g}' for g in grades],
-        hovertemplate='<b>Lap %{x}</b><br>CPI: %{y:.1f}/100<br>%{text}<extra></extra>'
+        hovertemplate=_HOVER_CPI
     ))
 
-    # Average line
-    avg_cpi = np.mean(cpi_scores)
-    fig.add_hline(
-        y=avg_cpi,
-        line_dash='dash',
-        line_color=TOYOTA_TEXT_GRAY,
-        annotation_text=f'Average: {avg_cpi:.1f}',
-        annotation_position='right'
-    )
-
-    # Grade thresholds
+    # Average line + grade thresholds: add_hline başına layout güncellemesi yerine tek seferde
+    avg_cpi = cpi_scores.mean()
     thresholds = [(90, 'A'), (80, 'B'), (70, 'C'), (60, 'D')]
+    shapes = [dict(
+        type='line', xref='x domain', yref='y', x0=0, x1=1, y0=avg_cpi, y1=avg_cpi,
+        line=dict(dash='dash', color=TOYOTA_TEXT_GRAY)
+    )]
+    annotations = [dict(
+        text=f'Average: {avg_cpi:.1f}', showarrow=False, xref='x domain', yref='y',
+        x=1, y=avg_cpi, xanchor='left', yanchor='middle'
+    )]
     for threshold, grade in thresholds:
-        fig.add_hline(
-            y=threshold,
-            line_dash='dot',
-            line_color='#444',
-            line_width=1,
-            annotation_text=grade,
-            annotation_position='left',
-            annotation_font_size=10
-        )
+        shapes.append(dict(
+            type='line', xref='x domain', yref='y', x0=0, x1=1, y0=threshold, y1=threshold,
+            line=dict(dash='dot', color='#444', width=1)
+        ))
+        annotations.append(dict(
+            text=grade, font=dict(size=10), showarrow=False, xref='x domain', yref='y',
+            x=0, y=threshold, xanchor='right', yanchor='middle'
+        ))
 
     fig.update_layout(
         title={'text': '📊 CPI Evolution', 'font': {'size': 20}},
         xaxis_title='Lap Number',
         yaxis_title='CPI Score',
-        **get_plotly_theme(),
+        template=_PLOTLY_TEMPLATE,
         yaxis=dict(range=[0, 100]),
+        shapes=shapes,
+        annotations=annotations,
         height=400
     )
 
     return fig
 
 
+@st.cache_data(show_spinner=False, max_entries=32)
 def create_sector_heatmap(sector_data: Dict[int, Dict]) -> go.Figure:
     """
     Sector performance heatmap
@@ -489,27 +598,28 @@ def create_sector_heatmap(sector_data: Dict[int, Dict]) -> go.Figure:
         y=deltas,
         marker=dict(
             color=deltas,
-            colorscale='Reds',
+            colorscale=_SECTOR_COLORSCALE,
             showscale=True,
-            colorbar=dict(title='Time Loss (s)', tickfont=dict(color=TOYOTA_TEXT_WHITE))
+            colorbar=_SECTOR_COLORBAR
         ),
         text=[f'+{d:.3f}s' if d > 0 else f'{d:.3f}s' for d in deltas],
         textposition='outside',
         textfont=dict(color=TOYOTA_TEXT_WHITE),
-        hovertemplate='<b>Sector %{x}</b><br>Time Loss: %{y:.3f}s<extra></extra>'
+        hovertemplate=_HOVER_SECTOR
     ))
 
     fig.update_layout(
         title={'text': '🗺️ Sector Time Loss Heatmap', 'font': {'size': 20}},
         xaxis_title='Sector',
         yaxis_title='Time Loss vs Best (seconds)',
-        **get_plotly_theme(),
+        template=_PLOTLY_TEMPLATE,
         height=400
     )
 
     return fig
 
 
+@st.cache_data(show_spinner=False, max_entries=32)
 def create_anomaly_timeline(df: pd.DataFrame) -> go.Figure:
     """
     Anomaly detection timeline
@@ -520,13 +630,12 @@ def create_anomaly_timeline(df: pd.DataFrame) -> go.Figure:
     Returns:
         Plotly Figure
     """
-    if 'total_anomalies' not in df.columns:
+    if 'total_anomalies' not in df.columns or len(df) == 0:
         return go.Figure()
 
     # X-axis
     if 'TimeStamp' in df.columns:
-        df['TimeStamp'] = pd.to_datetime(df['TimeStamp'])
-        x_data = (df['TimeStamp'] - df['TimeStamp'].iloc[0]).dt.total_seconds()
+        x_data = _elapsed_seconds(df['TimeStamp'])
         x_title = 'Time (s)'
     else:
         x_data = df.index
@@ -534,37 +643,40 @@ def create_anomaly_timeline(df: pd.DataFrame) -> go.Figure:
 
     fig = go.Figure()
 
-    # Anomaly scatter
-    anomalies = df[df['total_anomalies'] > 0]
+    # Anomaly scatter (pozisyonel boolean mask - ara DataFrame/index kurulmaz)
+    anomaly_counts = df['total_anomalies'].to_numpy()
+    anomaly_mask = anomaly_counts > 0
 
-    if len(anomalies) > 0:
-        anomaly_x = x_data[anomalies.index] if hasattr(x_data, 'iloc') else x_data.iloc[anomalies.index]
+    if anomaly_mask.any():
+        anomaly_x = np.asarray(x_data)[anomaly_mask]
+        anomaly_y = anomaly_counts[anomaly_mask]
 
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=anomaly_x,
-            y=anomalies['total_anomalies'],
+            y=anomaly_y,
             mode='markers',
             name='Anomalies',
             marker=dict(
-                size=anomalies['total_anomalies'] * 5 + 5,
+                size=anomaly_y * 5 + 5,
                 color=TOYOTA_ERROR,
                 symbol='x',
                 line=dict(width=2, color=TOYOTA_TEXT_WHITE)
             ),
-            hovertemplate='<b>Anomaly Detected</b><br>Count: %{y}<br>Position: %{x:.1f}<extra></extra>'
+            hovertemplate=_HOVER_ANOMALY
         ))
 
     fig.update_layout(
         title={'text': '⚠️ Anomaly Detection Timeline', 'font': {'size': 20}},
         xaxis_title=x_title,
         yaxis_title='Anomaly Count',
-        **get_plotly_theme(),
+        template=_PLOTLY_TEMPLATE,
         height=300
     )
 
     return fig
 
 
+@st.cache_data(show_spinner=False, max_entries=32)
 def create_performance_gauge(cpi_score: float) -> go.Figure:
     """
     CPI gauge chart
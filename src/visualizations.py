@@ -1,7 +1,47 @@
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import streamlit as st
 
+from src.viz_utils import lttb
+
+# (column, subplot row, label, current-lap color, reference-lap color), in trace order
+TELEMETRY_CHANNELS = (
+    ('speed', 1, 'Speed', 'cyan', 'rgba(0, 255, 255, 0.3)'),
+    ('nmot', 2, 'RPM', 'orange', 'rgba(255, 165, 0, 0.3)'),
+    ('ath', 3, 'Throttle', 'green', 'rgba(0, 128, 0, 0.3)'),
+    ('pbrake_f', 3, 'Brake', 'red', 'rgba(255, 0, 0, 0.3)'),
+    ('Steering_Angle', 4, 'Steering', 'magenta', 'rgba(255, 0, 255, 0.3)'),
+)
+
+# Static 4-row layout (subplot titles, shared x axes, theme), built once at import;
+# go.Figure copies it, so each call only adds the traces
+_TELEMETRY_LAYOUT = make_subplots(
+    rows=4, cols=1, shared_xaxes=True,
+    vertical_spacing=0.05,
+    subplot_titles=("Speed (km/h)", "RPM", "Throttle & Brake", "Steering Angle")
+).update_layout(
+    height=800, 
+    template="plotly_dark",
+    title_text="Telemetry Analysis (Comparison)",
+    xaxis4_title="Distance (m)"
+).layout
+
+def _row_axes(row):
+    """xaxis/yaxis references of a _TELEMETRY_LAYOUT row (as make_subplots assigns them)."""
+    suffix = '' if row == 1 else str(row)
+    return dict(xaxis=f'x{suffix}', yaxis=f'y{suffix}')
+
+def _line(x, y, **kwargs):
+    """Distance-based line trace, downsampled with LTTB for long laps."""
+    x, y = lttb(x, y)
+    return go.Scatter(x=x, y=y, **kwargs)
+
+# Figures are cached on the frame contents: reruns from unrelated widgets
+# (replay slider, chat) reuse the built figure instead of re-running LTTB.
+# cache_resource hands back the same Figure object (no pickle round trip, which
+# re-validates every trace); callers only pass it to st.plotly_chart and must
+# not modify it.
+@st.cache_resource(show_spinner=False, ttl=3600, max_entries=8)
 def plot_telemetry(df, df_ref=None):
     """
     Generates telemetry traces: Speed, RPM, Throttle, Brake.
@@ -10,43 +50,22 @@ def plot_telemetry(df, df_ref=None):
     if df.empty:
         return go.Figure()
     
-    # Create subplots
-    fig = make_subplots(rows=4, cols=1, shared_xaxes=True, 
-                        vertical_spacing=0.05,
-                        subplot_titles=("Speed (km/h)", "RPM", "Throttle & Brake", "Steering Angle"))
-
-    # Main Lap Traces
-    fig.add_trace(go.Scatter(x=df['distance'], y=df['speed'], name='Speed (Current)', line=dict(color='cyan')), row=1, col=1)
-    if 'nmot' in df.columns:
-        fig.add_trace(go.Scatter(x=df['distance'], y=df['nmot'], name='RPM (Current)', line=dict(color='orange')), row=2, col=1)
-    if 'ath' in df.columns:
-        fig.add_trace(go.Scatter(x=df['distance'], y=df['ath'], name='Throttle (Current)', line=dict(color='green')), row=3, col=1)
-    if 'pbrake_f' in df.columns:
-        fig.add_trace(go.Scatter(x=df['distance'], y=df['pbrake_f'], name='Brake (Current)', line=dict(color='red')), row=3, col=1)
-    if 'Steering_Angle' in df.columns:
-        fig.add_trace(go.Scatter(x=df['distance'], y=df['Steering_Angle'], name='Steering (Current)', line=dict(color='magenta')), row=4, col=1)
+    # Main Lap Traces, then Reference Lap Traces (Ghost), each pinned to its subplot row
+    traces = []
+    x_main = df['distance'].to_numpy()
+    for col, row, label, color, _ in TELEMETRY_CHANNELS:
+        if col in df.columns:
+            traces.append(_line(x_main, df[col].to_numpy(), name=f'{label} (Current)', line=dict(color=color), **_row_axes(row)))
 
-    # Reference Lap Traces (Ghost)
     if df_ref is not None and not df_ref.empty:
-        fig.add_trace(go.Scatter(x=df_ref['distance'], y=df_ref['speed'], name='Speed (Ref)', line=dict(color='rgba(0, 255, 255, 0.3)', dash='dot')), row=1, col=1)
-        if 'nmot' in df_ref.columns:
-            fig.add_trace(go.Scatter(x=df_ref['distance'], y=df_ref['nmot'], name='RPM (Ref)', line=dict(color='rgba(255, 165, 0, 0.3)', dash='dot')), row=2, col=1)
-        if 'ath' in df_ref.columns:
-            fig.add_trace(go.Scatter(x=df_ref['distance'], y=df_ref['ath'], name='Throttle (Ref)', line=dict(color='rgba(0, 128, 0, 0.3)', dash='dot')), row=3, col=1)
-        if 'pbrake_f' in df_ref.columns:
-            fig.add_trace(go.Scatter(x=df_ref['distance'], y=df_ref['pbrake_f'], name='Brake (Ref)', line=dict(color='rgba(255, 0, 0, 0.3)', dash='dot')), row=3, col=1)
-        if 'Steering_Angle' in df_ref.columns:
-            fig.add_trace(go.Scatter(x=df_ref['distance'], y=df_ref['Steering_Angle'], name='Steering (Ref)', line=dict(color='rgba(255, 0, 255, 0.3)', dash='dot')), row=4, col=1)
+        x_ref = df_ref['distance'].to_numpy()
+        for col, row, label, _, ref_color in TELEMETRY_CHANNELS:
+            if col in df_ref.columns:
+                traces.append(_line(x_ref, df_ref[col].to_numpy(), name=f'{label} (Ref)', line=dict(color=ref_color, dash='dot'), **_row_axes(row)))
 
-    fig.update_layout(
-        height=800, 
-        template="plotly_dark",
-        title_text="Telemetry Analysis (Comparison)",
-        xaxis4_title="Distance (m)"
-    )
-    
-    return fig
+    return go.Figure(data=traces, layout=_TELEMETRY_LAYOUT)
 
+@st.cache_resource(show_spinner=False, ttl=3600, max_entries=8)
 def plot_track_map(df):
     """
     Generates a 2D track map using WorldPosition coordinates.
@@ -57,15 +76,17 @@ def plot_track_map(df):
     if 'WorldPositionX' not in df.columns or 'WorldPositionY' not in df.columns:
          return go.Figure().add_annotation(text="No Position Data", showarrow=False)
 
-    fig = px.scatter(
-        df, 
-        x='WorldPositionX', 
-        y='WorldPositionY', 
-        color='speed',
-        title='Track Map (Speed)',
-        color_continuous_scale='Viridis'
-    )
+    # Single WebGL trace colored by speed (no Plotly Express figure assembly)
+    fig = go.Figure(go.Scattergl(
+        x=df['WorldPositionX'],
+        y=df['WorldPositionY'],
+        mode='markers',
+        marker=dict(color=df['speed'], colorscale='Viridis', showscale=True, colorbar=dict(title='speed')),
+        hovertemplate='WorldPositionX=%{x}<br>WorldPositionY=%{y}<br>speed=%{marker.color}<extra></extra>',
+        showlegend=False
+    ))
     fig.update_layout(
+        title='Track Map (Speed)',
         plot_bgcolor='rgba(0,0,0,0)',
         paper_bgcolor='rgba(0,0,0,0)',
         xaxis=dict(showgrid=False, zeroline=False, visible=False),
@@ -1,9 +1,8 @@
 import pydeck as pdk
-import pandas as pd
 import numpy as np
 
 def calculate_bearing(lat1, lon1, lat2, lon2):
-    """Calculates the bearing between two points."""
+    """Calculates the bearing between two points (scalars or element-wise over numpy arrays)."""
     lon_delta_rad = np.radians(lon2 - lon1)
     lat1_rad = np.radians(lat1)
     lat2_rad = np.radians(lat2)
@@ -44,36 +43,78 @@ def get_car_polygon(lat, lon, bearing, width=2, length=4):
         
     return poly
 
-def plot_3d_track(df, car_index=None):
+def get_car_polygons(lat, lon, bearing, width=2, length=4):
     """
-    Generates a 3D track visualization using PyDeck.
-    Uses WorldPositionX/Y (from Dead Reckoning) and Speed for color.
-    Optionally highlights a car position if car_index is provided.
+    get_car_polygon for every point of a path at once.
+    Returns an (N, 4, 2) array of [lon, lat] corners; the same arithmetic is
+    broadcast over the (N,) inputs and the 4 corner offsets.
     """
-    if df.empty or 'WorldPositionX' not in df.columns:
-        return None
-
-    # Normalize coordinates for PyDeck
-    COTA_LAT = 30.1328
-    COTA_LON = -97.6411
+    lat = np.asarray(lat, dtype=np.float64)[:, None]
+    lon = np.asarray(lon, dtype=np.float64)[:, None]
+    angle_rad = np.radians(np.asarray(bearing, dtype=np.float64))[:, None]
+    cos_a = np.cos(angle_rad)
+    sin_a = np.sin(angle_rad)
+    
+    # Corners relative to center (0,0), same order as get_car_polygon
+    cx = np.array([length/2, length/2, -length/2, -length/2])
+    cy = np.array([width/2, -width/2, -width/2, width/2])
     
-    # Ensure lat/lon exist
+    rx = cx * cos_a - cy * sin_a
+    ry = cx * sin_a + cy * cos_a
+    return np.stack([lon + (rx * 1e-5), lat + (ry * 9e-6)], axis=-1)
+
+# Normalize coordinates for PyDeck
+COTA_LAT = 30.1328
+COTA_LON = -97.6411
+
+def _ensure_lat_lon(df):
+    """Adds lat/lon from WorldPositionX/Y when the frame does not carry them yet."""
+    # generate_track_path already adds lat/lon; only frames built elsewhere need them here
     if 'lat' not in df.columns:
         df['lat'] = COTA_LAT + (df['WorldPositionY'] / 111000)
         df['lon'] = COTA_LON + (df['WorldPositionX'] / 96000)
+
+def _point_lat_lon(df, i):
+    """lat/lon of row i (position based), derived from WorldPositionX/Y if needed."""
+    if 'lat' in df.columns:
+        return df['lat'].iat[i], df['lon'].iat[i]
+    return (COTA_LAT + (df['WorldPositionY'].iat[i] / 111000),
+            COTA_LON + (df['WorldPositionX'].iat[i] / 96000))
+
+def build_track_deck(df):
+    """
+    Builds the PyDeck view of the whole lap (track layer only).
+    Uses WorldPositionX/Y (from Dead Reckoning) and Speed for color.
+    The result does not depend on the car position, so a replay can build it
+    once and only swap the car layers with update_car_layer.
+    """
+    if df.empty or 'WorldPositionX' not in df.columns:
+        return None
+
+    _ensure_lat_lon(df)
     
-    # Color by Speed
-    max_speed = df['speed'].max()
-    df['speed_norm'] = df['speed'] / max_speed
-    df['color'] = df['speed_norm'].apply(lambda x: [int(x*255), 0, int((1-x)*255), 150])
-    
-    layers = []
+    # Color by Speed (one max reduction + one divide on the raw array; NaN-skipping like Series.max)
+    speed = df['speed'].to_numpy()
+    speed_norm = np.divide(speed, np.nanmax(speed))
+    red = (speed_norm * 255).astype(np.int64)  # truncates toward zero like int()
+    rgba = np.column_stack([red, np.zeros_like(red), ((1 - speed_norm) * 255).astype(np.int64), np.full_like(red, 150)])
+    df['color'] = rgba.tolist()  # pydeck serializes one [r, g, b, a] list per row
+
+    # Heading along the whole path in one vectorized pass; the last point has no
+    # successor, so it keeps the previous heading (edge padding)
+    if 'bearing' not in df.columns:
+        lat = df['lat'].to_numpy()
+        lon = df['lon'].to_numpy()
+        bearings = calculate_bearing(lat[:-1], lon[:-1], lat[1:], lon[1:])
+        df['bearing'] = np.concatenate([bearings, bearings[-1:]]) if len(bearings) else np.zeros(len(df))
     
     # Layer 1: Track (Wider Scatterplot to simulate road)
     # Using a larger radius to make it look like a road
+    # Only ship the columns the layer and tooltip read; pydeck serializes every column to JSON
+    track_columns = [col for col in ('lon', 'lat', 'color', 'speed', 'distance') if col in df.columns]
     layer_track = pdk.Layer(
         "ScatterplotLayer",
-        df,
+        df[track_columns],
         get_position="[lon, lat]",
         get_color="color",
         get_radius=6, # Wider road (6 meters radius)
@@ -81,24 +122,70 @@ def plot_3d_track(df, car_index=None):
         opacity=0.8,
         stroked=False,
     )
-    layers.append(layer_track)
+
+    # View State
+    view_state = pdk.ViewState(
+        latitude=COTA_LAT,
+        longitude=COTA_LON,
+        zoom=15, # Closer zoom
+        pitch=60, # More tilted for 3D effect
+        bearing=0 # We could rotate the camera with the car, but static is safer for now
+    )
+    
+    tooltip = {
+        "html": "<b>Speed:</b> {speed} km/h<br><b>Distance:</b> {distance} m",
+        "style": {"backgroundColor": "steelblue", "color": "white"}
+    }
+    
+    r = pdk.Deck(
+        layers=[layer_track],
+        initial_view_state=view_state,
+        tooltip=tooltip,
+        map_style="mapbox://styles/mapbox/dark-v10"
+    )
+    
+    return r
+
+def update_car_layer(deck, df, car_index, polygons=None):
+    """
+    Replaces the car marker layers of a deck from build_track_deck with the
+    car at car_index. Only the current (and next) row is read, so a replay
+    tick costs O(1) instead of rebuilding the track.
+    polygons: optional get_car_polygons result for df, used instead of
+    rotating the car corners again.
+    """
+    layers = deck.layers[:1]
     
     # Layer 2: Car Marker (if index provided)
     if car_index is not None and 0 <= car_index < len(df):
-        # Get current and next point to calculate bearing
-        current_pt = df.iloc[car_index]
-        next_pt = df.iloc[car_index + 1] if car_index + 1 < len(df) else df.iloc[car_index]
-        
-        bearing = calculate_bearing(current_pt['lat'], current_pt['lon'], next_pt['lat'], next_pt['lon'])
+        lat, lon = _point_lat_lon(df, car_index)
+        if polygons is not None:
+            polygon = polygons[car_index].tolist()
+        else:
+            if 'bearing' in df.columns:
+                # Precomputed by build_track_deck
+                bearing = df['bearing'].iat[car_index]
+            else:
+                # Frame without the precomputed column: heading of the segment the
+                # car is on (the last point reuses the segment leading into it)
+                start = min(car_index, max(len(df) - 2, 0))
+                start_lat, start_lon = _point_lat_lon(df, start)
+                next_lat, next_lon = _point_lat_lon(df, min(start + 1, len(df) - 1))
+                bearing = calculate_bearing(start_lat, start_lon, next_lat, next_lon)
+            polygon = get_car_polygon(lat, lon, bearing)
         
-        # Create a single row dataframe for the car
-        car_df = pd.DataFrame([current_pt])
-        car_df['polygon'] = [get_car_polygon(current_pt['lat'], current_pt['lon'], bearing)]
+        # Single record for the car layers (plain dict, no one-row DataFrame);
+        # speed/distance feed the shared tooltip
+        car_record = {'lon': float(lon), 'lat': float(lat), 'polygon': polygon}
+        for col in ('speed', 'distance'):
+            if col in df.columns:
+                car_record[col] = df[col].iat[car_index].item()
+        car_data = [car_record]
         
         # 3D Car Model (PolygonLayer)
         layer_car = pdk.Layer(
             "PolygonLayer",
-            car_df,
+            car_data,
             get_polygon="polygon",
             get_fill_color=[255, 255, 255], # White Car
             get_elevation=2, # Car height
@@ -114,7 +201,7 @@ def plot_3d_track(df, car_index=None):
         # Add a spotlight or highlight effect (optional, using a larger translucent circle)
         layer_highlight = pdk.Layer(
             "ScatterplotLayer",
-            car_df,
+            car_data,
             get_position="[lon, lat]",
             get_color=[255, 255, 255, 50],
             get_radius=15,
@@ -124,25 +211,16 @@ def plot_3d_track(df, car_index=None):
         )
         layers.append(layer_highlight)
 
-    # View State
-    view_state = pdk.ViewState(
-        latitude=COTA_LAT,
-        longitude=COTA_LON,
-        zoom=15, # Closer zoom
-        pitch=60, # More tilted for 3D effect
-        bearing=0 # We could rotate the camera with the car, but static is safer for now
-    )
-    
-    tooltip = {
-        "html": "<b>Speed:</b> {speed} km/h<br><b>Distance:</b> {distance} m",
-        "style": {"backgroundColor": "steelblue", "color": "white"}
-    }
-    
-    r = pdk.Deck(
-        layers=layers,
-        initial_view_state=view_state,
-        tooltip=tooltip,
-        map_style="mapbox://styles/mapbox/dark-v10"
-    )
-    
-    return r
+    deck.layers = layers
+    return deck
+
+def plot_3d_track(df, car_index=None):
+    """
+    Generates a 3D track visualization using PyDeck.
+    Uses WorldPositionX/Y (from Dead Reckoning) and Speed for color.
+    Optionally highlights a car position if car_index is provided.
+    """
+    deck = build_track_deck(df)
+    if deck is not None and car_index is not None:
+        update_car_layer(deck, df, car_index)
+    return deck
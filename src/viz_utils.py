@@ -0,0 +1,97 @@
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Traces shorter than this are plotted as-is
+LTTB_MIN_POINTS = 4000
+# Points kept per downsampled trace
+LTTB_POINTS = 2000
+
+
+def _lttb_loop(x, y, edges, avg_x, avg_y):
+    """
+    Largest-Triangle-Three-Buckets selection: in each bucket keep the point
+    that forms the largest triangle with the previously kept point and the
+    next bucket's average. NaN areas are skipped.
+    """
+    n_out = edges.shape[0] + 1
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[n_out - 1] = y.shape[0] - 1
+    prev = 0
+    for b in range(n_out - 2):
+        px = x[prev]
+        py = y[prev]
+        best_area = -1.0
+        best = edges[b]
+        for i in range(edges[b], edges[b + 1]):
+            area = abs((px - avg_x[b]) * (y[i] - py) - (px - x[i]) * (avg_y[b] - py))
+            if area > best_area:
+                best_area = area
+                best = i
+        selected[b + 1] = best
+        prev = best
+    return selected
+
+
+def _lttb_numpy(x, y, edges, avg_x, avg_y):
+    """NumPy fallback of _lttb_loop (triangle areas vectorized per bucket)."""
+    n_out = edges.shape[0] + 1
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[n_out - 1] = y.shape[0] - 1
+    prev = 0
+    for b in range(n_out - 2):
+        start, end = edges[b], edges[b + 1]
+        area = np.abs(
+            (x[prev] - avg_x[b]) * (y[start:end] - y[prev])
+            - (x[prev] - x[start:end]) * (avg_y[b] - y[prev])
+        )
+        prev = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        selected[b + 1] = prev
+    return selected
+
+
+if NUMBA_AVAILABLE:
+    _lttb = njit(cache=True)(_lttb_loop)
+else:
+    _lttb = _lttb_numpy
+
+
+def lttb_indices(x, y, n_out=LTTB_POINTS):
+    """
+    Positions of the n_out points LTTB keeps (peaks/dips preserved,
+    first and last point always kept). x must be increasing.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    # n_out - 2 buckets between the first and last point; bucket b is edges[b]..edges[b+1]
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    # Third corner for bucket b: (NaN-free) average of the next bucket
+    finite = np.isfinite(y)
+    counts = np.add.reduceat(finite.astype(np.int64), edges[1:])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_x = np.add.reduceat(x, edges[1:]) / np.diff(np.r_[edges[1:], n])
+        avg_y = np.add.reduceat(np.where(finite, y, 0.0), edges[1:]) / counts
+
+    return _lttb(x, y, edges, avg_x, avg_y)
+
+
+def lttb(x, y, n_out=LTTB_POINTS, min_points=LTTB_MIN_POINTS):
+    """
+    Downsamples a line trace with LTTB before it is handed to Plotly.
+    Traces shorter than min_points are returned unchanged.
+    """
+    if len(y) < min_points:
+        return x, y
+    idx = lttb_indices(x, y, n_out)
+    return np.asarray(x)[idx], np.asarray(y)[idx]
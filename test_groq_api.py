@@ -7,6 +7,14 @@ from groq import Groq
 import os
 import sys
 
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None  # reported below, with the other setup errors
+
 # Set UTF-8 encoding for Windows console
 if sys.platform == 'win32':
     import io
@@ -14,13 +22,11 @@ if sys.platform == 'win32':
 
 # Read API key from .streamlit/secrets.toml
 try:
-    with open(".streamlit/secrets.toml", "r", encoding="utf-8") as f:
-        content = f.read()
-        # Extract API key from TOML format
-        for line in content.split('\n'):
-            if 'GROQ_API_KEY' in line:
-                api_key = line.split('=')[1].strip().strip('"').strip("'")
-                break
+    if tomllib is None:
+        raise ImportError("tomli is required on Python < 3.11 (pip install tomli)")
+
+    with open(".streamlit/secrets.toml", "rb") as f:
+        api_key = tomllib.load(f)["GROQ_API_KEY"]
 
     print("[OK] API Key loaded successfully")
     print(f"    Length: {len(api_key)} characters")
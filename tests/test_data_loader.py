@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+import src.data_loader as dl
+from src.data_loader import _pivot_first
+
+
+def _long(rows):
+    return pd.DataFrame(rows, columns=['timestamp', 'telemetry_name', 'telemetry_value', 'lap']).astype(
+        {'timestamp': 'datetime64[ns]', 'telemetry_name': 'category'}
+    )
+
+
+def test_pivot_first_matches_pivot_table():
+    df_raw = _long([
+        ('2024-01-01 00:00:00', 'speed', 100.0, 1),
+        ('2024-01-01 00:00:00', 'speed', 101.0, 1),
+        ('2024-01-01 00:00:00', 'nmot', 5000.0, 1),
+        ('2024-01-01 00:00:01', 'speed', np.nan, 1),
+        ('2024-01-01 00:00:01', 'speed', 102.0, 1),
+    ])
+    expected = df_raw.pivot_table(
+        index='timestamp', columns='telemetry_name', values='telemetry_value',
+        aggfunc='first', observed=True
+    )
+    expected.columns = expected.columns.astype(object)
+    pd.testing.assert_frame_equal(_pivot_first(df_raw), expected, check_names=False)
+
+
+def test_pivot_first_drops_rows_without_timestamp_or_name():
+    df_raw = _long([
+        ('2024-01-01 00:00:00', 'speed', 100.0, 1),
+        ('2024-01-01 00:00:00', 'nmot', 5000.0, 1),
+        ('2024-01-01 00:00:01', 'nmot', 5100.0, 1),
+        (None, 'speed', 99.0, 1),
+        ('2024-01-01 00:00:01', None, 42.0, 1),
+    ])
+    result = _pivot_first(df_raw)
+
+    assert list(result.index) == list(pd.to_datetime(['2024-01-01 00:00:00', '2024-01-01 00:00:01']))
+    # The NaT reading must not land on the last timestamp
+    assert np.isnan(result.loc['2024-01-01 00:00:01', 'speed'])
+    assert result.loc['2024-01-01 00:00:01', 'nmot'] == 5100.0
+    assert not (result == 42.0).any().any()
+
+
+def test_cached_read_writes_outside_the_data_folder(tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    monkeypatch.setattr(dl, 'PARQUET_CACHE_DIR', cache_dir)
+    csv_path = tmp_path / 'data' / 'laps.csv'
+    csv_path.parent.mkdir()
+    pd.DataFrame({'lap': [1, 2], 'lap_time': [101.5, 99.8]}).to_csv(csv_path, index=False)
+
+    first = dl._cached_read(str(csv_path), pd.read_csv)
+    second = dl._cached_read(str(csv_path), pd.read_csv)
+
+    pd.testing.assert_frame_equal(first, second)
+    assert [p.name for p in csv_path.parent.iterdir()] == ['laps.csv']
+    (snapshot,) = cache_dir.iterdir()
+    assert snapshot.name.endswith(f'.v{dl.PARQUET_CACHE_VERSION}.parquet')
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.utils.motec_export as motec_export
+from src.utils.motec_export import MoTeCExporter
+
+pytest.importorskip('pyarrow')
+
+
+def _export(df, path, monkeypatch, use_arrow):
+    monkeypatch.setattr(motec_export, 'PYARROW_AVAILABLE', use_arrow)
+    exporter = MoTeCExporter()
+    exporter.prepare_data(df)
+    exporter.export_to_csv_motec_compatible(str(path))
+    return path.read_text()
+
+
+@pytest.mark.parametrize('gear', [
+    ['N', '3', '4', '3'],
+    pd.Categorical(['N', '3', '4', '3']),
+    ['N', '3,4', '"5"', '3'],  # needs quoting: pandas writer
+])
+def test_csv_export_matches_pandas_baseline(tmp_path, monkeypatch, gear):
+    df = pd.DataFrame({
+        'Speed': np.array([101.25, 99.5, np.nan, 120.123456789], dtype=np.float32),
+        'Throttle': [0.0, 55.5, 100.0, 12.000001],
+        'RPM': [6000, 6100, 6200, 6300],
+        'Gear': gear,
+    })
+
+    baseline = _export(df, tmp_path / 'baseline.csv', monkeypatch, use_arrow=False)
+    result = _export(df, tmp_path / 'arrow.csv', monkeypatch, use_arrow=True)
+
+    assert result.splitlines()[0] == baseline.splitlines()[0]
+    # Same cells: string channels byte for byte (no added quotes), numbers by value
+    expected = pd.read_csv(tmp_path / 'baseline.csv', dtype={'Gear': str})
+    actual = pd.read_csv(tmp_path / 'arrow.csv', dtype={'Gear': str})
+    pd.testing.assert_frame_equal(actual, expected)
+    baseline_gear = [line.rsplit(',', 1)[-1] for line in baseline.splitlines()[1:]]
+    result_gear = [line.rsplit(',', 1)[-1] for line in result.splitlines()[1:]]
+    assert result_gear == baseline_gear
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.telemetry_fusion import TelemetryFusionEngine
+
+pytest.importorskip('polars')
+
+
+@pytest.mark.parametrize('n_rows', [1, 3, 4, 600])
+def test_detect_anomalies_backends_agree(n_rows):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Speed': rng.random(n_rows) * 200,
+        'BrakePressure': np.full(n_rows, 5.0),  # constant column
+        'Throttle': rng.random(n_rows) * 100,
+    })
+
+    expected = TelemetryFusionEngine().detect_anomalies(df)
+    result = TelemetryFusionEngine(backend='polars').detect_anomalies(df)
+
+    assert list(result.columns) == list(expected.columns)
+    np.testing.assert_allclose(
+        result.filter(like='_zscore').to_numpy(float),
+        expected.filter(like='_zscore').to_numpy(float)
+    )
+    np.testing.assert_array_equal(result.filter(like='_anomaly'), expected.filter(like='_anomaly'))
+    np.testing.assert_array_equal(result['total_anomalies'], expected['total_anomalies'])
+    assert not result['BrakePressure_anomaly'].any()
+
+
+def test_merge_telemetry_backends_break_ties_the_same_way():
+    t0 = pd.Timestamp('2024-01-01')
+    # Every base timestamp is exactly halfway between two throttle samples
+    base = pd.DataFrame({
+        'TimeStamp': t0 + pd.to_timedelta([5, 25, 45, 500], unit='ms'),
+        'Speed': [100.0, 110.0, 120.0, 130.0],
+    })
+    other = pd.DataFrame({
+        'TimeStamp': t0 + pd.to_timedelta([0, 10, 20, 30, 40, 50], unit='ms'),
+        'Throttle': [0.0, 10.0, 20.0, 30.0, 40.0, 50.0],
+        'Speed': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+    })
+
+    merged = {}
+    for backend in ('pandas', 'polars'):
+        engine = TelemetryFusionEngine(backend=backend)
+        engine.add_dataset('base', base.copy())
+        engine.add_dataset('other', other.copy())
+        merged[backend] = engine.merge_telemetry().reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(merged['polars'], merged['pandas'], check_dtype=False)
+    # pandas picks the earlier sample on ties; the last row is outside the tolerance
+    assert merged['polars']['Throttle'].tolist()[:3] == [0.0, 20.0, 40.0]
+    assert np.isnan(merged['polars']['Throttle'].iloc[3])
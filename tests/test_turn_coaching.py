@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from src.analysis.turn_coaching import TurnCoachingSystem
+
+
+def _turn_data(n_rows=50):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'Speed': rng.normal(70, 10, n_rows),
+        'BrakePressure': rng.uniform(0, 100, n_rows),
+        'Throttle': rng.uniform(0, 100, n_rows),
+        'SteeringAngle': rng.normal(0, 20, n_rows),
+    })
+
+
+def test_analyze_turn_performance_result_does_not_leak_into_cache():
+    coach = TurnCoachingSystem()
+    turn_data = _turn_data()
+
+    first = coach.analyze_turn_performance(1, turn_data)
+    expected_grade = first['grade']
+    expected_min_speed = first['metrics']['min_speed']
+
+    first['grade'] = 'edited'
+    first['metrics']['min_speed'] = -1.0
+
+    second = coach.analyze_turn_performance(1, turn_data)
+    assert second['grade'] == expected_grade
+    assert second['metrics']['min_speed'] == expected_min_speed
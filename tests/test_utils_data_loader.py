@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.data_loader import DataManager
+
+
+def test_detect_outliers_sees_in_place_updates(tmp_path):
+    manager = DataManager(data_dir=str(tmp_path))
+    df = pd.DataFrame({'Speed': np.linspace(0.0, 10000.0, 10)})
+    assert manager.detect_outliers(df, 'Speed', threshold=2.0).sum() == 0
+
+    # Same DataFrame object, new values: stats must be recomputed
+    df['Speed'] = [100.0] * 9 + [300.0]
+    assert manager.detect_outliers(df, 'Speed', threshold=2.0).sum() == 1
+
+
+def _write_telemetry(data_dir, n_rows=200):
+    rng = np.random.default_rng(0)
+    pd.DataFrame({
+        'Speed': rng.random(n_rows) * 200,
+        'BrakePressure': rng.random(n_rows) * 80,
+        'Throttle': rng.random(n_rows) * 100,
+        'SteeringAngle': rng.random(n_rows) * 30,
+        'LateralAcceleration': rng.normal(size=n_rows),
+        'LongitudinalAcceleration': rng.normal(size=n_rows),
+        'Gear': rng.choice(['N', '2', '3', '4'], n_rows),
+        'Sector': rng.choice(['S1', 'S2', 'S3'], n_rows),
+    }).to_csv(data_dir / 'telemetry.csv', index=False)
+
+
+def test_load_all_datasets_only_categorizes_known_columns(tmp_path):
+    _write_telemetry(tmp_path)
+    df = DataManager(data_dir=str(tmp_path)).load_all_datasets()['telemetry.csv']
+
+    assert isinstance(df['Gear'].dtype, pd.CategoricalDtype)
+    # Other low-cardinality strings stay plain objects: new values can be assigned
+    assert df['Sector'].dtype == object
+    df.loc[0, 'Sector'] = 'S4'
+    assert df['Sector'].str.startswith('S').all()
+
+
+def test_loaded_telemetry_feeds_fusion_engine(tmp_path):
+    from src.analysis.telemetry_fusion import TelemetryFusionEngine
+
+    _write_telemetry(tmp_path)
+    df = DataManager(data_dir=str(tmp_path)).load_all_datasets()['telemetry.csv']
+
+    engine = TelemetryFusionEngine()
+    result = engine.detect_anomalies(engine.engineer_features(df))
+    assert len(result) == len(df)
+    assert 'tire_stress' in result.columns
+    assert 'total_anomalies' in result.columns
+
+
+def test_validate_data_types_leaves_timestamps_by_default(tmp_path):
+    manager = DataManager(data_dir=str(tmp_path))
+    df = pd.DataFrame({'TimeStamp': ['2024-01-01 00:00:00', '2024-01-01 00:00:01'], 'Speed': [1.0, 2.0]})
+
+    manager.validate_data_types(df, 'telemetry.csv')
+    assert df['TimeStamp'].dtype == object
+
+    manager.validate_data_types(df, 'telemetry.csv', parse_timestamps=True)
+    assert pd.api.types.is_datetime64_any_dtype(df['TimeStamp'])
+
+
+@pytest.mark.filterwarnings('ignore:Could not infer format')
+def test_validate_data_types_keeps_unparsable_timestamps(tmp_path):
+    manager = DataManager(data_dir=str(tmp_path))
+    df = pd.DataFrame({'TimeStamp': ['lap start', 'lap end']})
+
+    assert manager.validate_data_types(df, 'telemetry.csv', parse_timestamps=True)
+    assert df['TimeStamp'].tolist() == ['lap start', 'lap end']
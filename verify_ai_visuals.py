@@ -3,6 +3,9 @@ import src.data_loader as dl
 import pandas as pd
 import plotly.graph_objects as go
 
+# Copy-on-Write: the mock ref frame below shares every column but speed with df
+pd.set_option('mode.copy_on_write', True)
+
 telemetry_path = r"c:\Users\Lenovo\Desktop\hackathons\TOYOTA\COTA\Race 2\R2_cota_telemetry_data.csv"
 
 print("1. Loading Telemetry...")
@@ -16,11 +19,11 @@ queries = [
     "Compare my speed"
 ]
 
+# Mock ref df for comparison (built once; query_ai only reads it)
+df_ref = df.assign(speed=df['speed'].to_numpy() * 1.05)
+
 for q in queries:
     print(f"\nQuery: {q}")
-    # Mock ref df for comparison
-    df_ref = df.copy()
-    df_ref['speed'] = df_ref['speed'] * 1.05
     
     response = ai.query_ai(df, q, df_ref=df_ref)
     
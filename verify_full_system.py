@@ -3,6 +3,9 @@ import src.analytics as ana
 import src.ai_assistant as ai
 import pandas as pd
 
+# Copy-on-Write: lap slices and assign() share unchanged columns instead of copying them
+pd.set_option('mode.copy_on_write', True)
+
 # Paths
 telemetry_path = r"c:\Users\Lenovo\Desktop\hackathons\TOYOTA\COTA\Race 2\R2_cota_telemetry_data.csv"
 lap_times_path = r"c:\Users\Lenovo\Desktop\hackathons\TOYOTA\COTA\Race 2\COTA_lap_time_R2.csv"
@@ -25,12 +28,14 @@ if not df.empty:
     # Simulate two laps
     laps = df['lap'].unique()
     if len(laps) >= 2:
-        df_main = df[df['lap'] == laps[0]].copy()
-        df_ref = df[df['lap'] == laps[1]].copy()
+        # One grouping pass instead of a boolean scan of df per lap
+        lap_groups = df.groupby('lap', sort=False)
+        df_main = lap_groups.get_group(laps[0])
+        df_ref = lap_groups.get_group(laps[1])
         
-        # Reset distance
-        df_main['distance'] = df_main['distance'] - df_main['distance'].iloc[0]
-        df_ref['distance'] = df_ref['distance'] - df_ref['distance'].iloc[0]
+        # Reset distance (only the distance column is rebuilt)
+        df_main = df_main.assign(distance=df_main['distance'] - df_main['distance'].iat[0])
+        df_ref = df_ref.assign(distance=df_ref['distance'] - df_ref['distance'].iat[0])
         
         anomalies = ana.detect_anomalies(df_main, df_ref)
         print(f"   Detected {len(anomalies)} anomalies.")